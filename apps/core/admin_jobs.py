@@ -0,0 +1,230 @@
+"""
+Aksi massal Django admin sebagai job Celery ber-chunk.
+
+Request admin hanya menyimpan AdminJob (seleksi + COUNT) lalu enqueue task
+run_admin_job setelah commit; baris terpilih tidak pernah dimuat di request,
+berapa pun ukuran seleksi ("pilih semua 10.000"). Seleksi disimpan eksplisit
+(bukan query ter-pickle yang terikat versi Django/kode):
+- centang per baris -> pk yang dicentang (paling banyak satu halaman)
+- "pilih semua" -> parameter filter changelist (request.GET); worker membangun
+  ulang queryset lewat ChangeList ModelAdmin yang sama (filter, search, user)
+
+Worker membaca seleksi per chunk dengan keyset pk (pk > terakhir, ORDER BY pk,
+LIMIT ADMIN_JOB_CHUNK_SIZE). Tiap chunk satu transaksi; progress & error
+ditulis setelah tiap chunk, jadi halaman hasil (core:admin_job_detail)
+menampilkan kemajuan selama job berjalan. Chunk yang gagal dicatat sebagai
+error per baris, job lanjut ke chunk berikutnya.
+
+Handler baru:
+
+    @admin_jobs.register
+    class ExpirePayments(admin_jobs.AdminJobHandler):
+        key = 'payments.expire'
+        label = 'Expire payment PENDING (background)'
+        model = Payment
+
+        def process(self, job, ids):
+            ...
+            return succeeded, errors  # errors: [(pk, label, pesan)]
+
+    class PaymentAdmin(admin.ModelAdmin):
+        actions = [admin_jobs.admin_action('payments.expire')]
+"""
+import logging
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.views.main import PAGE_VAR
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+
+from .models import AdminJob
+
+logger = logging.getLogger('apps.core')
+
+REGISTRY = {}
+
+# Error per baris yang disimpan di AdminJob.errors (sisanya hanya dihitung)
+MAX_ERRORS = 200
+
+
+class AdminJobHandler:
+    """
+    Basis handler job. start() / finish() dipanggil sekali per job (mis. buka
+    & simpan file export), process() per chunk di dalam transaksi.
+    """
+
+    key = ''
+    label = ''
+    model = None
+    # Permission admin yang dibutuhkan untuk menjalankan aksi ('view', 'change', 'delete')
+    permission = 'change'
+    chunk_size = None
+
+    def get_chunk_size(self):
+        return self.chunk_size or settings.ADMIN_JOB_CHUNK_SIZE
+
+    def start(self, job):
+        pass
+
+    def process(self, job, ids):
+        """Proses satu chunk pk. Return (jumlah berhasil, [(pk, label, pesan error)])"""
+        raise NotImplementedError
+
+    def finish(self, job):
+        pass
+
+
+def register(handler_class):
+    """Decorator: daftarkan handler berdasarkan key"""
+    if handler_class.key in REGISTRY:
+        raise ValueError(f'Admin job {handler_class.key!r} already registered')
+    REGISTRY[handler_class.key] = handler_class
+    return handler_class
+
+
+def enqueue(key, queryset, user=None, select_across=False, selected_ids=(), changelist_params=None):
+    """
+    Simpan AdminJob lalu jalankan setelah commit. `queryset` hanya dipakai
+    untuk COUNT; worker membaca seleksi dari selected_ids / changelist_params.
+    """
+    from .tasks import run_admin_job
+
+    handler_class = REGISTRY[key]
+    job = AdminJob.objects.create(
+        action=key,
+        model=handler_class.model._meta.label_lower,
+        select_across=select_across,
+        selected_ids=[] if select_across else [str(pk) for pk in selected_ids],
+        changelist_params=changelist_params or {},
+        total=queryset.count(),
+        created_by=user,
+    )
+    transaction.on_commit(lambda: run_admin_job.delay(str(job.pk)))
+    logger.info("Admin job %s (%s) queued for %s rows", job.pk, key, job.total)
+    return job
+
+
+def admin_action(key):
+    """Aksi ModelAdmin yang mengantrikan job `key` untuk baris terpilih"""
+    handler_class = REGISTRY[key]
+
+    @admin.action(description=handler_class.label, permissions=[handler_class.permission])
+    def action(modeladmin, request, queryset):
+        select_across = request.POST.get('select_across') == '1'
+        job = enqueue(
+            key,
+            queryset,
+            user=request.user,
+            select_across=select_across,
+            selected_ids=request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            # Filter, pencarian & hierarki tanggal changelist ada di query string
+            changelist_params={name: request.GET.getlist(name) for name in request.GET if name != PAGE_VAR},
+        )
+        modeladmin.message_user(
+            request,
+            format_html(
+                '{} baris diantrikan: <a href="{}">lihat progress &amp; hasil</a>.',
+                job.total,
+                reverse('core:admin_job_detail', args=[job.pk]),
+            ),
+            messages.SUCCESS,
+        )
+
+    action.__name__ = f"job_{key.replace('.', '_')}"
+    return action
+
+
+def selection(job):
+    """QuerySet seleksi job, dibangun ulang dari pk / parameter changelist"""
+    model = apps.get_model(job.model)
+    if not job.select_across:
+        return model._default_manager.filter(pk__in=job.selected_ids)
+
+    # Sama dengan queryset yang dilihat admin: ChangeList ModelAdmin model ini
+    # dengan query string & user pembuat job (get_queryset per user ikut berlaku)
+    model_admin = admin.site._registry[model]
+    request = RequestFactory().get('/', job.changelist_params)
+    request.user = job.created_by or AnonymousUser()
+    changelist = model_admin.get_changelist_instance(request)
+    return changelist.get_queryset(request)
+
+
+def run(job_id):
+    """Jalankan job per chunk (dipanggil task run_admin_job)"""
+    try:
+        job = AdminJob.objects.get(pk=job_id)
+    except AdminJob.DoesNotExist:
+        logger.info("Admin job %s no longer exists, skipping", job_id)
+        return None
+
+    if job.status != AdminJob.Status.PENDING:
+        logger.info("Admin job %s already %s, skipping", job_id, job.status)
+        return job
+
+    job.status = AdminJob.Status.RUNNING
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+
+    try:
+        handler_class = REGISTRY.get(job.action)
+        if handler_class is None:
+            raise LookupError(f'Unknown admin job action {job.action!r}')
+
+        handler = handler_class()
+        pks = selection(job).order_by('pk').values_list('pk', flat=True)
+        chunk_size = handler.get_chunk_size()
+        last_pk = None
+
+        handler.start(job)
+        while True:
+            chunk = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+            ids = list(chunk[:chunk_size])
+            if not ids:
+                break
+
+            _run_chunk(handler, job, ids)
+            last_pk = ids[-1]
+            job.last_pk = str(last_pk)
+            job.save(update_fields=['processed', 'succeeded', 'failed', 'errors', 'last_pk'])
+        handler.finish(job)
+
+        job.status = AdminJob.Status.DONE
+    except Exception as e:
+        logger.exception("Admin job %s (%s) failed", job.pk, job.action)
+        job.status = AdminJob.Status.FAILED
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.save()
+    logger.info(
+        "Admin job %s (%s) %s: %s/%s processed, %s failed",
+        job.pk, job.action, job.status, job.processed, job.total, job.failed
+    )
+    return job
+
+
+def _run_chunk(handler, job, ids):
+    try:
+        with transaction.atomic():
+            succeeded, errors = handler.process(job, ids)
+    except Exception as e:
+        # Satu chunk gagal tidak menghentikan job: seluruh chunk dicatat gagal
+        logger.exception("Admin job %s chunk after %s failed", job.pk, job.last_pk or '-')
+        succeeded, errors = 0, [(pk, '', str(e)) for pk in ids]
+
+    job.processed += len(ids)
+    job.succeeded += succeeded
+    job.failed += len(errors)
+
+    room = MAX_ERRORS - len(job.errors)
+    job.errors.extend(
+        {'pk': str(pk), 'label': str(label), 'error': str(message)}
+        for pk, label, message in errors[:max(room, 0)]
+    )
@@ -0,0 +1,10 @@
+# apps.py
+from django.apps import AppConfig
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = 'Monitoring & Performa'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
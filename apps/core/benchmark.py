@@ -0,0 +1,454 @@
+"""
+Benchmark endpoint untuk flow pendaftar & staff.
+
+Semua request dijalankan in-process lewat django.test.Client (tanpa network),
+Midtrans diganti stub HTTP server lokal sehingga bisa jalan offline.
+Per endpoint dicatat latency (p50/p95/p99), jumlah query dan peak RSS selama
+request endpoint itu (Linux: VmHWM di-reset sebelum tiap request).
+
+Catatan: CaptureQueriesContext memaksa debug cursor, jadi angka absolut sedikit
+lebih lambat dari production. Bandingkan hasil antar run, bukan dengan produksi.
+"""
+import hashlib
+import io
+import json
+import math
+import platform
+import sys
+import threading
+import time
+import uuid
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+
+class BenchmarkError(Exception):
+    """Response tidak sesuai harapan, hasil benchmark tidak valid."""
+
+
+# ============================================
+# STUB MIDTRANS
+# ============================================
+
+class _MidtransStubHandler(BaseHTTPRequestHandler):
+    """Jawab endpoint /charge dan /<order_id>/status seperti sandbox Midtrans"""
+
+    latency_ms = 0
+
+    def do_POST(self):
+        if self.latency_ms:
+            # Simulasi round-trip ke Midtrans
+            time.sleep(self.latency_ms / 1000)
+
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        order_id = payload.get('transaction_details', {}).get('order_id', '')
+
+        self._respond(201, {
+            'status_code': '201',
+            'status_message': 'Success, Bank Transfer transaction is created',
+            'transaction_id': str(uuid.uuid4()),
+            'order_id': order_id,
+            'gross_amount': f"{payload.get('transaction_details', {}).get('gross_amount', 0)}.00",
+            'payment_type': 'bank_transfer',
+            'transaction_status': 'pending',
+            'va_numbers': [{'bank': 'bca', 'va_number': f'8808{abs(hash(order_id)) % 10 ** 12:012d}'}],
+        })
+
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        order_id = parts[-2] if len(parts) > 1 else ''
+        self._respond(200, {'status_code': '200', 'order_id': order_id, 'transaction_status': 'pending'})
+
+    def _respond(self, status, body):
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubMidtransServer:
+    """Stub Midtrans di thread terpisah, port dipilih otomatis"""
+
+    server_key = 'SB-Mid-server-benchmark'
+
+    def __init__(self, latency_ms=0):
+        handler = type('Handler', (_MidtransStubHandler,), {'latency_ms': latency_ms})
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def sign(self, order_id, status_code, gross_amount):
+        """Signature webhook: SHA512(order_id + status_code + gross_amount + server_key)"""
+        raw = f'{order_id}{status_code}{gross_amount}{self.server_key}'
+        return hashlib.sha512(raw.encode()).hexdigest()
+
+
+# ============================================
+# STATISTICS
+# ============================================
+
+def percentile(values, pct):
+    """Percentile dengan interpolasi linear (sama seperti numpy default)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _proc_status_kb(field):
+    """Nilai `field` (mis. VmHWM) dari /proc/self/status dalam KB, None jika tidak ada"""
+    try:
+        with open('/proc/self/status') as fh:
+            for line in fh:
+                if line.startswith(f'{field}:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def current_rss_kb():
+    """RSS proses saat ini dalam KB (/proc/self/statm), None jika tidak didukung OS"""
+    try:
+        with open('/proc/self/statm') as fh:
+            resident_pages = int(fh.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    import resource
+    return resident_pages * resource.getpagesize() // 1024
+
+
+def reset_peak_rss():
+    """
+    Reset high-water mark RSS (Linux >= 4.0, tulis '5' ke clear_refs) supaya
+    peak berikutnya milik satu request saja. False jika tidak didukung.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as fh:
+            fh.write('5')
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss_kb():
+    """
+    Peak RSS proses dalam KB: VmHWM (sejak reset_peak_rss terakhir), atau
+    ru_maxrss (peak sepanjang umur proses). None jika tidak didukung OS (Windows).
+    """
+    peak = _proc_status_kb('VmHWM')
+    if peak is not None:
+        return peak
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS melaporkan byte, Linux kilobyte
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class EndpointStats:
+
+    def __init__(self, name):
+        self.name = name
+        self.durations = []
+        self.queries = []
+        self.peak_rss_kb = None
+        # 'request': peak selama request endpoint ini saja,
+        # 'process': OS tidak bisa reset peak, nilai = peak proses sejauh ini
+        self.peak_rss_scope = None
+        self.rss_growth_kb = 0
+
+    def record(self, duration_ms, query_count, rss_before, rss_after, peak_kb, isolated):
+        self.durations.append(duration_ms)
+        self.queries.append(query_count)
+        if peak_kb is not None:
+            self.peak_rss_kb = max(self.peak_rss_kb or 0, peak_kb)
+            self.peak_rss_scope = 'request' if isolated else 'process'
+        if rss_before is not None and rss_after is not None:
+            self.rss_growth_kb += rss_after - rss_before
+
+    def as_dict(self):
+        return {
+            'count': len(self.durations),
+            'p50_ms': round(percentile(self.durations, 50), 3),
+            'p95_ms': round(percentile(self.durations, 95), 3),
+            'p99_ms': round(percentile(self.durations, 99), 3),
+            'mean_ms': round(sum(self.durations) / len(self.durations), 3),
+            'max_ms': round(max(self.durations), 3),
+            'queries_p50': percentile(self.queries, 50),
+            'queries_max': max(self.queries),
+            'peak_rss_kb': self.peak_rss_kb,
+            'peak_rss_scope': self.peak_rss_scope,
+            'rss_growth_kb': self.rss_growth_kb,
+        }
+
+
+# ============================================
+# RUNNER
+# ============================================
+
+class BenchmarkRunner:
+    """
+    Jalankan flow lengkap:
+    create → documents → review → submit → payment → webhook → verify,
+    plus check status, list (search), dashboard dan export Excel.
+    """
+
+    DOCUMENT_TYPES = ('KTP', 'KK', 'AKTA')
+
+    def __init__(self, midtrans, staff_user, stdout=None):
+        self.midtrans = midtrans
+        self.staff = Client()
+        self.staff.force_login(staff_user)
+        self.stats = {}
+        self.stdout = stdout
+        self._sequence = int(time.time()) % 10 ** 6
+
+    def measure(self, name, method, path, data=None, expect=(200,), **extra):
+        stats = self.stats.setdefault(name, EndpointStats(name))
+
+        isolated = reset_peak_rss()
+        rss_before = current_rss_kb()
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            if data is None:
+                response = method(path, **extra)
+            else:
+                response = method(path, data, **extra)
+            # Streaming response (ZIP/CSV) belum dieksekusi sampai dibaca
+            if getattr(response, 'streaming', False):
+                for _ in response.streaming_content:
+                    pass
+            duration_ms = (time.perf_counter() - start) * 1000
+
+        stats.record(
+            duration_ms, len(ctx.captured_queries),
+            rss_before, current_rss_kb(), peak_rss_kb(), isolated
+        )
+
+        if response.status_code not in expect:
+            raise BenchmarkError(f'{name}: HTTP {response.status_code} ({path})')
+        return response
+
+    def run(self, iterations, warmup=0):
+        for i in range(warmup + iterations):
+            if i == warmup:
+                # Buang sampel warmup (template & URL resolver cache dingin)
+                self.stats = {}
+            registration_id = self.applicant_flow()
+            self.staff_flow(registration_id)
+            self.staff_pages()
+
+            if self.stdout and i >= warmup:
+                self.stdout.write(f'  iteration {i - warmup + 1}/{iterations}')
+
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
+
+    def applicant_flow(self):
+        from apps.payments.models import Payment
+        from apps.registration.models import StudentRegistration
+
+        client = Client()
+        self._sequence += 1
+
+        create_url = reverse('registration:create')
+        self.measure('registration:create GET', client.get, create_url)
+        response = self.measure(
+            'registration:create POST', client.post, create_url,
+            self._applicant_data(self._sequence), expect=(302,)
+        )
+        registration_id = resolve(urlparse(response.url).path).kwargs.get('pk')
+        if registration_id is None:
+            raise BenchmarkError(f'registration:create POST: form rejected ({response.url})')
+
+        documents_url = reverse('registration:documents', kwargs={'pk': registration_id})
+        for doc_type in self.DOCUMENT_TYPES:
+            self.measure(
+                'registration:documents POST', client.post, documents_url,
+                {'document_type': doc_type, 'file': self._document_file(doc_type)},
+                expect=(302,)
+            )
+        self.measure('registration:documents GET', client.get, documents_url)
+        self.measure(
+            'registration:document_status', client.get,
+            reverse('registration:document_status', kwargs={'pk': registration_id})
+        )
+
+        self.measure('registration:review', client.get, reverse('registration:review', kwargs={'pk': registration_id}))
+        self.measure(
+            'registration:submit', client.post,
+            reverse('registration:submit', kwargs={'pk': registration_id}),
+            {'declaration_confirmed': 'on'}, expect=(302,)
+        )
+
+        payment_url = reverse('payments:create', kwargs={'registration_id': registration_id})
+        self.measure('payments:create GET', client.get, payment_url)
+        self.measure('payments:create POST', client.post, payment_url, {}, expect=(302,))
+
+        payment = Payment.objects.get(registration_id=registration_id)
+        self.measure('payments:instructions', client.get, reverse('payments:instructions', kwargs={'pk': payment.pk}))
+
+        gross_amount = f'{payment.total_amount:.2f}'
+        notification = {
+            'order_id': payment.gateway_order_id,
+            'transaction_id': str(uuid.uuid4()),
+            'transaction_status': 'settlement',
+            'transaction_time': timezone.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'payment_type': 'bank_transfer',
+            'va_numbers': [{'bank': 'bca', 'va_number': payment.va_number}],
+            'status_code': '200',
+            'gross_amount': gross_amount,
+            'signature_key': self.midtrans.sign(payment.gateway_order_id, '200', gross_amount),
+        }
+        response = self.measure(
+            'payments:midtrans_webhook', client.post, reverse('payments:midtrans_webhook'),
+            json.dumps(notification), content_type='application/json', HTTP_USER_AGENT='Veritrans'
+        )
+        if response.json().get('status') != 'success':
+            raise BenchmarkError(f'payments:midtrans_webhook: {response.content.decode()}')
+
+        registration = StudentRegistration.objects.get(pk=registration_id)
+        self.measure(
+            'registration:check_status POST', client.post, reverse('registration:check_status'),
+            {'registration_number': registration.registration_number, 'identifier': registration.nik}
+        )
+        return registration_id
+
+    def staff_flow(self, registration_id):
+        self.measure(
+            'registration:staff_detail', self.staff.get,
+            reverse('registration:staff_detail', kwargs={'pk': registration_id})
+        )
+        self.measure(
+            'registration:staff_verify', self.staff.post,
+            reverse('registration:staff_verify', kwargs={'pk': registration_id}),
+            {'action': 'approve', 'verification_notes': 'Benchmark'}, expect=(302,)
+        )
+
+    def staff_pages(self):
+        list_url = reverse('registration:staff_list')
+        self.measure('registration:staff_list', self.staff.get, list_url)
+        self.measure('registration:staff_list search', self.staff.get, list_url, {'search': 'Putri'})
+        self.measure('registration:staff_dashboard', self.staff.get, reverse('registration:staff_dashboard'))
+        self.measure('registration:staff_export', self.staff.get, reverse('registration:staff_export'))
+
+    def _applicant_data(self, sequence):
+        return {
+            'full_name': f'Benchmark Siswa {sequence}',
+            'nik': f'3273{sequence:012d}',
+            'nisn': f'{sequence % 10 ** 10:010d}',
+            'birth_place': 'Bandung',
+            'birth_date': date(2008, 5, 17).isoformat(),
+            'gender': 'P',
+            'religion': 'ISLAM',
+            'previous_school': 'SMP Negeri 1 Bandung',
+            'previous_school_npsn': '20219001',
+            'graduation_year': '2023',
+            'program_choice': 'PAKET_C',
+            'contact_email': f'benchmark{sequence}@example.com',
+            'contact_phone': '081234567890',
+            'address': 'Jl. Asia Afrika No. 1',
+            'city': 'Bandung',
+            'province': 'Jawa Barat',
+            'postal_code': '40111',
+            'father_name': 'Ayah Benchmark',
+            'father_occupation': 'Wiraswasta',
+            'mother_name': 'Ibu Benchmark',
+            'mother_occupation': 'Guru',
+            'parent_phone': '081298765432',
+        }
+
+    def _document_file(self, doc_type):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from PIL import Image, ImageDraw
+
+        image = Image.new('RGB', (800, 500), 'white')
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((40, 40, 760, 460), outline='black', width=4)
+        draw.text((80, 80), f'{doc_type} {self._sequence}', fill='black')
+
+        output = io.BytesIO()
+        image.save(output, format='PNG')
+        return SimpleUploadedFile(f'{doc_type.lower()}.png', output.getvalue(), content_type='image/png')
+
+
+# ============================================
+# REPORT & COMPARISON
+# ============================================
+
+def build_report(endpoints, iterations, label=''):
+    return {
+        'label': label,
+        'created_at': timezone.now().isoformat(),
+        'iterations': iterations,
+        'environment': {
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'debug': settings.DEBUG,
+            'platform': platform.platform(),
+        },
+        'endpoints': endpoints,
+    }
+
+
+def compare_reports(baseline, current, threshold=0.10, min_delta_ms=1.0):
+    """
+    Bandingkan dua report. Regresi jika:
+    - p95 naik lebih dari threshold (relatif) DAN lebih dari min_delta_ms (absolut), atau
+    - jumlah query maksimum bertambah.
+
+    Returns:
+        List dict per endpoint yang ada di kedua report
+    """
+    rows = []
+    for name, new in current['endpoints'].items():
+        old = baseline['endpoints'].get(name)
+        if old is None:
+            continue
+
+        delta_ms = new['p95_ms'] - old['p95_ms']
+        ratio = delta_ms / old['p95_ms'] if old['p95_ms'] else 0
+        query_delta = new['queries_max'] - old['queries_max']
+
+        rows.append({
+            'endpoint': name,
+            'old_p95_ms': old['p95_ms'],
+            'new_p95_ms': new['p95_ms'],
+            'p95_change': ratio,
+            'old_queries': old['queries_max'],
+            'new_queries': new['queries_max'],
+            'regression': (ratio > threshold and delta_ms > min_delta_ms) or query_delta > 0,
+        })
+    return rows
@@ -0,0 +1,22 @@
+"""
+Decorators untuk monitoring performa view.
+"""
+
+
+def query_budget(max_queries):
+    """
+    Deklarasi jumlah query maksimal untuk satu view.
+    Dipakai QueryBudgetMiddleware; bisa untuk function view maupun class view.
+
+    Contoh:
+        @query_budget(6)
+        def check_status_view(request): ...
+
+        @query_budget(12)
+        class StaffDashboardView(View): ...
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+
+    return decorator
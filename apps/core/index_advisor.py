@@ -0,0 +1,327 @@
+"""
+Index advisor: replay workload query ke EXPLAIN & cocokkan dengan index yang ada.
+
+Sumber workload:
+1. WORKLOAD - query ORM hot path (expire payment, cleanup draft, list staff,
+   cek status, dashboard). Tiap entri membawa index kandidat.
+2. SlowQuery yang sudah tertangkap (apps.core.slow_queries). Template SQL
+   di-EXPLAIN tanpa nilai parameter via EXPLAIN (GENERIC_PLAN), PostgreSQL 16+.
+
+Di PostgreSQL juga dilaporkan index yang tidak pernah dipakai
+(pg_stat_user_indexes.idx_scan = 0) dan, jika extension hypopg terpasang,
+estimasi cost EXPLAIN dengan index kandidat (index hipotetis, tanpa dibuat).
+"""
+import json
+import re
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import connection, migrations, models
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.payments.models import Payment
+from apps.registration.filters import filter_registrations
+from apps.registration.models import Document, RegistrationNumberSequence, StudentRegistration
+
+from .models import SlowQuery
+
+SQLITE_SCAN = re.compile(r'\bSCAN (\w+)\b(?! USING)')
+SQLITE_INDEX = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+PLACEHOLDER = re.compile(r'(?<!%)%s')
+
+Status = StudentRegistration.RegistrationStatus
+
+
+class WorkloadQuery:
+    """Satu query hot path + index yang seharusnya melayaninya"""
+
+    def __init__(self, name, description, queryset, model=None, fields=None):
+        self.name = name
+        self.description = description
+        self.queryset = queryset
+        self.model = model
+        self.fields = fields or []
+
+
+WORKLOAD = [
+    WorkloadQuery(
+        'expire_payments', 'Payment PENDING yang melewati expires_at (cron expire_payments)',
+        lambda: Payment.objects.filter(status=Payment.PaymentStatus.PENDING, expires_at__lt=timezone.now()),
+        Payment, ['status', 'expires_at'],
+    ),
+    WorkloadQuery(
+        'cleanup_drafts', 'Draft lebih lama dari 3 hari (cleanup_drafts)',
+        lambda: StudentRegistration.objects.filter(
+            status=Status.DRAFT, created_at__lt=timezone.now() - timedelta(days=3)
+        ),
+        StudentRegistration, ['status', 'created_at'],
+    ),
+    WorkloadQuery(
+        'staff_list', 'List staff, urutan default -created_at (halaman pertama)',
+        lambda: StudentRegistration.objects.order_by('-created_at')[:20],
+        StudentRegistration, ['created_at'],
+    ),
+    WorkloadQuery(
+        'staff_list_status', 'List staff difilter status',
+        lambda: StudentRegistration.objects.filter(status=Status.SUBMITTED).order_by('-created_at')[:20],
+        StudentRegistration, ['status', 'created_at'],
+    ),
+    WorkloadQuery(
+        'check_status_parent_phone', 'Cek status dengan No. HP orang tua',
+        lambda: StudentRegistration.objects.filter(parent_phone='081234567890'),
+        StudentRegistration, ['parent_phone'],
+    ),
+    WorkloadQuery(
+        'check_status', 'Cek status (nomor pendaftaran + NIK / HP)',
+        lambda: StudentRegistration.objects.filter(registration_number='PPDB-2026-00001').filter(
+            Q(nik='3201010101010001') | Q(contact_phone='081234567890') | Q(parent_phone='081234567890')
+        ),
+        StudentRegistration, ['registration_number'],
+    ),
+    WorkloadQuery(
+        'registration_number_sequence', 'Nomor urut berikutnya per tahun (generate nomor saat submit)',
+        lambda: RegistrationNumberSequence.objects.filter(year=2026),
+        RegistrationNumberSequence, ['year'],
+    ),
+    WorkloadQuery(
+        'staff_list_submitted_unpaid', 'List staff: SUBMITTED belum bayar > 3 hari',
+        lambda: filter_registrations(StudentRegistration.objects.order_by('-created_at'), {
+            'status': Status.SUBMITTED, 'payment': Payment.PaymentStatus.PENDING, 'submitted_days': '3',
+        })[:20],
+        StudentRegistration, ['status', 'submitted_at'],
+    ),
+    WorkloadQuery(
+        'staff_list_missing_document', 'List staff: tidak ada AKTA (NOT EXISTS per baris)',
+        lambda: filter_registrations(StudentRegistration.objects.order_by('-created_at'), {'missing': 'AKTA'})[:20],
+        Document, ['registration', 'document_type'],
+    ),
+    WorkloadQuery(
+        'dashboard_recent_paid', 'Dashboard: 10 pendaftar PAID terbaru',
+        lambda: StudentRegistration.objects.filter(status=Status.PAID).order_by('-submitted_at')[:10],
+    ),
+    WorkloadQuery(
+        'staff_search', 'Pencarian icontains (index B-tree tidak membantu)',
+        lambda: StudentRegistration.objects.filter(full_name__icontains='budi')[:20],
+    ),
+]
+
+
+# ============================================
+# EXPLAIN
+# ============================================
+
+def _walk_pg_plan(node, plan):
+    node_type = node.get('Node Type', '')
+    if node_type == 'Seq Scan':
+        plan['seq_scans'].append(node.get('Relation Name'))
+    if 'Index Name' in node:
+        plan['indexes'].append(node['Index Name'])
+    if node_type in ('Sort', 'Incremental Sort'):
+        plan['sort'] = True
+    for child in node.get('Plans', []):
+        _walk_pg_plan(child, plan)
+
+
+def parse_plan(raw):
+    """Ringkas hasil EXPLAIN: seq scan, index yang dipakai, sort, total cost"""
+    plan = {'seq_scans': [], 'indexes': [], 'sort': False, 'cost': None, 'text': raw}
+
+    if connection.vendor == 'postgresql':
+        root = json.loads(raw)[0]['Plan']
+        plan['cost'] = root.get('Total Cost')
+        _walk_pg_plan(root, plan)
+    else:
+        plan['seq_scans'] = SQLITE_SCAN.findall(raw)
+        plan['indexes'] = SQLITE_INDEX.findall(raw)
+        plan['sort'] = 'USE TEMP B-TREE' in raw
+
+    return plan
+
+
+def explain_queryset(queryset):
+    if connection.vendor == 'postgresql':
+        return parse_plan(queryset.explain(format='json'))
+    return parse_plan(queryset.explain())
+
+
+def explain_sql(sql):
+    """EXPLAIN template SQL tanpa parameter (PostgreSQL 16+ GENERIC_PLAN)"""
+    counter = iter(range(1, sql.count('%s') + 1))
+    generic = PLACEHOLDER.sub(lambda m: f'${next(counter)}', sql).replace('%%', '%')
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON, GENERIC_PLAN) {generic}')
+        raw = cursor.fetchone()[0]
+    return parse_plan(raw if isinstance(raw, str) else json.dumps(raw))
+
+
+def supports_generic_plan():
+    return connection.vendor == 'postgresql' and connection.pg_version >= 160000
+
+
+# ============================================
+# SCHEMA
+# ============================================
+
+def find_covering_index(model, fields):
+    """Nama index/unique yang kolom awalnya sama dengan fields, atau None"""
+    columns = [model._meta.get_field(name).column for name in fields]
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+
+    for name, info in constraints.items():
+        if (info['index'] or info['unique'] or info['primary_key']) and info['columns'][:len(columns)] == columns:
+            return name
+    return None
+
+
+def app_tables():
+    return [
+        model._meta.db_table
+        for config in apps.get_app_configs() if config.name.startswith('apps.')
+        for model in config.get_models()
+    ]
+
+
+def unused_indexes():
+    """Index non-unique yang idx_scan = 0 sejak statistik di-reset (PostgreSQL)"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT s.relname, s.indexrelname, pg_relation_size(s.indexrelid)
+            FROM pg_stat_user_indexes s
+            JOIN pg_index i ON i.indexrelid = s.indexrelid
+            WHERE s.idx_scan = 0
+              AND NOT i.indisunique
+              AND NOT i.indisprimary
+              AND s.relname = ANY(%s)
+            ORDER BY pg_relation_size(s.indexrelid) DESC
+            """,
+            [app_tables()]
+        )
+        rows = cursor.fetchall()
+
+        cursor.execute('SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()')
+        stats_reset = cursor.fetchone()[0]
+
+    return [{'table': t, 'index': i, 'size_bytes': size} for t, i, size in rows], stats_reset
+
+
+def has_hypopg():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'hypopg'")
+        return cursor.fetchone() is not None
+
+
+def candidate_index(model, fields):
+    index = models.Index(fields=fields)
+    index.set_name_with_model(model)
+    return index
+
+
+def hypothetical_cost(workload):
+    """Cost EXPLAIN jika index kandidat ada (hypopg, tanpa membuat index)"""
+    index = candidate_index(workload.model, workload.fields)
+    with connection.schema_editor(collect_sql=True) as editor:
+        create_sql = str(index.create_sql(workload.model, editor))
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT * FROM hypopg_create_index(%s)', [create_sql])
+        try:
+            return explain_queryset(workload.queryset())['cost']
+        finally:
+            cursor.execute('SELECT hypopg_reset()')
+
+
+# ============================================
+# ANALISIS
+# ============================================
+
+def analyze_workload():
+    hypopg = has_hypopg()
+    results = []
+    for workload in WORKLOAD:
+        plan = explain_queryset(workload.queryset())
+        result = {
+            'name': workload.name,
+            'description': workload.description,
+            'plan': plan,
+            'fields': workload.fields,
+            'model': workload.model,
+            'covered_by': None,
+            'suggest': False,
+            'hypothetical_cost': None,
+        }
+        if workload.model is not None:
+            result['covered_by'] = find_covering_index(workload.model, workload.fields)
+            result['suggest'] = result['covered_by'] is None
+            if result['suggest'] and hypopg:
+                result['hypothetical_cost'] = hypothetical_cost(workload)
+        results.append(result)
+    return results
+
+
+def analyze_captured(limit=20):
+    """Replay SlowQuery teratas (total waktu) ke EXPLAIN generic plan"""
+    results = []
+    for query in SlowQuery.objects.exclude(sample_sql='').order_by('-total_ms')[:limit]:
+        if not query.sample_sql.lstrip()[:6].upper() == 'SELECT':
+            continue
+        try:
+            plan = explain_sql(query.sample_sql)
+        except Exception as exc:  # SQL raw/vendor lain: laporkan saja, jangan hentikan analisis
+            plan = {'error': str(exc)}
+        results.append({'query': query, 'plan': plan})
+    return results
+
+
+def build_migrations(results, concurrently=None):
+    """
+    Return {app_label: (nama file, isi migration)} berisi AddIndex untuk kandidat.
+    Di PostgreSQL memakai AddIndexConcurrently (tanpa lock tulis, atomic=False).
+    """
+    if concurrently is None:
+        concurrently = connection.vendor == 'postgresql'
+
+    operations = {}
+    seen = set()
+    for result in results:
+        if not result['suggest']:
+            continue
+        model = result['model']
+        key = (model._meta.label, tuple(result['fields']))
+        if key in seen:
+            continue
+        seen.add(key)
+
+        index = candidate_index(model, result['fields'])
+        if concurrently:
+            from django.contrib.postgres.operations import AddIndexConcurrently
+            operation = AddIndexConcurrently(model_name=model._meta.model_name, index=index)
+        else:
+            operation = migrations.AddIndex(model_name=model._meta.model_name, index=index)
+        operations.setdefault(model._meta.app_label, []).append(operation)
+
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    output = {}
+    for app_label, ops in operations.items():
+        leaf = loader.graph.leaf_nodes(app_label)
+        number = int(leaf[0][1].split('_')[0]) + 1 if leaf else 1
+        name = f'{number:04d}_index_advisor'
+
+        migration = migrations.Migration(name, app_label)
+        migration.dependencies = leaf
+        migration.operations = ops
+
+        source = MigrationWriter(migration).as_string()
+        if concurrently:
+            source = source.replace(
+                'class Migration(migrations.Migration):\n',
+                'class Migration(migrations.Migration):\n    atomic = False\n',
+            )
+        output[app_label] = (f'{name}.py', source)
+    return output
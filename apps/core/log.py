@@ -0,0 +1,122 @@
+"""
+Komponen logging: QueueHandler non-blocking, JSON formatter, sampling debug.
+
+Request thread hanya memasukkan record ke queue (in-memory). Format & I/O
+file dikerjakan thread QueueListener, jadi disk lambat / rotasi file tidak
+menahan request.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from datetime import datetime, timezone
+
+# Atribut bawaan LogRecord, sisanya dianggap field `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'request_id'}
+
+
+class QueueListenerHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler yang menjalankan QueueListener sendiri.
+
+    Dipakai lewat dictConfig dengan referensi ke handler tujuan:
+        'queue_general': {
+            'class': 'apps.core.log.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file_general'],
+        }
+    dictConfig meng-configure handler urut abjad, jadi nama handler queue
+    harus lebih besar dari nama target (prefix "queue_").
+    """
+
+    def __init__(self, handlers, respect_handler_level=True):
+        super().__init__(queue.SimpleQueue())
+
+        targets = [handlers[i] for i in range(len(handlers))]
+        for target in targets:
+            if not isinstance(target, logging.Handler):
+                raise ValueError(f'Target handler belum di-configure: {target!r}')
+
+        self._targets = targets
+        self._respect_handler_level = respect_handler_level
+        self._start()
+
+        # Fork (gunicorn --preload, celery prefork) tidak membawa thread listener
+        os.register_at_fork(after_in_child=self._restart_after_fork)
+        atexit.register(self.close)
+
+    def _restart_after_fork(self):
+        self.queue = queue.SimpleQueue()
+        self._start()
+
+    def _start(self):
+        self.listener = logging.handlers.QueueListener(
+            self.queue, *self._targets, respect_handler_level=self._respect_handler_level
+        )
+        self.listener.start()
+
+    def prepare(self, record):
+        """
+        Gabungkan message & traceback di thread pemanggil (args bisa berupa
+        object yang berubah), format akhir dikerjakan handler tujuan.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self):
+        listener = getattr(self, 'listener', None)
+        if listener is not None and listener._thread is not None:
+            # stop() menunggu queue kosong, log terakhir tidak hilang
+            listener.stop()
+        super().close()
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu record = satu baris JSON (untuk log aggregator)"""
+
+    def format(self, record):
+        payload = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'process': record.process,
+            'request_id': getattr(record, 'request_id', None),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exc_info'] = record.exc_text
+
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class DebugSampleFilter(logging.Filter):
+    """
+    Loloskan hanya sebagian record DEBUG (rate 0..1), level lain selalu lolos.
+    Trace debug di hot path tetap ada tanpa membanjiri log saat LOG_LEVEL=DEBUG.
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = float(rate)
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
@@ -0,0 +1,218 @@
+"""
+Benchmark endpoint flow pendaftar & staff.
+
+Contoh:
+    python manage.py benchmark_endpoints --iterations 30 --output before.json
+    python manage.py benchmark_endpoints --iterations 30 --output after.json --compare before.json
+    python manage.py benchmark_endpoints --compare before.json after.json
+
+Default memakai database test terpisah (dibuat & dihapus otomatis), diisi data
+sintetis supaya halaman staff (list, dashboard, export) punya volume realistis.
+"""
+import io
+import json
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from apps.core.benchmark import (
+    BenchmarkError,
+    BenchmarkRunner,
+    StubMidtransServer,
+    build_report,
+    compare_reports,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark applicant & staff endpoints (p50/p95/p99, queries, peak RSS)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Full flow iterations to measure (default: 20)'
+        )
+
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=2,
+            help='Iterations to run before measuring (default: 2)'
+        )
+
+        parser.add_argument(
+            '--synthetic',
+            type=int,
+            default=1000,
+            help='Synthetic registrations to load into the test database (default: 1000)'
+        )
+
+        parser.add_argument(
+            '--existing-db',
+            action='store_true',
+            help='Run against the configured database instead of a throwaway test database'
+        )
+
+        parser.add_argument(
+            '--keepdb',
+            action='store_true',
+            help='Keep the test database between runs'
+        )
+
+        parser.add_argument(
+            '--midtrans-latency',
+            type=int,
+            default=0,
+            help='Artificial latency (ms) added by the stub Midtrans server'
+        )
+
+        parser.add_argument(
+            '--label',
+            default='',
+            help='Label stored in the report (e.g. git commit)'
+        )
+
+        parser.add_argument(
+            '--output',
+            help='Write the JSON report to this file'
+        )
+
+        parser.add_argument(
+            '--compare',
+            nargs='+',
+            metavar='REPORT',
+            help='Baseline report to compare against; with two reports, compare them without running'
+        )
+
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=10.0,
+            help='p95 increase (percent) flagged as regression (default: 10)'
+        )
+
+    def handle(self, *args, **options):
+        compare = options['compare'] or []
+        if len(compare) > 2:
+            raise CommandError('--compare takes one or two reports.')
+
+        if len(compare) == 2:
+            baseline, current = (self._load(path) for path in compare)
+        else:
+            current = self._run(options)
+            baseline = self._load(compare[0]) if compare else None
+
+            self._print_report(current)
+            if options['output']:
+                with open(options['output'], 'w') as fh:
+                    json.dump(current, fh, indent=2)
+                self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+        if baseline is not None:
+            self._print_comparison(baseline, current, options['threshold'] / 100)
+
+    # ============================================
+    # RUN
+    # ============================================
+
+    def _run(self, options):
+        from apps.accounts.models import CustomUser
+
+        setup_test_environment()
+        old_name = None
+        media_root = tempfile.mkdtemp(prefix='ppdb-benchmark-')
+
+        try:
+            if not options['existing_db']:
+                old_name = connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, keepdb=options['keepdb']
+                )
+                if options['synthetic']:
+                    self.stdout.write(f"Loading {options['synthetic']} synthetic registrations...")
+                    call_command(
+                        'generate_synthetic_data',
+                        registrations=options['synthetic'],
+                        stdout=io.StringIO(),
+                    )
+
+            staff, _ = CustomUser.objects.get_or_create(
+                email='benchmark-staff@ppdb.local',
+                defaults={'full_name': 'Benchmark Staff', 'is_staff': True},
+            )
+
+            with StubMidtransServer(latency_ms=options['midtrans_latency']) as midtrans:
+                with override_settings(
+                    MIDTRANS_API_URL=midtrans.url,
+                    MIDTRANS_SERVER_KEY=midtrans.server_key,
+                    MEDIA_ROOT=media_root,
+                ):
+                    runner = BenchmarkRunner(midtrans, staff, stdout=self.stdout)
+                    self.stdout.write(
+                        f"Running {options['iterations']} iterations "
+                        f"(+{options['warmup']} warmup) on {connection.vendor}..."
+                    )
+                    try:
+                        endpoints = runner.run(options['iterations'], warmup=options['warmup'])
+                    except BenchmarkError as e:
+                        raise CommandError(str(e))
+
+            return build_report(endpoints, options['iterations'], label=options['label'])
+
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            shutil.rmtree(media_root, ignore_errors=True)
+            teardown_test_environment()
+
+    # ============================================
+    # OUTPUT
+    # ============================================
+
+    def _load(self, path):
+        try:
+            with open(path) as fh:
+                return json.load(fh)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read report {path}: {e}')
+
+    def _print_report(self, report):
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'endpoint':<36} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8} {'peak RSS':>10}"
+        )
+        for name, row in report['endpoints'].items():
+            rss = f"{row['peak_rss_kb'] // 1024} MB" if row['peak_rss_kb'] else '-'
+            self.stdout.write(
+                f"{name:<36} {row['p50_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms "
+                f"{row['queries_max']:>8} {rss:>10}"
+            )
+        if any(row.get('peak_rss_scope') == 'process' for row in report['endpoints'].values()):
+            self.stdout.write('peak RSS: running process peak (per-request reset not supported on this OS)')
+
+    def _print_comparison(self, baseline, current, threshold):
+        rows = compare_reports(baseline, current, threshold=threshold)
+
+        self.stdout.write('')
+        self.stdout.write(
+            f"Comparing '{baseline.get('label') or 'baseline'}' → '{current.get('label') or 'current'}'"
+        )
+        for row in rows:
+            line = (
+                f"{row['endpoint']:<36} p95 {row['old_p95_ms']:>7.1f} → {row['new_p95_ms']:>7.1f}ms "
+                f"({row['p95_change']:+.0%})  queries {row['old_queries']} → {row['new_queries']}"
+            )
+            if row['regression']:
+                self.stdout.write(self.style.ERROR(f'{line}  REGRESSION'))
+            else:
+                self.stdout.write(line)
+
+        regressions = [row for row in rows if row['regression']]
+        if regressions:
+            raise CommandError(f'{len(regressions)} endpoint(s) regressed.')
+        self.stdout.write(self.style.SUCCESS('No regressions.'))
@@ -0,0 +1,100 @@
+"""
+Ukur overhead logging di thread pemanggil (yang dirasakan request).
+
+Membandingkan pipeline lama (RotatingFileHandler + StreamHandler sinkron,
+f-string) dengan pipeline baru (QueueListenerHandler + JSON, %-style).
+"""
+import io
+import logging
+import logging.handlers
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.benchmark import percentile
+from apps.core.log import JsonFormatter, QueueListenerHandler
+
+VERBOSE_FORMAT = '{levelname} {asctime} {module} {process:d} {thread:d} {message}'
+
+
+class Command(BaseCommand):
+    help = 'Measure per-call logging overhead: synchronous file handlers vs queue pipeline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--records',
+            type=int,
+            default=20000,
+            help='Log records per pipeline (default: 20000)'
+        )
+
+        parser.add_argument(
+            '--calls-per-request',
+            type=int,
+            default=10,
+            help='Log calls per request used for the per-request estimate (default: 10)'
+        )
+
+    def handle(self, *args, **options):
+        log_dir = tempfile.mkdtemp(prefix='ppdb-logbench-')
+        try:
+            results = [
+                ('sync file (before)', self._measure(self._sync_handlers(log_dir), options['records'], lazy=False)),
+                ('queue + json (after)', self._measure(self._queue_handlers(log_dir), options['records'], lazy=True)),
+            ]
+        finally:
+            shutil.rmtree(log_dir, ignore_errors=True)
+
+        self.stdout.write(f"{'pipeline':<22} {'p50':>9} {'p99':>9} {'mean':>9} {'per request':>12}")
+        for name, samples in results:
+            mean = sum(samples) / len(samples)
+            self.stdout.write(
+                f'{name:<22} {percentile(samples, 50):>7.1f}us {percentile(samples, 99):>7.1f}us '
+                f"{mean:>7.1f}us {mean * options['calls_per_request'] / 1000:>9.3f}ms"
+            )
+
+    def _sync_handlers(self, log_dir):
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, 'sync.log'), maxBytes=10 * 1024 * 1024, backupCount=2
+        )
+        file_handler.setFormatter(logging.Formatter(VERBOSE_FORMAT, style='{'))
+        console = logging.StreamHandler(io.StringIO())
+        console.setFormatter(logging.Formatter('{levelname} {asctime} {message}', style='{'))
+        return [file_handler, console]
+
+    def _queue_handlers(self, log_dir):
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, 'queue.log'), maxBytes=10 * 1024 * 1024, backupCount=2
+        )
+        file_handler.setFormatter(JsonFormatter())
+        console = logging.StreamHandler(io.StringIO())
+        console.setFormatter(logging.Formatter('{levelname} {asctime} {message}', style='{'))
+        return [QueueListenerHandler([file_handler, console])]
+
+    def _measure(self, handlers, records, lazy):
+        logger = logging.getLogger(f'apps.core.logbench.{id(handlers)}')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        for handler in handlers:
+            logger.addHandler(handler)
+
+        number = 'PPDB-2026-00042'
+        samples = []
+        try:
+            for i in range(records):
+                start = time.perf_counter_ns()
+                if lazy:
+                    logger.info("Registration submitted: %s (%s)", number, i)
+                    logger.debug("Saving registration %s", number)
+                else:
+                    logger.info(f"=== SUBMIT SUCCESS === {number} ({i})")
+                    logger.info(f"Saving... Number: {number}")
+                samples.append((time.perf_counter_ns() - start) / 2000)
+        finally:
+            for handler in handlers:
+                logger.removeHandler(handler)
+                handler.close()
+        return samples
@@ -0,0 +1,142 @@
+"""
+Saran index dari workload hot path & slow query log.
+
+Contoh:
+    python manage.py index_advisor
+    python manage.py index_advisor --captured 50 --verbose-plans
+    python manage.py index_advisor --write-migrations
+"""
+import os
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.core import index_advisor
+
+
+class Command(BaseCommand):
+    help = 'Replay hot-path and captured queries through EXPLAIN and suggest missing/unused indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--captured',
+            type=int,
+            default=20,
+            help='Top slow-log fingerprints to replay (PostgreSQL 16+, default: 20)'
+        )
+
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Print the full EXPLAIN output for every query'
+        )
+
+        parser.add_argument(
+            '--write-migrations',
+            action='store_true',
+            help='Write the suggested migrations into each app instead of printing them'
+        )
+
+        parser.add_argument(
+            '--no-concurrently',
+            action='store_true',
+            help='Use AddIndex instead of AddIndexConcurrently on PostgreSQL'
+        )
+
+    def handle(self, *args, **options):
+        self.verbose_plans = options['verbose_plans']
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Workload ({connection.vendor})'))
+        results = index_advisor.analyze_workload()
+        for result in results:
+            self._print_workload(result)
+
+        self._print_captured(options['captured'])
+        self._print_unused()
+
+        suggestions = [r for r in results if r['suggest']]
+        if not suggestions:
+            self.stdout.write(self.style.SUCCESS('\nAll workload queries are covered by an index.'))
+            return
+
+        concurrently = False if options['no_concurrently'] else None
+        generated = index_advisor.build_migrations(results, concurrently=concurrently)
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\nSuggested migrations'))
+        for app_label, (filename, source) in generated.items():
+            if options['write_migrations']:
+                directory = os.path.join(apps.get_app_config(app_label).path, 'migrations')
+                path = os.path.join(directory, filename)
+                with open(path, 'w') as f:
+                    f.write(source)
+                self.stdout.write(self.style.SUCCESS(f'Written {path}'))
+            else:
+                self.stdout.write(f'# {app_label}/migrations/{filename}')
+                self.stdout.write(source)
+
+    def _describe(self, plan):
+        parts = []
+        if plan['seq_scans']:
+            parts.append(self.style.WARNING(f"seq scan {', '.join(plan['seq_scans'])}"))
+        if plan['indexes']:
+            parts.append(f"index {', '.join(plan['indexes'])}")
+        if plan['sort']:
+            parts.append('sort')
+        if plan['cost'] is not None:
+            parts.append(f"cost {plan['cost']:.1f}")
+        return '; '.join(parts) or 'no scan info'
+
+    def _print_workload(self, result):
+        self.stdout.write(f"\n{result['name']}: {result['description']}")
+        self.stdout.write(f"  plan: {self._describe(result['plan'])}")
+
+        if result['model'] is not None:
+            fields = ', '.join(result['fields'])
+            if result['covered_by']:
+                self.stdout.write(f"  index ({fields}): {result['covered_by']}")
+            else:
+                line = f"  MISSING index {result['model']._meta.label}({fields})"
+                if result['hypothetical_cost'] is not None:
+                    line += f" -> estimated cost {result['hypothetical_cost']:.1f} (hypopg)"
+                self.stdout.write(self.style.ERROR(line))
+
+        if self.verbose_plans:
+            self.stdout.write(result['plan']['text'])
+
+    def _print_captured(self, limit):
+        self.stdout.write(self.style.MIGRATE_HEADING('\nCaptured slow queries'))
+        if not limit:
+            return
+        if not index_advisor.supports_generic_plan():
+            self.stdout.write('  Skipped: replaying parameterless SQL needs PostgreSQL 16+ (EXPLAIN GENERIC_PLAN)')
+            return
+
+        captured = index_advisor.analyze_captured(limit)
+        if not captured:
+            self.stdout.write('  No captured SELECT queries in the slow query log')
+        for item in captured:
+            query = item['query']
+            self.stdout.write(
+                f"\n{query.fingerprint[:8]} {query.calls}x mean {query.mean_ms:.0f} ms [{query.last_source}]"
+            )
+            self.stdout.write(f'  {query.sql[:200]}')
+            if 'error' in item['plan']:
+                self.stdout.write(self.style.WARNING(f"  EXPLAIN failed: {item['plan']['error']}"))
+            else:
+                self.stdout.write(f"  plan: {self._describe(item['plan'])}")
+                if self.verbose_plans:
+                    self.stdout.write(item['plan']['text'])
+
+    def _print_unused(self):
+        self.stdout.write(self.style.MIGRATE_HEADING('\nUnused indexes'))
+        if connection.vendor != 'postgresql':
+            self.stdout.write('  Skipped: pg_stat_user_indexes is PostgreSQL only')
+            return
+
+        unused, stats_reset = index_advisor.unused_indexes()
+        self.stdout.write(f'  Statistics since: {stats_reset or "database creation"}')
+        if not unused:
+            self.stdout.write('  None')
+        for row in unused:
+            self.stdout.write(f"  {row['table']}.{row['index']} ({row['size_bytes'] / 1024:.0f} KB, idx_scan = 0)")
@@ -0,0 +1,170 @@
+"""
+Ukur waktu startup (boot worker gunicorn, management command) dengan
+`python -X importtime` di subprocess baru (cache import kosong).
+
+Contoh:
+    python manage.py profile_startup
+    python manage.py profile_startup wsgi command:expire_payments --runs 7 --top 20
+    python manage.py profile_startup --json startup.json
+
+Target:
+    setup            django.setup()
+    wsgi             import config.wsgi (yang di-load gunicorn)
+    urls             wsgi + URLconf (request pertama worker)
+    command:<nama>   django.setup() + load class management command
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+TARGETS = {
+    'setup': 'import django; django.setup()',
+    'wsgi': 'import config.wsgi',
+    'urls': 'import config.wsgi; from django.urls import get_resolver; get_resolver().url_patterns',
+}
+
+COMMAND_TARGET = (
+    'import django; django.setup(); '
+    'from django.core.management import get_commands, load_command_class; '
+    'load_command_class(get_commands()[{name!r}], {name!r})'
+)
+
+# Modul berat yang seharusnya di-import lazy (saat dipakai, bukan saat boot)
+LAZY_MODULES = ('magic', 'midtransclient', 'requests', 'openpyxl')
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(stderr):
+    """Return [(module, self_us, cumulative_us, depth)] dari output -X importtime"""
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+class Command(BaseCommand):
+    help = 'Profile interpreter + Django startup with -X importtime (per target)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'targets',
+            nargs='*',
+            default=['wsgi', 'urls'],
+            help='setup, wsgi, urls or command:<name> (default: wsgi urls)'
+        )
+
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=5,
+            help='Fresh interpreter runs per target; the fastest run is reported (default: 5)'
+        )
+
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help='Modules to list by cumulative import time (default: 15)'
+        )
+
+        parser.add_argument(
+            '--json',
+            help='Write the report as JSON to this file'
+        )
+
+    def handle(self, *args, **options):
+        report = {}
+        for target in options['targets']:
+            report[target] = self._profile(target, options['runs'])
+            self._print(target, report[target], options['top'])
+
+        if options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Report written to {options['json']}")
+
+    def _code(self, target):
+        if target in TARGETS:
+            return TARGETS[target]
+        if target.startswith('command:'):
+            return COMMAND_TARGET.format(name=target.split(':', 1)[1])
+        raise CommandError(f'Unknown target {target!r} (setup, wsgi, urls, command:<name>)')
+
+    def _profile(self, target, runs):
+        code = self._code(target)
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            'DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE
+        ))
+
+        walls, best = [], None
+        for _ in range(max(runs, 1)):
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', code],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+            )
+            wall = time.perf_counter() - start
+            if result.returncode != 0:
+                raise CommandError(f'{target} failed:\n{result.stderr[-2000:]}')
+
+            walls.append(wall)
+            if best is None or wall < best[0]:
+                best = (wall, result.stderr)
+
+        entries = parse_importtime(best[1])
+
+        packages = defaultdict(int)
+        for module, self_us, _, _ in entries:
+            packages[module.split('.')[0]] += self_us
+
+        imported = {module for module, _, _, _ in entries}
+
+        return {
+            'wall_ms_min': round(min(walls) * 1000, 1),
+            'wall_ms_median': round(statistics.median(walls) * 1000, 1),
+            'import_ms': round(sum(c for _, _, c, depth in entries if depth == 0) / 1000, 1),
+            'modules': len(entries),
+            'top_cumulative': [
+                {'module': module, 'cumulative_ms': round(c / 1000, 1), 'self_ms': round(s / 1000, 1)}
+                for module, s, c, _ in sorted(entries, key=lambda e: e[2], reverse=True)
+            ],
+            'packages': [
+                {'package': name, 'self_ms': round(us / 1000, 1)}
+                for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)
+            ],
+            'eager_heavy_modules': [name for name in LAZY_MODULES if name in imported],
+        }
+
+    def _print(self, target, data, top):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{target}'))
+        self.stdout.write(
+            f"wall {data['wall_ms_min']:.0f} ms (median {data['wall_ms_median']:.0f} ms), "
+            f"imports {data['import_ms']:.0f} ms, {data['modules']} modules"
+        )
+
+        self.stdout.write(f"\n{'module':<50} {'cumulative':>11} {'self':>9}")
+        for row in data['top_cumulative'][:top]:
+            self.stdout.write(f"{row['module']:<50} {row['cumulative_ms']:>8.1f} ms {row['self_ms']:>6.1f} ms")
+
+        self.stdout.write(f"\n{'package (self time)':<50} {'ms':>11}")
+        for row in data['packages'][:top]:
+            self.stdout.write(f"{row['package']:<50} {row['self_ms']:>8.1f} ms")
+
+        if data['eager_heavy_modules']:
+            self.stdout.write(self.style.WARNING(
+                f"\nHeavy modules imported at startup (should be lazy): {', '.join(data['eager_heavy_modules'])}"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"\nNo eager import of: {', '.join(LAZY_MODULES)}"))
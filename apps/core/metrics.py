@@ -0,0 +1,176 @@
+"""
+Metrics Prometheus untuk funnel PPDB & hot path.
+
+Multiprocess (gunicorn dengan banyak worker): set env PROMETHEUS_MULTIPROC_DIR
+ke direktori kosong SEBELUM proses start. Tiap worker menulis metrics ke file
+mmap di sana, endpoint /metrics menggabungkannya. gunicorn.conf.py membersihkan
+direktori saat start dan menandai worker yang mati.
+
+prometheus_client opsional: tanpa library ini semua metric jadi no-op.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+
+def _metric(kind, name, documentation, labelnames, **kwargs):
+    if prometheus_client is None:
+        return _NoopMetric()
+    return getattr(prometheus_client, kind)(name, documentation, labelnames, **kwargs)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# ============================================
+# HTTP & DATABASE
+# ============================================
+
+REQUEST_LATENCY = _metric(
+    'Histogram', 'ppdb_http_request_duration_seconds',
+    'Request latency per URL name', ['view', 'method', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+
+DB_QUERIES = _metric(
+    'Histogram', 'ppdb_db_queries_per_request',
+    'Number of SQL queries per request', ['view'],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250),
+)
+
+DB_TIME = _metric(
+    'Histogram', 'ppdb_db_time_per_request_seconds',
+    'Total SQL time per request', ['view'],
+    buckets=LATENCY_BUCKETS,
+)
+
+# ============================================
+# PAYMENTS
+# ============================================
+
+MIDTRANS_LATENCY = _metric(
+    'Histogram', 'ppdb_midtrans_request_duration_seconds',
+    'Midtrans API call latency', ['operation'],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+
+MIDTRANS_ERRORS = _metric(
+    'Counter', 'ppdb_midtrans_errors_total',
+    'Failed Midtrans API calls', ['operation'],
+)
+
+WEBHOOK_DURATION = _metric(
+    'Histogram', 'ppdb_webhook_processing_seconds',
+    'Midtrans webhook processing time', ['result'],
+    buckets=LATENCY_BUCKETS,
+)
+
+# ============================================
+# FUNNEL & UPLOADS
+# ============================================
+
+FUNNEL = _metric(
+    'Counter', 'ppdb_registration_funnel_total',
+    'Registrations reaching each funnel stage', ['stage'],
+)
+
+UPLOAD_SIZE = _metric(
+    'Histogram', 'ppdb_document_upload_bytes',
+    'Uploaded document size', ['document_type'],
+    buckets=(50_000, 100_000, 250_000, 500_000, 1_000_000, 2_000_000, 3_000_000, 4_000_000, 5_000_000),
+)
+
+# ============================================
+# CELERY
+# ============================================
+
+CELERY_TASK_DURATION = _metric(
+    'Histogram', 'ppdb_celery_task_duration_seconds',
+    'Celery task run time', ['task', 'state'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+
+CELERY_TASK_LAG = _metric(
+    'Histogram', 'ppdb_celery_task_lag_seconds',
+    'Time from enqueue (or ETA) to task start', ['task'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900),
+)
+
+CELERY_TASK_RETRIES = _metric(
+    'Counter', 'ppdb_celery_task_retries_total',
+    'Celery task retries', ['task'],
+)
+
+CELERY_QUEUE_DEPTH = _metric(
+    'Gauge', 'ppdb_celery_queue_depth',
+    'Messages waiting in the broker queue (beat probe)', ['queue'],
+    multiprocess_mode='mostrecent',
+)
+
+
+# ============================================
+# READ MODEL
+# ============================================
+
+READ_MODEL_SYNC_FAILURES = _metric(
+    'Counter', 'ppdb_read_model_sync_failures_total',
+    'Post-commit read model syncs that raised (rows left for repair_read_model)', [],
+)
+
+READ_MODEL_STALE = _metric(
+    'Gauge', 'ppdb_read_model_stale_rows',
+    'Read model rows found missing or stale by the last repair_read_model run', [],
+    multiprocess_mode='mostrecent',
+)
+
+
+def record_funnel(stage, count=1):
+    """Naikkan counter funnel setelah transaction commit (rollback tidak dihitung)"""
+    if count:
+        transaction.on_commit(lambda: FUNNEL.labels(stage).inc(count))
+
+
+@contextmanager
+def track_midtrans(operation):
+    """Ukur latency call Midtrans, hitung error jika raise"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        MIDTRANS_ERRORS.labels(operation).inc()
+        raise
+    finally:
+        MIDTRANS_LATENCY.labels(operation).observe(time.perf_counter() - start)
+
+
+def render_latest():
+    """Return (body, content_type) untuk endpoint /metrics"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        from prometheus_client import multiprocess
+
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
@@ -0,0 +1,294 @@
+"""
+Middleware monitoring request.
+
+QueryBudgetMiddleware mencatat jumlah query, total waktu DB dan SQL template
+yang berulang (indikasi N+1) per request. Aktif di development/staging,
+di production dimatikan lewat QUERY_BUDGET_ENABLED (tanpa overhead sama sekali).
+
+ProfilingMiddleware men-profile request tertentu (opt-in) lewat header,
+flag staff (cookie) atau sampling acak; lihat apps.core.profiling.
+"""
+import hmac
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .metrics import DB_QUERIES, DB_TIME, REQUEST_LATENCY, prometheus_client
+
+logger = logging.getLogger('apps.core')
+
+# IN (%s, %s, %s) dengan panjang berbeda tetap dianggap satu template
+IN_CLAUSE_PATTERN = re.compile(r'IN \((?:%s, )*%s\)')
+
+# BEGIN / COMMIT / SAVEPOINT dari ATOMIC_REQUESTS & atomic(): bukan kerja view,
+# dan di PostgreSQL BEGIN bahkan tidak lewat cursor. Tidak dihitung ke budget
+# maupun deteksi N+1 (agar laporan "3x BEGIN" tidak menenggelamkan N+1 asli).
+TRANSACTION_CONTROL_PATTERN = re.compile(
+    r'^\s*(?:BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE SAVEPOINT)\b', re.IGNORECASE
+)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """View menjalankan query lebih banyak dari budget yang dideklarasikan."""
+
+
+class QueryRecorder:
+    """
+    execute_wrapper yang menghitung query & waktu per SQL template.
+    Statement kontrol transaksi hanya dihitung terpisah (transaction_statements).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.transaction_statements = 0
+        self.duration = 0.0
+        self.templates = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            if TRANSACTION_CONTROL_PATTERN.match(sql):
+                self.transaction_statements += 1
+            else:
+                self.count += 1
+                self.templates[IN_CLAUSE_PATTERN.sub('IN (...)', sql)] += 1
+
+    def duplicates(self, threshold=2):
+        """SQL template yang dijalankan >= threshold kali, urut terbanyak"""
+        return [(sql, n) for sql, n in self.templates.most_common() if n >= threshold]
+
+
+def get_view_budget(view_func):
+    """Budget dari @query_budget, baik di function view maupun class view"""
+    budget = getattr(view_func, 'query_budget', None)
+    if budget is None:
+        view_class = getattr(view_func, 'view_class', None)
+        budget = getattr(view_class, 'query_budget', None)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Header response (jika QUERY_BUDGET_HEADERS):
+        X-DB-Query-Count, X-DB-Time-Ms, X-DB-Duplicate-Queries
+
+    Jika view melebihi budget (@query_budget atau QUERY_BUDGET_DEFAULT):
+    log warning, atau raise QueryBudgetExceeded jika QUERY_BUDGET_RAISE (tests).
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request.query_budget = settings.QUERY_BUDGET_DEFAULT
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        duplicates = recorder.duplicates(settings.QUERY_BUDGET_DUPLICATE_THRESHOLD)
+
+        if settings.QUERY_BUDGET_HEADERS:
+            response['X-DB-Query-Count'] = str(recorder.count)
+            response['X-DB-Time-Ms'] = f'{recorder.duration * 1000:.1f}'
+            response['X-DB-Duplicate-Queries'] = str(sum(n - 1 for _, n in duplicates))
+
+        if duplicates:
+            logger.warning(
+                "Repeated queries on %s %s (possible N+1): %s",
+                request.method, request.path,
+                '; '.join(f'{n}x {sql[:200]}' for sql, n in duplicates[:3])
+            )
+
+        budget = request.query_budget
+        if budget is not None and recorder.count > budget:
+            message = (
+                f'{request.method} {request.path} ran {recorder.count} queries '
+                f'(budget {budget}, {recorder.duration * 1000:.1f} ms)'
+            )
+            if settings.QUERY_BUDGET_RAISE:
+                raise QueryBudgetExceeded(message)
+            logger.warning("Query budget exceeded: %s", message)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        budget = get_view_budget(view_func)
+        if budget is not None:
+            request.query_budget = budget
+
+
+class QueryCounter:
+    """execute_wrapper minimal: hanya jumlah & waktu (dipakai tiap request di production)"""
+
+    __slots__ = ('count', 'duration')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """Latency request & query DB per URL name untuk endpoint /metrics"""
+
+    def __init__(self, get_response):
+        if prometheus_client is None or not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with connections['default'].execute_wrapper(counter):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+
+        REQUEST_LATENCY.labels(view, request.method, response.status_code).observe(duration)
+        DB_QUERIES.labels(view).observe(counter.count)
+        DB_TIME.labels(view).observe(counter.duration)
+
+        return response
+
+
+class SlowQueryMiddleware:
+    """
+    Tandai sumber query lambat (URL name) & tulis buffer slow query
+    setelah response, di luar transaksi ATOMIC_REQUESTS.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_LOG_ENABLED:
+            raise MiddlewareNotUsed
+
+        from . import slow_queries
+
+        self.slow_queries = slow_queries
+        self.get_response = get_response
+
+    def __call__(self, request):
+        previous = self.slow_queries.begin(f'{request.method} {request.path}'[:200])
+        try:
+            return self.get_response(request)
+        finally:
+            self.slow_queries.end(previous)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if match:
+            self.slow_queries.set_source(f'view {match.view_name}')
+
+
+# Cookie toggle profiling dari halaman staff
+PROFILE_COOKIE = 'ppdb_profile'
+PROFILE_COOKIE_SALT = 'apps.core.profiling'
+PROFILE_COOKIE_MAX_AGE = 60 * 60
+
+
+class ProfilingMiddleware:
+    """
+    Profile request jika salah satu terpenuhi:
+    - header "X-Profile: 1|cprofile|sampling" dari staff, atau disertai
+      "X-Profile-Token: <PROFILING_TOKEN>" (curl/CI tanpa login)
+    - cookie dari toggle staff di /monitoring/profiles/ (berlaku 1 jam)
+    - sampling acak PROFILING_SAMPLE_RATE (mode sampling, overhead kecil)
+
+    Hasil disimpan sebagai RequestProfile; id-nya di header X-Profile-Id.
+    Harus dipasang setelah AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.skip_prefixes = tuple(
+            prefix for prefix in (settings.STATIC_URL, settings.MEDIA_URL, '/metrics', '/monitoring/')
+            if prefix
+        )
+
+    def __call__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        from .profiling import ProfileSession
+
+        trigger, mode = trigger
+        with ProfileSession(mode) as session:
+            response = self.get_response(request)
+
+        try:
+            match = request.resolver_match
+            user = request.user if request.user.is_authenticated else None
+            profile = session.save(
+                path=request.get_full_path(),
+                trigger=trigger,
+                method=request.method,
+                view_name=match.view_name if match else '',
+                status_code=response.status_code,
+                user=user,
+            )
+        except Exception:
+            logger.exception("Failed to store profile for %s %s", request.method, request.path)
+        else:
+            response['X-Profile-Id'] = str(profile.pk)
+            logger.info(
+                "Request profiled (%s, %s): %s %s %.0f ms",
+                trigger, session.mode, request.method, request.path, profile.duration_ms
+            )
+
+        return response
+
+    def _trigger(self, request):
+        """Return (trigger, mode) atau None"""
+        from .models import RequestProfile
+        from .profiling import CPROFILE, MODES, SAMPLING
+
+        if request.path.startswith(self.skip_prefixes):
+            return None
+
+        header = request.headers.get('X-Profile', '').lower()
+        if header and self._header_allowed(request):
+            return RequestProfile.Trigger.HEADER, header if header in MODES else CPROFILE
+
+        mode = request.get_signed_cookie(
+            PROFILE_COOKIE, default=None, salt=PROFILE_COOKIE_SALT, max_age=PROFILE_COOKIE_MAX_AGE
+        )
+        if mode in MODES and request.user.is_staff:
+            return RequestProfile.Trigger.STAFF, mode
+
+        rate = settings.PROFILING_SAMPLE_RATE
+        if rate and random.random() < rate:
+            return RequestProfile.Trigger.SAMPLE, SAMPLING
+
+        return None
+
+    def _header_allowed(self, request):
+        if request.user.is_staff:
+            return True
+        token = settings.PROFILING_TOKEN
+        return bool(token) and hmac.compare_digest(request.headers.get('X-Profile-Token', ''), token)
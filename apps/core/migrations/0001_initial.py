@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:04
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('method', models.CharField(blank=True, max_length=10)),
+                ('path', models.CharField(max_length=500, verbose_name='Path / Command')),
+                ('view_name', models.CharField(blank=True, max_length=200, verbose_name='URL Name')),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('trigger', models.CharField(choices=[('HEADER', 'Header X-Profile'), ('STAFF', 'Flag Staff'), ('SAMPLE', 'Sampling'), ('COMMAND', 'Management Command')], max_length=10)),
+                ('profiler', models.CharField(choices=[('cprofile', 'cProfile (pstats)'), ('sampling', 'Sampling (speedscope)')], max_length=10)),
+                ('duration_ms', models.FloatField(verbose_name='Total (ms)')),
+                ('db_time_ms', models.FloatField(default=0, verbose_name='Database (ms)')),
+                ('db_queries', models.PositiveIntegerField(default=0, verbose_name='Jumlah Query')),
+                ('template_time_ms', models.FloatField(blank=True, null=True, verbose_name='Template (ms)')),
+                ('file', models.FileField(upload_to='profiles/%Y/%m/', verbose_name='File Profil')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Request Profile',
+                'verbose_name_plural': 'Request Profiles',
+                'db_table': 'request_profiles',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:06
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('fingerprint', models.CharField(max_length=40, unique=True)),
+                ('sql', models.TextField(verbose_name='SQL (normalized)')),
+                ('params_shape', models.CharField(blank=True, max_length=500, verbose_name='Bentuk Parameter')),
+                ('calls', models.PositiveIntegerField(default=0, verbose_name='Jumlah')),
+                ('total_ms', models.FloatField(default=0, verbose_name='Total (ms)')),
+                ('max_ms', models.FloatField(default=0, verbose_name='Maks (ms)')),
+                ('last_source', models.CharField(blank=True, max_length=200, verbose_name='Sumber Terakhir')),
+                ('last_stack', models.TextField(blank=True, verbose_name='Stack Terakhir')),
+                ('explain', models.TextField(blank=True, verbose_name='EXPLAIN')),
+                ('explained_at', models.DateTimeField(blank=True, null=True)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Slow Query',
+                'verbose_name_plural': 'Slow Queries',
+                'db_table': 'slow_queries',
+                'ordering': ['-total_ms'],
+            },
+        ),
+    ]
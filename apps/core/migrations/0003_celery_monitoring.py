@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:08
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_slowquery'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueueDepthSample',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('queue', models.CharField(max_length=100)),
+                ('depth', models.PositiveIntegerField()),
+                ('consumers', models.PositiveIntegerField(blank=True, null=True)),
+                ('sampled_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Queue Depth Sample',
+                'verbose_name_plural': 'Queue Depth Samples',
+                'db_table': 'celery_queue_depth',
+                'ordering': ['-sampled_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('task_id', models.CharField(db_index=True, max_length=255)),
+                ('task_name', models.CharField(max_length=200)),
+                ('queue', models.CharField(blank=True, max_length=100)),
+                ('worker', models.CharField(blank=True, max_length=200)),
+                ('state', models.CharField(choices=[('SUCCESS', 'Sukses'), ('FAILURE', 'Gagal'), ('RETRY', 'Retry'), ('IGNORED', 'Diabaikan'), ('REJECTED', 'Ditolak')], max_length=10)),
+                ('retries', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.CharField(blank=True, max_length=500)),
+                ('lag_ms', models.FloatField(blank=True, null=True, verbose_name='Lag Antrian (ms)')),
+                ('runtime_ms', models.FloatField(verbose_name='Runtime (ms)')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Task Run',
+                'verbose_name_plural': 'Task Runs',
+                'db_table': 'celery_task_runs',
+                'ordering': ['-finished_at'],
+                'indexes': [models.Index(fields=['task_name', 'finished_at'], name='celery_task_task_na_be3f23_idx')],
+            },
+        ),
+    ]
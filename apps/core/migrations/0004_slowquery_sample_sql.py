@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_celery_monitoring'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slowquery',
+            name='sample_sql',
+            field=models.TextField(blank=True, verbose_name='Contoh SQL'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:37
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_slowquery_sample_sql'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdminJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('action', models.CharField(max_length=100, verbose_name='Aksi')),
+                ('model', models.CharField(max_length=100, verbose_name='Model')),
+                ('query', models.BinaryField()),
+                ('status', models.CharField(choices=[('PENDING', 'Menunggu'), ('RUNNING', 'Berjalan'), ('DONE', 'Selesai'), ('FAILED', 'Gagal')], default='PENDING', max_length=10)),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Jumlah Terpilih')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Diproses')),
+                ('succeeded', models.PositiveIntegerField(default=0, verbose_name='Berhasil')),
+                ('failed', models.PositiveIntegerField(default=0, verbose_name='Gagal')),
+                ('last_pk', models.CharField(blank=True, max_length=64)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('error', models.TextField(blank=True, verbose_name='Error Job')),
+                ('result_file', models.FileField(blank=True, upload_to='admin_jobs/%Y/%m/', verbose_name='File Hasil')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Admin Job',
+                'verbose_name_plural': 'Admin Jobs',
+                'db_table': 'admin_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_admin_jobs'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='adminjob',
+            name='query',
+        ),
+        migrations.AddField(
+            model_name='adminjob',
+            name='changelist_params',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='adminjob',
+            name='select_across',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='adminjob',
+            name='selected_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
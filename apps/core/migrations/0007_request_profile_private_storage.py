@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:07
+
+import apps.core.storage
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+from apps.core.storage import private_storage
+
+
+def move_profiles(apps, schema_editor):
+    """Pindahkan file profil lama dari MEDIA_ROOT (publik) ke storage privat"""
+    RequestProfile = apps.get_model('core', 'RequestProfile')
+    storage = private_storage()
+    for name in RequestProfile.objects.exclude(file='').values_list('file', flat=True).iterator():
+        if not default_storage.exists(name) or storage.exists(name):
+            continue
+        with default_storage.open(name, 'rb') as source:
+            storage.save(name, source)
+        default_storage.delete(name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_admin_job_explicit_selection'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='requestprofile',
+            name='file',
+            field=models.FileField(storage=apps.core.storage.private_storage, upload_to='profiles/%Y/%m/', verbose_name='File Profil'),
+        ),
+        migrations.RunPython(move_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,256 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .storage import private_storage
+
+
+class RequestProfile(models.Model):
+    """
+    Hasil profiling satu request / management command.
+    File profil (pstats atau speedscope JSON) disimpan di storage.
+    """
+    
+    class Trigger(models.TextChoices):
+        HEADER = 'HEADER', _('Header X-Profile')
+        STAFF = 'STAFF', _('Flag Staff')
+        SAMPLE = 'SAMPLE', _('Sampling')
+        COMMAND = 'COMMAND', _('Management Command')
+    
+    class Profiler(models.TextChoices):
+        CPROFILE = 'cprofile', _('cProfile (pstats)')
+        SAMPLING = 'sampling', _('Sampling (speedscope)')
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    method = models.CharField(max_length=10, blank=True)
+    path = models.CharField(_('Path / Command'), max_length=500)
+    view_name = models.CharField(_('URL Name'), max_length=200, blank=True)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    
+    trigger = models.CharField(max_length=10, choices=Trigger.choices)
+    profiler = models.CharField(max_length=10, choices=Profiler.choices)
+    
+    # Breakdown waktu (ms)
+    duration_ms = models.FloatField(_('Total (ms)'))
+    db_time_ms = models.FloatField(_('Database (ms)'), default=0)
+    db_queries = models.PositiveIntegerField(_('Jumlah Query'), default=0)
+    template_time_ms = models.FloatField(_('Template (ms)'), null=True, blank=True)
+    
+    file = models.FileField(_('File Profil'), upload_to='profiles/%Y/%m/', storage=private_storage)
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        db_table = 'request_profiles'
+        verbose_name = _('Request Profile')
+        verbose_name_plural = _('Request Profiles')
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+    
+    @property
+    def view_time_ms(self):
+        """
+        Perkiraan waktu di luar DB & template (Python view/ORM/serialisasi).
+        Query lazy yang dieksekusi saat render ikut terhitung di template time.
+        """
+        return max(self.duration_ms - self.db_time_ms - (self.template_time_ms or 0), 0)
+    
+    @property
+    def download_name(self):
+        ext = 'prof' if self.profiler == self.Profiler.CPROFILE else 'speedscope.json'
+        return f'profile-{self.created_at:%Y%m%d-%H%M%S}-{str(self.pk)[:8]}.{ext}'
+
+class SlowQuery(models.Model):
+    """
+    Agregat query lambat per fingerprint SQL (lihat apps.core.slow_queries).
+    Parameter query tidak disimpan (bisa berisi NIK/kontak), hanya bentuknya.
+    """
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    fingerprint = models.CharField(max_length=40, unique=True)
+    sql = models.TextField(_('SQL (normalized)'))
+    # Template SQL asli (placeholder %s, tanpa nilai) untuk replay index_advisor
+    sample_sql = models.TextField(_('Contoh SQL'), blank=True)
+    params_shape = models.CharField(_('Bentuk Parameter'), max_length=500, blank=True)
+    
+    calls = models.PositiveIntegerField(_('Jumlah'), default=0)
+    total_ms = models.FloatField(_('Total (ms)'), default=0)
+    max_ms = models.FloatField(_('Maks (ms)'), default=0)
+    
+    last_source = models.CharField(_('Sumber Terakhir'), max_length=200, blank=True)
+    last_stack = models.TextField(_('Stack Terakhir'), blank=True)
+    
+    explain = models.TextField(_('EXPLAIN'), blank=True)
+    explained_at = models.DateTimeField(null=True, blank=True)
+    
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        db_table = 'slow_queries'
+        verbose_name = _('Slow Query')
+        verbose_name_plural = _('Slow Queries')
+        ordering = ['-total_ms']
+    
+    def __str__(self):
+        return f"{self.fingerprint[:8]} ({self.calls}x, max {self.max_ms:.0f} ms)"
+    
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.calls if self.calls else 0
+    
+    @property
+    def hint(self):
+        """Petunjuk singkat untuk pola yang pasti tidak memakai index B-tree"""
+        if '%contains%' in self.params_shape or '%suffix' in self.params_shape:
+            return _('LIKE dengan wildcard di depan: index B-tree tidak terpakai (sequential scan)')
+        if 'prefix%' in self.params_shape and 'UPPER(' in self.sql:
+            return _('Prefix LIKE case-insensitive: perlu index ekspresi UPPER(...)')
+        return ''
+
+class TaskRun(models.Model):
+    """Satu eksekusi task Celery (diisi signal di apps.core.signals)"""
+    
+    class State(models.TextChoices):
+        SUCCESS = 'SUCCESS', _('Sukses')
+        FAILURE = 'FAILURE', _('Gagal')
+        RETRY = 'RETRY', _('Retry')
+        IGNORED = 'IGNORED', _('Diabaikan')
+        REJECTED = 'REJECTED', _('Ditolak')
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    task_id = models.CharField(max_length=255, db_index=True)
+    task_name = models.CharField(max_length=200)
+    queue = models.CharField(max_length=100, blank=True)
+    worker = models.CharField(max_length=200, blank=True)
+    
+    state = models.CharField(max_length=10, choices=State.choices)
+    retries = models.PositiveSmallIntegerField(default=0)
+    error = models.CharField(max_length=500, blank=True)
+    
+    # Enqueue (atau ETA) -> mulai dieksekusi worker; kosong untuk task eager
+    lag_ms = models.FloatField(_('Lag Antrian (ms)'), null=True, blank=True)
+    runtime_ms = models.FloatField(_('Runtime (ms)'))
+    
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        db_table = 'celery_task_runs'
+        verbose_name = _('Task Run')
+        verbose_name_plural = _('Task Runs')
+        ordering = ['-finished_at']
+        indexes = [
+            models.Index(fields=['task_name', 'finished_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.task_name} [{self.state}] {self.runtime_ms:.0f} ms"
+
+
+class QueueDepthSample(models.Model):
+    """Jumlah pesan menunggu di queue broker (probe beat tiap menit)"""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    queue = models.CharField(max_length=100)
+    depth = models.PositiveIntegerField()
+    consumers = models.PositiveIntegerField(null=True, blank=True)
+    sampled_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        db_table = 'celery_queue_depth'
+        verbose_name = _('Queue Depth Sample')
+        verbose_name_plural = _('Queue Depth Samples')
+        ordering = ['-sampled_at']
+    
+    def __str__(self):
+        return f"{self.queue}: {self.depth}"
+
+class AdminJob(models.Model):
+    """
+    Aksi massal admin yang dijalankan di Celery (lihat apps.core.admin_jobs).
+    Seleksi disimpan eksplisit: pk yang dicentang di halaman, atau parameter
+    filter changelist untuk "pilih semua" (queryset dibangun ulang di worker).
+    """
+    
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', _('Menunggu')
+        RUNNING = 'RUNNING', _('Berjalan')
+        DONE = 'DONE', _('Selesai')
+        FAILED = 'FAILED', _('Gagal')
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    action = models.CharField(_('Aksi'), max_length=100)
+    model = models.CharField(_('Model'), max_length=100)  # app_label.model_name
+    # "Pilih semua N" di changelist: seleksi = hasil filter changelist_params
+    select_across = models.BooleanField(default=False)
+    selected_ids = models.JSONField(default=list, blank=True)
+    changelist_params = models.JSONField(default=dict, blank=True)  # request.GET changelist
+    
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    total = models.PositiveIntegerField(_('Jumlah Terpilih'), default=0)
+    processed = models.PositiveIntegerField(_('Diproses'), default=0)
+    succeeded = models.PositiveIntegerField(_('Berhasil'), default=0)
+    failed = models.PositiveIntegerField(_('Gagal'), default=0)
+    # Posisi keyset (pk terakhir yang sudah diproses)
+    last_pk = models.CharField(max_length=64, blank=True)
+    
+    # [{"pk": ..., "label": ..., "error": ...}, ...] (dibatasi, lihat MAX_ERRORS)
+    errors = models.JSONField(default=list, blank=True)
+    error = models.TextField(_('Error Job'), blank=True)
+    result_file = models.FileField(_('File Hasil'), upload_to='admin_jobs/%Y/%m/', blank=True)
+    
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'admin_jobs'
+        verbose_name = _('Admin Job')
+        verbose_name_plural = _('Admin Jobs')
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.action} [{self.status}] {self.processed}/{self.total}"
+    
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.DONE, self.Status.FAILED)
+    
+    @property
+    def progress_percent(self):
+        if not self.total:
+            return 100 if self.is_finished else 0
+        return min(100, round(self.processed * 100 / self.total))
+    
+    @property
+    def duration(self):
+        if self.started_at is None:
+            return None
+        return (self.finished_at or timezone.now()) - self.started_at
\ No newline at end of file
@@ -0,0 +1,260 @@
+"""
+Profiler opt-in untuk request & management command.
+
+Dua mode:
+- cprofile : deterministik (cProfile), overhead besar, output pstats
+             (buka dengan snakeviz / `python -m pstats`).
+- sampling : thread terpisah mengambil stack thread request tiap
+             PROFILING_SAMPLE_INTERVAL_MS, overhead kecil sehingga aman untuk
+             sampling acak di production. Output speedscope JSON
+             (buka di https://www.speedscope.app).
+
+Keduanya mencatat breakdown waktu DB (execute_wrapper) & template rendering.
+"""
+import cProfile
+import json
+import logging
+import marshal
+import sys
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections
+from django.template.base import Template
+
+from .middleware import QueryCounter
+
+logger = logging.getLogger('apps.core')
+
+CPROFILE = 'cprofile'
+SAMPLING = 'sampling'
+MODES = (CPROFILE, SAMPLING)
+
+# Frame Template.render: dipakai menghitung waktu template
+_TEMPLATE_RENDER_CODE = Template.render.__code__
+_TEMPLATE_RENDER_KEY = (
+    _TEMPLATE_RENDER_CODE.co_filename,
+    _TEMPLATE_RENDER_CODE.co_firstlineno,
+    _TEMPLATE_RENDER_CODE.co_name,
+)
+
+
+def _threading_patched():
+    """Sampling butuh OS thread sungguhan (tidak jalan di bawah gevent monkey-patch)"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+
+class SamplingProfiler:
+    """Sampler stack satu thread via sys._current_frames()"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.frames = []  # [(name, file, line)]
+        self._frame_index = {}  # code object -> index frame
+        self.samples = []  # [[index frame root ... leaf]]
+        self.weights = []  # ms per sample
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name='ppdb-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            now = time.perf_counter()
+            if frame is not None:
+                self.samples.append(self._stack(frame))
+                self.weights.append((now - last) * 1000)
+            last = now
+            del frame
+
+    def _stack(self, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            index = self._frame_index.get(code)
+            if index is None:
+                index = self._frame_index[code] = len(self.frames)
+                self.frames.append((code.co_name, code.co_filename, code.co_firstlineno))
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def template_time_ms(self):
+        index = self._frame_index.get(_TEMPLATE_RENDER_CODE)
+        if index is None:
+            return 0.0
+        return sum(w for stack, w in zip(self.samples, self.weights) if index in stack)
+
+    def speedscope(self, name):
+        total = sum(self.weights)
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'ppdb-pkbm',
+            'shared': {
+                'frames': [{'name': n, 'file': f, 'line': line} for n, f, line in self.frames],
+            },
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': total,
+                'samples': self.samples,
+                'weights': self.weights,
+            }],
+        }
+
+
+class ProfileSession:
+    """
+    Context manager: jalankan profiler + hitung query DB selama blok.
+
+        with ProfileSession('sampling') as session:
+            response = get_response(request)
+        session.save(path=request.path, trigger=RequestProfile.Trigger.HEADER)
+    """
+
+    def __init__(self, mode=CPROFILE, interval_ms=None):
+        if mode == SAMPLING and _threading_patched():
+            mode = CPROFILE
+        self.mode = mode
+        self.interval = (interval_ms or settings.PROFILING_SAMPLE_INTERVAL_MS) / 1000
+        self.counter = QueryCounter()
+        self.duration = 0.0
+        self._profiler = None
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self.counter))
+
+        if self.mode == CPROFILE:
+            self._profiler = cProfile.Profile()
+            try:
+                self._profiler.enable()
+            except ValueError:
+                # Python 3.12+: hanya satu cProfile aktif per proses
+                self.mode = SAMPLING
+
+        if self.mode == SAMPLING:
+            self._profiler = SamplingProfiler(self.interval)
+            self._profiler.start()
+
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        if self.mode == CPROFILE:
+            self._profiler.disable()
+            self._profiler.create_stats()
+        else:
+            self._profiler.stop()
+        self._stack.close()
+        return False
+
+    def template_time_ms(self):
+        if self.mode == SAMPLING:
+            return self._profiler.template_time_ms()
+        entry = self._profiler.stats.get(_TEMPLATE_RENDER_KEY)
+        # (cc, nc, tottime, cumtime, callers); cumtime tidak dobel untuk rekursi
+        return entry[3] * 1000 if entry else 0.0
+
+    def dump(self, name):
+        """Isi file profil: pstats (marshal) atau speedscope JSON"""
+        if self.mode == CPROFILE:
+            return marshal.dumps(self._profiler.stats)
+        return json.dumps(self._profiler.speedscope(name)).encode()
+
+    def save(self, path, trigger, method='', view_name='', status_code=None, user=None):
+        from .models import RequestProfile
+
+        profile = RequestProfile(
+            method=method,
+            path=path[:500],
+            view_name=view_name or '',
+            status_code=status_code,
+            trigger=trigger,
+            profiler=self.mode,
+            duration_ms=self.duration * 1000,
+            db_time_ms=self.counter.duration * 1000,
+            db_queries=self.counter.count,
+            template_time_ms=self.template_time_ms(),
+            user=user,
+        )
+        filename = f'{profile.pk}.prof' if self.mode == CPROFILE else f'{profile.pk}.speedscope.json'
+        profile.file.save(filename, ContentFile(self.dump(f'{method} {path}'.strip())), save=False)
+        profile.save()
+        return profile
+
+
+class ProfiledCommandMixin:
+    """
+    Tambah flag `--profile [cprofile|sampling]` ke management command.
+
+    Hasil disimpan sebagai RequestProfile (trigger COMMAND, bisa di-download
+    dari halaman staff) atau ke file lokal jika `--profile-output` diisi.
+
+        class Command(ProfiledCommandMixin, BaseCommand): ...
+    """
+
+    def create_parser(self, prog_name, subcommand, **kwargs):
+        parser = super().create_parser(prog_name, subcommand, **kwargs)
+        parser.add_argument(
+            '--profile',
+            nargs='?',
+            const=CPROFILE,
+            choices=MODES,
+            help='Profile this run (default mode: cprofile)'
+        )
+        parser.add_argument(
+            '--profile-output',
+            help='Write the profile to this file instead of storing it in the database'
+        )
+        self._profile_subcommand = subcommand
+        return parser
+
+    def execute(self, *args, **options):
+        mode = options.pop('profile', None)
+        output = options.pop('profile_output', None)
+        if not mode:
+            return super().execute(*args, **options)
+
+        from .models import RequestProfile
+
+        session = ProfileSession(mode)
+        try:
+            with session:
+                return super().execute(*args, **options)
+        finally:
+            name = getattr(self, '_profile_subcommand', None) or self.__module__.rsplit('.', 1)[-1]
+            if output:
+                with open(output, 'wb') as f:
+                    f.write(session.dump(name))
+                location = output
+            else:
+                location = session.save(path=name, trigger=RequestProfile.Trigger.COMMAND).file.name
+            self.stderr.write(
+                f'Profile ({session.mode}): {session.duration * 1000:.0f} ms, '
+                f'{session.counter.count} queries ({session.counter.duration * 1000:.0f} ms DB) -> {location}'
+            )
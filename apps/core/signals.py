@@ -0,0 +1,105 @@
+"""
+Instrumentasi Celery: lag antrian, runtime, retry & kegagalan per task
+(metrics Prometheus + tabel TaskRun) dan sumber slow query.
+Terhubung saat app registry siap (CoreConfig.ready).
+"""
+import logging
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from celery.signals import before_task_publish, task_failure, task_postrun, task_prerun, task_retry
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import slow_queries
+from .metrics import CELERY_TASK_DURATION, CELERY_TASK_LAG, CELERY_TASK_RETRIES
+
+logger = logging.getLogger('apps.core')
+
+# Header tambahan di pesan task: waktu enqueue (epoch detik)
+SENT_AT_HEADER = 'ppdb_sent_at'
+
+_started = {}
+_errors = {}
+
+
+@before_task_publish.connect
+def task_sent(headers=None, **kwargs):
+    if headers is not None:
+        headers[SENT_AT_HEADER] = time.time()
+
+
+def _queue_lag(request, started):
+    """Detik dari enqueue (atau ETA/countdown jika lebih akhir) sampai mulai"""
+    sent_at = getattr(request, SENT_AT_HEADER, None)
+    if sent_at is None:
+        return None
+
+    ready_at = float(sent_at)
+    eta = request.eta
+    if eta:
+        eta = parse_datetime(eta) if isinstance(eta, str) else eta
+        if eta is not None:
+            if timezone.is_naive(eta):
+                eta = eta.replace(tzinfo=dt_timezone.utc)
+            ready_at = max(ready_at, eta.timestamp())
+
+    return max(started - ready_at, 0.0)
+
+
+@task_prerun.connect
+def task_started(task_id=None, task=None, **kwargs):
+    _started[task_id] = (time.perf_counter(), time.time(), slow_queries.begin(f'task {task.name}'))
+
+
+@task_retry.connect
+def task_retried(request=None, reason=None, **kwargs):
+    _errors[request.id] = str(reason)
+
+
+@task_failure.connect
+def task_failed(task_id=None, exception=None, **kwargs):
+    _errors[task_id] = f'{type(exception).__name__}: {exception}'
+
+
+@task_postrun.connect
+def task_finished(task_id=None, task=None, state=None, **kwargs):
+    started = _started.pop(task_id, None)
+    error = _errors.pop(task_id, '')
+    if started is None:
+        return
+
+    start, wall_start, previous_source = started
+    slow_queries.end(previous_source)
+
+    runtime = time.perf_counter() - start
+    state = state or 'UNKNOWN'
+    lag = _queue_lag(task.request, wall_start)
+
+    CELERY_TASK_DURATION.labels(task.name, state).observe(runtime)
+    if lag is not None:
+        CELERY_TASK_LAG.labels(task.name).observe(lag)
+    if state == 'RETRY':
+        CELERY_TASK_RETRIES.labels(task.name).inc()
+
+    from .models import TaskRun
+
+    try:
+        # Savepoint: task eager berjalan di dalam transaksi request
+        with transaction.atomic():
+            TaskRun.objects.create(
+                task_id=task_id,
+                task_name=task.name[:200],
+                queue=((task.request.delivery_info or {}).get('routing_key') or '')[:100],
+                worker=(task.request.hostname or '')[:200],
+                state=state[:10],
+                retries=task.request.retries or 0,
+                error=error[:500],
+                lag_ms=lag * 1000 if lag is not None else None,
+                runtime_ms=runtime * 1000,
+                started_at=datetime.fromtimestamp(wall_start, dt_timezone.utc),
+                finished_at=datetime.fromtimestamp(wall_start, dt_timezone.utc) + timedelta(seconds=runtime),
+            )
+    except DatabaseError:
+        logger.exception("Failed to record task run %s (%s)", task.name, task_id)
@@ -0,0 +1,279 @@
+"""
+Slow query log untuk semua query ORM/raw.
+
+Wrapper dipasang di setiap koneksi baru (signal connection_created) dan
+hanya bekerja ekstra untuk query >= SLOW_QUERY_THRESHOLD_MS:
+- log warning (SQL terpotong + sumber)
+- simpan ke buffer per thread: fingerprint SQL, bentuk parameter (tanpa nilai),
+  sumber (view / task / command) dan frame kode aplikasi pemanggil
+- sebagian kecil (SLOW_QUERY_EXPLAIN_RATE) di-EXPLAIN (ANALYZE, BUFFERS) di
+  Postgres; dipakai di staging saja karena query dijalankan ulang
+
+Buffer ditulis ke tabel SlowQuery di akhir request / task (di luar transaksi
+ATOMIC_REQUESTS), atau langsung untuk management command.
+"""
+import atexit
+import hashlib
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .middleware import IN_CLAUSE_PATTERN
+
+logger = logging.getLogger('apps.core')
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_PATTERN = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+# Frame dari file ini & wrapper lain tidak menarik sebagai "pemanggil"
+_APPS_ROOT = os.path.join(str(settings.BASE_DIR), 'apps') + os.sep
+_SKIP_FILES = (__file__, os.path.join(os.path.dirname(__file__), 'middleware.py'))
+MAX_STACK_FRAMES = 5
+
+_local = threading.local()
+
+
+def fingerprint(sql):
+    """
+    Normalisasi SQL: literal angka/string jadi ?, IN (...) disatukan, spasi dirapikan.
+    Halaman pagination berbeda (LIMIT/OFFSET literal) masuk fingerprint yang sama.
+    """
+    normalized = IN_CLAUSE_PATTERN.sub('IN (...)', sql)
+    normalized = STRING_LITERAL_PATTERN.sub('?', normalized)
+    normalized = NUMBER_LITERAL_PATTERN.sub('?', normalized)
+    normalized = WHITESPACE_PATTERN.sub(' ', normalized).strip()
+    return hashlib.sha1(normalized.encode()).hexdigest(), normalized
+
+
+def params_shape(params, many=False):
+    """Tipe tiap parameter; pola LIKE ditandai (%contains%, prefix%, %suffix)"""
+    if many:
+        return f'executemany[{len(params) if hasattr(params, "__len__") else "?"}]'
+    if not params:
+        return ''
+
+    values = params.values() if isinstance(params, dict) else params
+    parts = []
+    for value in values:
+        if isinstance(value, str):
+            leading, trailing = value.startswith('%'), value.endswith('%') and len(value) > 1
+            if leading and trailing:
+                parts.append('str %contains%')
+            elif trailing:
+                parts.append('str prefix%')
+            elif leading:
+                parts.append('str %suffix')
+            else:
+                parts.append('str')
+        elif isinstance(value, (list, tuple)):
+            parts.append(f'{type(value).__name__}[{len(value)}]')
+        else:
+            parts.append(type(value).__name__)
+
+    return f"({', '.join(parts)})"[:500]
+
+
+def _app_stack():
+    """Frame kode aplikasi (apps/...) terdalam yang menjalankan query"""
+    frames = []
+    frame = sys._getframe(2)
+    while frame is not None and len(frames) < MAX_STACK_FRAMES:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APPS_ROOT) and filename not in _SKIP_FILES:
+            frames.append(
+                f'{os.path.relpath(filename, settings.BASE_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}'
+            )
+        frame = frame.f_back
+    return '\n'.join(frames)
+
+
+def _command_source():
+    if len(sys.argv) > 1 and os.path.basename(sys.argv[0]) in ('manage.py', 'django-admin'):
+        return f'command {sys.argv[1]}'
+    return os.path.basename(sys.argv[0]) if sys.argv else ''
+
+
+def _explain(connection, sql, params):
+    """EXPLAIN (ANALYZE, BUFFERS) di Postgres, EXPLAIN biasa di backend lain"""
+    if not sql.lstrip()[:6].upper() == 'SELECT':
+        return ''
+    try:
+        prefix = connection.ops.explain_query_prefix(analyze=True, buffers=True)
+    except ValueError:
+        prefix = connection.ops.explain_query_prefix()
+
+    # Savepoint: EXPLAIN yang gagal tidak merusak transaksi request
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+
+
+class SlowQueryCollector:
+    """execute_wrapper; query cepat hanya menambah satu perf_counter()"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+        self.explain_rate = settings.SLOW_QUERY_EXPLAIN_RATE
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_local, 'suspended', False):
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - start
+
+        if duration >= self.threshold:
+            self._record(sql, params, many, duration)
+        return result
+
+    def _record(self, sql, params, many, duration):
+        _local.suspended = True
+        try:
+            digest, normalized = fingerprint(sql)
+            source = getattr(_local, 'source', None) or _command_source()
+
+            explain = ''
+            if self.explain_rate and not many and random.random() < self.explain_rate:
+                try:
+                    explain = _explain(self.connection, sql, params)
+                except DatabaseError:
+                    logger.warning("EXPLAIN failed for slow query %s", digest[:8], exc_info=True)
+
+            logger.warning(
+                "Slow query %.0f ms [%s] %s", duration * 1000, source, normalized[:300],
+                extra={'sql_fingerprint': digest, 'duration_ms': round(duration * 1000, 1)}
+            )
+
+            _buffer().append({
+                'fingerprint': digest,
+                'sql': normalized,
+                'sample_sql': sql if not many else '',
+                'params_shape': params_shape(params, many),
+                'duration_ms': duration * 1000,
+                'source': source[:200],
+                'stack': _app_stack(),
+                'explain': explain,
+            })
+        finally:
+            _local.suspended = False
+
+        # Management command / shell: tidak ada akhir request, tulis langsung
+        if getattr(_local, 'source', None) is None and not self.connection.in_atomic_block:
+            flush()
+
+
+def _buffer():
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is None:
+        buffer = _local.buffer = []
+    return buffer
+
+
+def begin(source):
+    """
+    Mulai unit kerja (request / task). Return sumber sebelumnya untuk end();
+    task eager di dalam request tidak memutus sumber request.
+    """
+    previous = getattr(_local, 'source', None)
+    _local.source = source
+    return previous
+
+
+def set_source(source):
+    if getattr(_local, 'source', None) is not None:
+        _local.source = source
+
+
+def end(previous=None):
+    """Akhiri unit kerja; buffer ditulis saat unit terluar selesai"""
+    _local.source = previous
+    if previous is None:
+        flush()
+
+
+def flush():
+    """Tulis buffer thread ini ke tabel SlowQuery (upsert per fingerprint)"""
+    buffer = getattr(_local, 'buffer', None)
+    if not buffer:
+        return
+    _local.buffer = []
+
+    from .models import SlowQuery
+
+    grouped = defaultdict(list)
+    for entry in buffer:
+        grouped[entry['fingerprint']].append(entry)
+
+    now = timezone.now()
+    _local.suspended = True
+    try:
+        for digest, entries in grouped.items():
+            last = entries[-1]
+            values = {
+                'calls': F('calls') + len(entries),
+                'total_ms': F('total_ms') + sum(e['duration_ms'] for e in entries),
+                'max_ms': Greatest(F('max_ms'), Value(max(e['duration_ms'] for e in entries))),
+                'params_shape': last['params_shape'],
+                'sample_sql': last['sample_sql'],
+                'last_source': last['source'],
+                'last_stack': last['stack'],
+                'last_seen': now,
+            }
+            explained = [e['explain'] for e in entries if e['explain']]
+            if explained:
+                values.update(explain=explained[-1], explained_at=now)
+
+            if SlowQuery.objects.filter(fingerprint=digest).update(**values):
+                continue
+
+            try:
+                with transaction.atomic():
+                    SlowQuery.objects.create(
+                        fingerprint=digest,
+                        sql=last['sql'],
+                        sample_sql=last['sample_sql'],
+                        params_shape=last['params_shape'],
+                        calls=len(entries),
+                        total_ms=sum(e['duration_ms'] for e in entries),
+                        max_ms=max(e['duration_ms'] for e in entries),
+                        last_source=last['source'],
+                        last_stack=last['stack'],
+                        explain=explained[-1] if explained else '',
+                        explained_at=now if explained else None,
+                        last_seen=now,
+                    )
+            except IntegrityError:
+                # Worker lain membuat fingerprint yang sama barusan
+                SlowQuery.objects.filter(fingerprint=digest).update(**values)
+    except DatabaseError:
+        logger.exception("Failed to store %s slow queries", len(buffer))
+    finally:
+        _local.suspended = False
+
+
+@receiver(connection_created)
+def install_collector(sender, connection, **kwargs):
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        connection.execute_wrappers.append(SlowQueryCollector(connection))
+
+
+# Sisa buffer command yang berakhir di dalam transaksi
+atexit.register(flush)
+
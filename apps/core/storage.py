@@ -0,0 +1,11 @@
+"""
+Storage privat: file di luar MEDIA_ROOT (tidak dilayani web server / static()),
+hanya bisa diunduh lewat view yang mengecek permission (mis. profil request
+yang berisi path, parameter & SQL).
+"""
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+
+def private_storage():
+    return FileSystemStorage(location=settings.PRIVATE_MEDIA_ROOT, base_url=None)
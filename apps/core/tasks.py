@@ -0,0 +1,81 @@
+"""
+Celery tasks monitoring.
+"""
+import logging
+from datetime import timedelta
+
+from celery import current_app, shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from . import admin_jobs
+from .metrics import CELERY_QUEUE_DEPTH
+from .models import QueueDepthSample, RequestProfile, TaskRun
+
+logger = logging.getLogger('apps.core')
+
+# Profil yang dihapus per run prune_request_profiles
+PROFILE_PRUNE_BATCH = 500
+
+
+@shared_task(ignore_result=True)
+def sample_queue_depth():
+    """
+    Probe beat: jumlah pesan menunggu per queue (CELERY_MONITORED_QUEUES).
+    queue_declare(passive=True) didukung transport Redis maupun AMQP.
+    Sekalian hapus data monitoring yang lebih lama dari retensi.
+    """
+    samples = []
+    with current_app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for queue in settings.CELERY_MONITORED_QUEUES:
+            try:
+                _, depth, consumers = channel.queue_declare(queue=queue, passive=True)
+            except connection.channel_errors:
+                # Queue belum pernah dibuat = belum ada pesan
+                depth, consumers = 0, None
+                channel = connection.channel()
+
+            CELERY_QUEUE_DEPTH.labels(queue).set(depth)
+            samples.append(QueueDepthSample(queue=queue, depth=depth, consumers=consumers))
+
+    QueueDepthSample.objects.bulk_create(samples)
+
+    cutoff = timezone.now() - timedelta(days=settings.CELERY_MONITOR_RETENTION_DAYS)
+    TaskRun.objects.filter(finished_at__lt=cutoff).delete()
+    QueueDepthSample.objects.filter(sampled_at__lt=cutoff).delete()
+
+    logger.debug("Queue depth: %s", {s.queue: s.depth for s in samples})
+
+
+@shared_task(ignore_result=True)
+def prune_request_profiles():
+    """
+    Beat terpisah dari sample_queue_depth: pruning profil tetap jalan
+    walaupun broker tidak bisa di-probe.
+    """
+    return prune_profiles(timezone.now() - timedelta(days=settings.PROFILING_RETENTION_DAYS))
+
+
+def prune_profiles(cutoff, limit=PROFILE_PRUNE_BATCH):
+    """
+    Hapus RequestProfile sebelum `cutoff` beserta file-nya (storage privat).
+    Paling banyak `limit` per panggilan; sisanya di run beat berikutnya.
+    """
+    rows = list(RequestProfile.objects.filter(created_at__lt=cutoff).order_by('created_at').values_list('pk', 'file')[:limit])
+    if not rows:
+        return 0
+
+    storage = RequestProfile._meta.get_field('file').storage
+    for _, name in rows:
+        if name:
+            storage.delete(name)
+    deleted, _ = RequestProfile.objects.filter(pk__in=[pk for pk, _ in rows]).delete()
+    logger.info("Pruned %s request profiles older than %s", deleted, cutoff)
+    return deleted
+
+
+@shared_task(ignore_result=True, acks_late=True)
+def run_admin_job(job_id):
+    """Aksi massal admin (AdminJob) diproses per chunk, lihat apps.core.admin_jobs"""
+    admin_jobs.run(job_id)
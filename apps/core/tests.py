@@ -0,0 +1,63 @@
+"""
+QueryBudgetMiddleware & @query_budget: saat test view yang melebihi budget
+gagal dengan QueryBudgetExceeded (QUERY_BUDGET_RAISE aktif saat TESTING).
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import path
+
+from .decorators import query_budget
+from .middleware import QueryBudgetExceeded
+
+
+def _two_queries():
+    User = get_user_model()
+    User.objects.exists()
+    User.objects.count()
+
+
+@query_budget(1)
+def over_budget(request):
+    _two_queries()
+    return HttpResponse('ok')
+
+
+@query_budget(2)
+def within_budget(request):
+    # SAVEPOINT / RELEASE tidak dihitung sebagai query
+    with transaction.atomic():
+        _two_queries()
+    return HttpResponse('ok')
+
+
+urlpatterns = [
+    path('over-budget/', over_budget),
+    path('within-budget/', within_budget),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class QueryBudgetTests(TestCase):
+
+    def test_settings_raise_in_tests(self):
+        from django.conf import settings
+        self.assertTrue(settings.QUERY_BUDGET_ENABLED)
+        self.assertTrue(settings.QUERY_BUDGET_RAISE)
+
+    def test_view_over_budget_raises(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'ran 2 queries (budget 1'):
+            self.client.get('/over-budget/')
+
+    def test_view_within_budget(self):
+        response = self.client.get('/within-budget/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-DB-Query-Count'], '2')
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_over_budget_only_logs_when_raise_disabled(self):
+        with self.assertLogs('apps.core', level='WARNING') as logs:
+            response = self.client.get('/over-budget/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Query budget exceeded', '\n'.join(logs.output))
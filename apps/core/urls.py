@@ -0,0 +1,25 @@
+from django.urls import path
+from . import views
+
+app_name = 'core'
+
+urlpatterns = [
+    # Prometheus scrape endpoint
+    path('metrics', views.metrics_view, name='metrics'),
+
+    # Profiling (staff)
+    path('monitoring/profiles/', views.ProfileListView.as_view(), name='profile_list'),
+    path('monitoring/profiles/toggle/', views.ProfileToggleView.as_view(), name='profile_toggle'),
+    path('monitoring/profiles/<uuid:pk>/download/', views.ProfileDownloadView.as_view(), name='profile_download'),
+
+    # Celery task & queue (staff)
+    path('monitoring/tasks/', views.TaskMonitorView.as_view(), name='tasks'),
+
+    # Slow query log (staff)
+    path('monitoring/slow-queries/', views.SlowQueryReportView.as_view(), name='slow_queries'),
+
+    # Aksi massal admin (staff)
+    path('monitoring/admin-jobs/', views.AdminJobListView.as_view(), name='admin_jobs'),
+    path('monitoring/admin-jobs/<uuid:pk>/', views.AdminJobDetailView.as_view(), name='admin_job_detail'),
+    path('monitoring/admin-jobs/<uuid:pk>/download/', views.AdminJobDownloadView.as_view(), name='admin_job_download'),
+]
\ No newline at end of file
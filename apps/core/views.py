@@ -0,0 +1,267 @@
+"""
+Views monitoring (metrics, dll).
+"""
+import hmac
+import os
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.paginator import Paginator
+from django.db.models import Avg, Count, F, Max, Q, Sum
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views import View
+from django.views.decorators.http import require_GET
+
+from apps.accounts.permissions import StaffRequiredMixin
+
+from . import admin_jobs
+from .benchmark import percentile
+from .metrics import prometheus_client, render_latest
+from .middleware import PROFILE_COOKIE, PROFILE_COOKIE_MAX_AGE, PROFILE_COOKIE_SALT
+from .models import AdminJob, QueueDepthSample, RequestProfile, SlowQuery, TaskRun
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Endpoint scrape Prometheus.
+    Di luar DEBUG wajib header "Authorization: Bearer <METRICS_TOKEN>".
+    """
+    if prometheus_client is None:
+        raise Http404
+
+    if not settings.DEBUG:
+        token = settings.METRICS_TOKEN
+        if not token:
+            raise Http404
+
+        auth = request.META.get('HTTP_AUTHORIZATION', '')
+        if not hmac.compare_digest(auth, f'Bearer {token}'):
+            return HttpResponseForbidden()
+
+    body, content_type = render_latest()
+    return HttpResponse(body, content_type=content_type)
+
+
+# ============================================
+# PROFILING
+# ============================================
+
+class ProfileListView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """Daftar request/command yang sudah di-profile"""
+
+    def get(self, request):
+        profiles = RequestProfile.objects.select_related('user')
+
+        trigger = request.GET.get('trigger')
+        if trigger in RequestProfile.Trigger.values:
+            profiles = profiles.filter(trigger=trigger)
+
+        page = Paginator(profiles, 25).get_page(request.GET.get('page'))
+
+        return render(request, 'core/profiles.html', {
+            'page_obj': page,
+            'profiles': page.object_list,
+            'triggers': RequestProfile.Trigger.choices,
+            'current_trigger': trigger,
+            'profiling_mode': request.get_signed_cookie(
+                PROFILE_COOKIE, default=None, salt=PROFILE_COOKIE_SALT, max_age=PROFILE_COOKIE_MAX_AGE
+            ),
+        })
+
+
+class ProfileDownloadView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """Download file pstats / speedscope"""
+
+    def get(self, request, pk):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        return FileResponse(profile.file.open('rb'), as_attachment=True, filename=profile.download_name)
+
+
+class ProfileToggleView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """Aktif/nonaktifkan profiling semua request staff ini (cookie 1 jam)"""
+
+    def post(self, request):
+        mode = request.POST.get('mode')
+        next_url = request.POST.get('next')
+        if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+            next_url = 'core:profile_list'
+
+        response = redirect(next_url)
+        if mode in RequestProfile.Profiler.values:
+            response.set_signed_cookie(
+                PROFILE_COOKIE, mode, salt=PROFILE_COOKIE_SALT,
+                max_age=PROFILE_COOKIE_MAX_AGE, httponly=True, samesite='Lax',
+                secure=request.is_secure(),
+            )
+        else:
+            response.delete_cookie(PROFILE_COOKIE)
+        return response
+
+
+# ============================================
+# SLOW QUERIES
+# ============================================
+
+class SlowQueryReportView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """Query lambat diagregasi per fingerprint SQL"""
+
+    SORTS = {
+        'total': '-total_ms',
+        'max': '-max_ms',
+        'mean': '-mean',
+        'calls': '-calls',
+        'recent': '-last_seen',
+    }
+
+    def get(self, request):
+        sort = request.GET.get('sort')
+        if sort not in self.SORTS:
+            sort = 'total'
+
+        queries = SlowQuery.objects.annotate(
+            mean=F('total_ms') / F('calls')
+        ).order_by(self.SORTS[sort])
+
+        page = Paginator(queries, 25).get_page(request.GET.get('page'))
+
+        return render(request, 'core/slow_queries.html', {
+            'page_obj': page,
+            'queries': page.object_list,
+            'sort': sort,
+            'sorts': self.SORTS,
+            'threshold_ms': settings.SLOW_QUERY_THRESHOLD_MS,
+            'explain_rate': settings.SLOW_QUERY_EXPLAIN_RATE,
+        })
+
+
+# ============================================
+# CELERY TASKS
+# ============================================
+
+class TaskMonitorView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """Ringkasan task Celery & kedalaman queue dalam jendela waktu terakhir"""
+
+    WINDOWS = (15, 60, 360, 1440)
+
+    def get(self, request):
+        try:
+            minutes = int(request.GET.get('minutes', 60))
+        except ValueError:
+            minutes = 60
+        if minutes not in self.WINDOWS:
+            minutes = 60
+
+        since = timezone.now() - timedelta(minutes=minutes)
+        runs = TaskRun.objects.filter(finished_at__gte=since)
+
+        summary = list(
+            runs.values('task_name').annotate(
+                total=Count('id'),
+                success=Count('id', filter=Q(state=TaskRun.State.SUCCESS)),
+                failure=Count('id', filter=Q(state=TaskRun.State.FAILURE)),
+                retry=Count('id', filter=Q(state=TaskRun.State.RETRY)),
+                avg_lag=Avg('lag_ms'),
+                max_lag=Max('lag_ms'),
+                avg_runtime=Avg('runtime_ms'),
+                max_runtime=Max('runtime_ms'),
+                busy_ms=Sum('runtime_ms'),
+            ).order_by('-busy_ms')
+        )
+
+        # p95 dihitung di Python (portable antar database)
+        lags, runtimes = defaultdict(list), defaultdict(list)
+        for name, lag, runtime in runs.values_list('task_name', 'lag_ms', 'runtime_ms'):
+            runtimes[name].append(runtime)
+            if lag is not None:
+                lags[name].append(lag)
+
+        window_ms = minutes * 60 * 1000
+        for row in summary:
+            name = row['task_name']
+            row['p95_runtime'] = percentile(runtimes[name], 95)
+            row['p95_lag'] = percentile(lags[name], 95)
+            row['per_minute'] = row['total'] / minutes
+            # Rata-rata worker sibuk = kebutuhan concurrency minimal
+            row['concurrency'] = row['busy_ms'] / window_ms
+
+        queues = []
+        samples = QueueDepthSample.objects.filter(sampled_at__gte=since)
+        for queue in samples.values_list('queue', flat=True).distinct().order_by('queue'):
+            queue_samples = samples.filter(queue=queue)
+            latest = queue_samples.order_by('-sampled_at').first()
+            queues.append({
+                'name': queue,
+                'latest': latest,
+                'max_depth': queue_samples.aggregate(m=Max('depth'))['m'],
+            })
+
+        failures = runs.filter(
+            state__in=[TaskRun.State.FAILURE, TaskRun.State.RETRY]
+        ).exclude(error='')[:20]
+
+        return render(request, 'core/tasks.html', {
+            'summary': summary,
+            'queues': queues,
+            'failures': failures,
+            'minutes': minutes,
+            'windows': self.WINDOWS,
+        })
+
+
+# ============================================
+# ADMIN JOBS
+# ============================================
+
+class AdminJobListView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """Aksi massal admin yang dijalankan di background"""
+
+    def get(self, request):
+        jobs = AdminJob.objects.select_related('created_by').defer('selected_ids', 'changelist_params', 'errors')
+        page = Paginator(jobs, 25).get_page(request.GET.get('page'))
+
+        return render(request, 'core/admin_jobs.html', {
+            'page_obj': page,
+            'jobs': page.object_list,
+        })
+
+
+class AdminJobDetailView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """Progress & hasil satu job (?format=json untuk polling)"""
+
+    def get(self, request, pk):
+        job = get_object_or_404(AdminJob.objects.select_related('created_by').defer('selected_ids'), pk=pk)
+
+        if request.GET.get('format') == 'json':
+            return JsonResponse({
+                'status': job.status,
+                'total': job.total,
+                'processed': job.processed,
+                'succeeded': job.succeeded,
+                'failed': job.failed,
+                'progress': job.progress_percent,
+                'finished': job.is_finished,
+            })
+
+        handler_class = admin_jobs.REGISTRY.get(job.action)
+        return render(request, 'core/admin_job_detail.html', {
+            'job': job,
+            'label': handler_class.label if handler_class else job.action,
+        })
+
+
+class AdminJobDownloadView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """Download file hasil job (mis. export)"""
+
+    def get(self, request, pk):
+        job = get_object_or_404(AdminJob.objects.defer('selected_ids', 'errors'), pk=pk)
+        if not job.result_file:
+            raise Http404
+        return FileResponse(
+            job.result_file.open('rb'), as_attachment=True, filename=os.path.basename(job.result_file.name)
+        )
@@ -6,6 +6,9 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.admin_jobs import admin_action
+
+from . import admin_jobs  # noqa: F401 (daftarkan handler aksi massal)
 from .models import Payment, PaymentLog
 
 
@@ -45,6 +48,8 @@ class PaymentAdmin(admin.ModelAdmin):
         'paid_at',
     ]
     
+    list_select_related = ['registration', 'user']
+    
     search_fields = [
         'gateway_order_id',
         'gateway_transaction_id',
@@ -112,6 +117,12 @@ class PaymentAdmin(admin.ModelAdmin):
     
     inlines = [PaymentLogInline]
     
+    # Aksi massal dijalankan di Celery per chunk (apps.core.admin_jobs)
+    actions = [
+        admin_action('payments.expire'),
+        admin_action('payments.resend_instructions'),
+    ]
+    
     def status_badge(self, obj):
         """Display status dengan warna"""
         colors = {
@@ -131,14 +142,18 @@ class PaymentAdmin(admin.ModelAdmin):
     
     def registration_link(self, obj):
         """Link ke registration"""
-        url = reverse('admin:registration_studentregistration_change', args=[obj.registration.id])
-        return format_html('<a href="{}">{}</a>', url, obj.registration.registration_number)
+        url = reverse('admin:registration_studentregistration_change', args=[obj.registration_id])
+        return format_html('<a href="{}">{}</a>', url, obj.registration.registration_number or '-')
     registration_link.short_description = 'Registration'
+    registration_link.admin_order_field = 'registration__registration_number'
     
     def user_email(self, obj):
-        """Display user email"""
-        return obj.user.email
+        """Display user email (pendaftaran publik tanpa akun: email kontak)"""
+        if obj.user is not None:
+            return obj.user.email
+        return obj.registration.contact_email or '-'
     user_email.short_description = 'User'
+    user_email.admin_order_field = 'user__email'
     
     def gateway_response_display(self, obj):
         """Display gateway response sebagai JSON formatted"""
@@ -168,6 +183,8 @@ class PaymentLogAdmin(admin.ModelAdmin):
         'ip_address',
     ]
     
+    list_select_related = ['payment']
+    
     list_filter = [
         'event_type',
         'signature_valid',
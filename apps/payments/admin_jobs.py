@@ -0,0 +1,44 @@
+"""
+Aksi massal admin Payment (background, lihat apps.core.admin_jobs).
+"""
+from apps.core import admin_jobs
+from apps.registration.models import RegistrationEvent
+
+from .models import Payment
+from .services import PaymentService
+
+
+@admin_jobs.register
+class ExpirePaymentsJob(admin_jobs.AdminJobHandler):
+    """PENDING -> EXPIRED per chunk (set-based), registration kembali ke DRAFT"""
+
+    key = 'payments.expire'
+    label = 'Expire payment PENDING (background)'
+    model = Payment
+
+    def process(self, job, ids):
+        payments = Payment.objects.filter(pk__in=ids)
+        skipped = list(
+            payments.exclude(status=Payment.PaymentStatus.PENDING).values_list('pk', 'gateway_order_id', 'status')
+        )
+        expired, _ = PaymentService.expire_payments(
+            payments, actor=job.created_by, source=RegistrationEvent.Source.BULK
+        )
+        return expired, [
+            (pk, order_id, f'Status {Payment.PaymentStatus(status).label}, bukan PENDING')
+            for pk, order_id, status in skipped
+        ]
+
+
+@admin_jobs.register
+class ResendPaymentInstructionsJob(admin_jobs.AdminJobHandler):
+    """Kirim ulang email instruksi pembayaran (satu koneksi email per chunk)"""
+
+    key = 'payments.resend_instructions'
+    label = 'Kirim ulang instruksi pembayaran (background)'
+    model = Payment
+
+    def process(self, job, ids):
+        payments = Payment.objects.filter(pk__in=ids).select_related('registration')
+        sent, failures = PaymentService.send_instructions(payments)
+        return sent, [(payment.pk, payment.gateway_order_id, reason) for payment, reason in failures]
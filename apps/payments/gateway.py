@@ -7,15 +7,16 @@ CRITICAL SECURITY NOTES:
 2. Semua request harus dari backend
 3. Signature verification WAJIB di webhook
 """
-import midtransclient
 from django.conf import settings
 from typing import Dict, Any
 import logging
-import requests
 import base64
 import hashlib
-from django.conf import settings
-import logging
+
+# midtransclient & requests di-import saat dipakai (lazy): keduanya ~80 ms
+# import time, tidak perlu dibayar saat boot worker / management command.
+
+from apps.core.metrics import track_midtrans
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,8 @@ class MidtransClient:
     def get_snap_client(cls):
         """Get atau create Snap API client (untuk VA transactions)"""
         if cls._snap_client is None:
+            import midtransclient
+
             cls._snap_client = midtransclient.Snap(
                 is_production=settings.MIDTRANS_CONFIG['IS_PRODUCTION'],
                 server_key=settings.MIDTRANS_CONFIG['SERVER_KEY'],
@@ -44,6 +47,8 @@ class MidtransClient:
     def get_core_client(cls):
         """Get atau create Core API client (untuk status check)"""
         if cls._core_client is None:
+            import midtransclient
+
             cls._core_client = midtransclient.CoreApi(
                 is_production=settings.MIDTRANS_CONFIG['IS_PRODUCTION'],
                 server_key=settings.MIDTRANS_CONFIG['SERVER_KEY'],
@@ -136,7 +141,8 @@ class MidtransClient:
         """
         try:
             core = cls.get_core_client()
-            response = core.transactions.status(order_id)
+            with track_midtrans('status'):
+                response = core.transactions.status(order_id)
             
             logger.info(
                 f"Midtrans status checked: {order_id}",
@@ -224,6 +230,8 @@ class MidtransClient:
             dict: Response dari Midtrans dengan VA number
         """
         
+        import requests
+
         url = f"{settings.MIDTRANS_API_URL}/charge"
         
         payload = {
@@ -240,15 +248,16 @@ class MidtransClient:
         }
         
         try:
-            response = requests.post(
-                url, 
-                json=payload, 
-                headers=MidtransClient._get_headers(),
-                timeout=30
-            )
-            
-            response.raise_for_status()
-            data = response.json()
+            with track_midtrans('charge'):
+                response = requests.post(
+                    url, 
+                    json=payload, 
+                    headers=MidtransClient._get_headers(),
+                    timeout=30
+                )
+                
+                response.raise_for_status()
+                data = response.json()
             
             logger.info(f"Midtrans VA created: {order_id}")
             return data
@@ -2,13 +2,14 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from apps.payments.models import Payment
-from apps.registration.models import StudentRegistration
+from apps.payments.services import PaymentService
+from apps.core.profiling import ProfiledCommandMixin
 import logging
 
 logger = logging.getLogger('apps.payments')
 
 
-class Command(BaseCommand):
+class Command(ProfiledCommandMixin, BaseCommand):
     help = 'Expire pending payments that are past their expiry date'
     
     def add_arguments(self, parser):
@@ -48,19 +49,7 @@ class Command(BaseCommand):
                 self.stdout.write(f'  ... and {count - 10} more')
         
         else:
-            # Update status to EXPIRED
-            updated = expired_payments.update(
-                status=Payment.PaymentStatus.EXPIRED
-            )
-            
-            # OPTIONAL: Update registration status juga
-            registration_ids = expired_payments.values_list('registration_id', flat=True)
-            StudentRegistration.objects.filter(
-                id__in=registration_ids,
-                status=StudentRegistration.RegistrationStatus.SUBMITTED
-            ).update(
-                status=StudentRegistration.RegistrationStatus.DRAFT  # Atau buat status EXPIRED baru
-            )
+            updated, reverted = PaymentService.expire_payments(expired_payments)
             
             self.stdout.write(
                 self.style.SUCCESS(
@@ -68,4 +57,8 @@ class Command(BaseCommand):
                 )
             )
             
-            logger.info(f'Expired {updated} payments via management command')
\ No newline at end of file
+            logger.info(
+                f'Expired {updated} payments via management command '
+                f'({reverted.count if reverted else 0} registrations back to DRAFT, '
+                f'batch {reverted.batch_id if reverted else "-"})'
+            )
\ No newline at end of file
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:12
+
+from django.conf import settings
+from django.db import connection, migrations, models
+
+# PostgreSQL (production): CREATE INDEX CONCURRENTLY, tabel tetap bisa ditulis
+# selama index dibangun. Backend lain (SQLite dev) tidak mendukung CONCURRENTLY.
+if connection.vendor == 'postgresql':
+    from django.contrib.postgres.operations import AddIndexConcurrently as AddIndex
+else:
+    AddIndex = migrations.AddIndex
+
+
+class Migration(migrations.Migration):
+
+    # CONCURRENTLY tidak boleh di dalam transaksi
+    atomic = False
+
+    dependencies = [
+        ('payments', '0002_alter_payment_user'),
+        ('registration', '0012_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'expires_at'], name='payments_status_b79f19_idx'),
+        ),
+    ]
@@ -133,6 +133,7 @@ class Payment(models.Model):
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['gateway_order_id']),
             models.Index(fields=['va_number']),
+            models.Index(fields=['status', 'expires_at']),  # expire_payments
         ]
         ordering = ['-created_at']
     
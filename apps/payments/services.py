@@ -1,14 +1,17 @@
 
-from django.db import transaction
+from django.db import connection, transaction
 from django.utils import timezone
 from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
 from decimal import Decimal
 from typing import Dict, Any, Optional
 import logging
 
 from .models import Payment, PaymentLog
 from .gateway import MidtransClient
-from apps.registration.models import StudentRegistration
+from apps.registration.models import RegistrationEvent, StudentRegistration
+from apps.registration.transitions import bulk_transition, record_transition
 
 logger = logging.getLogger('apps.payments')
 
@@ -28,7 +31,7 @@ class PaymentService:
         if hasattr(registration, 'payment'):
             existing_payment = registration.payment
             if existing_payment.status in [Payment.PaymentStatus.PENDING, Payment.PaymentStatus.PAID]:
-                logger.info(f"Returning existing payment: {existing_payment.gateway_order_id}")
+                logger.debug("Returning existing payment: %s", existing_payment.gateway_order_id)
                 return existing_payment
         
         if registration.status != StudentRegistration.RegistrationStatus.SUBMITTED:
@@ -77,11 +80,11 @@ class PaymentService:
             if va_numbers:
                 payment.va_number = va_numbers[0].get('va_number', '')
             
-            logger.info(f"Payment created with Midtrans: {order_id}")
+            logger.debug("Midtrans VA received for %s", order_id)
             
         except Exception as e:
             # FALLBACK: Create dummy VA for TESTING
-            logger.warning(f"Midtrans failed, using dummy VA: {str(e)}")
+            logger.warning("Midtrans failed for %s, using dummy VA: %s", order_id, e)
             
             import random
             payment.va_number = f"8808{random.randint(100000000000, 999999999999)}"
@@ -94,7 +97,7 @@ class PaymentService:
         # Save payment (no expiry set)
         payment.save()
         
-        logger.info(f"Payment created (no expiry): {order_id} (VA: {payment.va_number})")
+        logger.info("Payment created: %s (VA: %s)", order_id, payment.va_number)
         return payment
     
     @staticmethod
@@ -240,8 +243,15 @@ class PaymentService:
         # Update registration status jika payment PAID
         if new_status == Payment.PaymentStatus.PAID:
             registration = payment.registration
+            previous_status = registration.status
             registration.status = StudentRegistration.RegistrationStatus.PAID
             registration.save()
+            record_transition(
+                registration,
+                from_status=previous_status,
+                notes=f'Midtrans {transaction_status} ({order_id})',
+                source=RegistrationEvent.Source.PAYMENT,
+            )
             
             logger.info(
                 f"Registration updated to PAID: {registration.registration_number}",
@@ -250,6 +260,97 @@ class PaymentService:
         
         return payment
     
+    @staticmethod
+    @transaction.atomic
+    def expire_payments(payments, actor=None, source=RegistrationEvent.Source.SYSTEM):
+        """
+        Set-based: payment PENDING di queryset `payments` -> EXPIRED (satu UPDATE
+        + satu bulk_create PaymentLog), registration SUBMITTED -> DRAFT lewat
+        bulk_transition. Return (jumlah payment di-expire, TransitionResult).
+        """
+        pending = payments.filter(status=Payment.PaymentStatus.PENDING)
+        if connection.features.has_select_for_update_skip_locked:
+            # Kunci baris yang akan di-expire; payment yang sedang diproses webhook dilewati
+            pending = pending.select_for_update(skip_locked=True)
+        rows = list(pending.order_by('pk').values_list('pk', 'registration_id'))
+        if not rows:
+            return 0, None
+        
+        now = timezone.now()
+        expired = Payment.objects.filter(
+            pk__in=[pk for pk, _ in rows], status=Payment.PaymentStatus.PENDING
+        ).update(status=Payment.PaymentStatus.EXPIRED, updated_at=now)
+        
+        if expired != len(rows):
+            # Tanpa row lock (SQLite) payment bisa berubah di antara SELECT & UPDATE;
+            # updated_at unik per batch menandai baris yang benar-benar di-expire,
+            # supaya PaymentLog & transisi hanya untuk baris itu.
+            rows = list(
+                Payment.objects.filter(
+                    pk__in=[pk for pk, _ in rows], status=Payment.PaymentStatus.EXPIRED, updated_at=now
+                ).values_list('pk', 'registration_id')
+            )
+        
+        payment_ids = [pk for pk, _ in rows]
+        registration_ids = [registration_id for _, registration_id in rows]
+        
+        PaymentLog.objects.bulk_create([
+            PaymentLog(
+                payment_id=pk,
+                event_type=PaymentLog.EventType.STATUS_CHANGED,
+                old_status=Payment.PaymentStatus.PENDING,
+                new_status=Payment.PaymentStatus.EXPIRED,
+            )
+            for pk in payment_ids
+        ])
+        
+        # OPTIONAL: Update registration status juga (tercatat di RegistrationEvent).
+        # Payment PENDING selalu milik registration SUBMITTED, jadi bulk_transition
+        # sekaligus menandai read model (payment_status) semua baris ini.
+        reverted = bulk_transition(
+            registration_ids,
+            from_status=StudentRegistration.RegistrationStatus.SUBMITTED,
+            to_status=StudentRegistration.RegistrationStatus.DRAFT,  # Atau buat status EXPIRED baru
+            actor=actor,
+            notes='Pembayaran kadaluarsa',
+            source=source,
+        )
+        
+        return expired, reverted
+    
+    @staticmethod
+    def send_instructions(payments):
+        """
+        Kirim ulang email instruksi pembayaran (VA & nominal) untuk payment PENDING.
+        Satu koneksi email untuk seluruh `payments` (iterable Payment dengan
+        select_related('registration')). Return (jumlah terkirim, [(payment, alasan gagal)]).
+        """
+        messages = []
+        failures = []
+        for payment in payments:
+            registration = payment.registration
+            email = (registration.contact_email or '').strip()
+            if payment.status != Payment.PaymentStatus.PENDING:
+                failures.append((payment, f'Status {payment.get_status_display()}, bukan PENDING'))
+                continue
+            if not email or email == '-':
+                failures.append((payment, 'Email kontak kosong'))
+                continue
+            
+            body = render_to_string('payments/email/instructions.txt', {
+                'payment': payment,
+                'registration': registration,
+                'merchant_name': settings.PAYMENT_MERCHANT_NAME,
+            })
+            messages.append(EmailMessage(
+                subject=f'Instruksi Pembayaran PPDB {registration.registration_number}',
+                body=body,
+                to=[email],
+            ))
+        
+        sent = get_connection().send_messages(messages) if messages else 0
+        return sent or 0, failures
+    
     @staticmethod
     def _map_midtrans_status(
         transaction_status: str,
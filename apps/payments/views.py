@@ -11,13 +11,17 @@ from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
 
 from apps.accounts.permissions import staff_required
+from apps.core.decorators import query_budget
+from apps.core.metrics import WEBHOOK_DURATION
 from .models import Payment
 from .services import PaymentService
-from apps.registration.models import StudentRegistration
+from apps.registration.models import RegistrationEvent, StudentRegistration
+from apps.registration.transitions import record_transition
 from django.utils import timezone
 
 import logging
 import json
+import time
 
 logger = logging.getLogger('apps.payments')
 
@@ -45,18 +49,18 @@ class CreatePaymentView(View):
                 f'Silakan simpan nomor ini untuk cek status.'
             )
             
-            logger.info(f"Payment created: {payment.gateway_order_id} for {registration.registration_number}")
+            logger.debug("Payment created: %s for %s", payment.gateway_order_id, registration.registration_number)
             
             # Redirect ke instructions
             return redirect('payments:instructions', pk=payment.id)
             
         except ValueError as e:
-            logger.warning(f"ValueError: {str(e)}")
+            logger.warning("Payment creation rejected for %s: %s", registration_id, e)
             messages.error(request, str(e))
             return redirect('registration:check_status')
             
         except Exception as e:
-            logger.error(f"Payment creation failed", exc_info=True)
+            logger.error("Payment creation failed for %s", registration_id, exc_info=True)
             messages.error(request, f'Gagal membuat pembayaran: {str(e)}')
             return redirect('registration:check_status')
         
@@ -65,7 +69,7 @@ class CreatePaymentView(View):
         
         registration = get_object_or_404(StudentRegistration, pk=registration_id)
         
-        logger.info(f"Payment confirm - RegNum: {registration.registration_number}, Status: {registration.status}")
+        logger.debug("Payment confirm: %s (status %s)", registration.registration_number, registration.status)
         
         # Verify status
         if registration.status != StudentRegistration.RegistrationStatus.SUBMITTED:
@@ -79,7 +83,7 @@ class CreatePaymentView(View):
         try:
             existing_payment = registration.payment
             if existing_payment.status == Payment.PaymentStatus.PENDING:
-                logger.info(f"Payment exists, redirect to instructions")
+                logger.debug("Payment exists, redirect to instructions: %s", existing_payment.gateway_order_id)
                 return redirect('payments:instructions', pk=existing_payment.id)
             elif existing_payment.status == Payment.PaymentStatus.PAID:
                 messages.success(request, 'Pembayaran sudah lunas.')
@@ -112,18 +116,18 @@ class CreatePaymentView(View):
                 f'Nomor Pendaftaran: {registration.registration_number}. Silakan lanjutkan pembayaran.'
             )
             
-            logger.info(f"Payment created: {payment.gateway_order_id}")
+            logger.debug("Payment created: %s", payment.gateway_order_id)
             
             # Redirect ke instructions
             return redirect('payments:instructions', pk=payment.id)
             
         except ValueError as e:
-            logger.warning(f"ValueError: {str(e)}")
+            logger.warning("Payment creation rejected for %s: %s", registration_id, e)
             messages.error(request, str(e))
             return redirect('registration:check_status')
             
         except Exception as e:
-            logger.error(f"Payment creation failed", exc_info=True)
+            logger.error("Payment creation failed for %s", registration_id, exc_info=True)
             messages.error(request, f'Gagal membuat pembayaran: {str(e)}')
             return redirect('registration:check_status')
 
@@ -158,9 +162,13 @@ class PaymentStatusView(View):
 
 @csrf_exempt
 @require_POST
+@query_budget(10)
 def midtrans_webhook(request):
     """Webhook dari Midtrans"""
     
+    start = time.perf_counter()
+    result = 'error'
+    
     try:
         notification = json.loads(request.body)
         
@@ -176,13 +184,18 @@ def midtrans_webhook(request):
         )
         
         if payment:
+            result = 'success'
             return JsonResponse({'status': 'success'}, status=200)
         else:
+            result = 'payment_not_found'
             return JsonResponse({'status': 'payment_not_found'}, status=200)
             
     except Exception as e:
-        logger.error(f"Webhook processing error", exc_info=True)
+        logger.error("Webhook processing error", exc_info=True)
         return JsonResponse({'status': 'error', 'message': str(e)}, status=200)
+    
+    finally:
+        WEBHOOK_DURATION.labels(result).observe(time.perf_counter() - start)
 
 
 @login_required
@@ -208,8 +221,16 @@ def simulate_payment(request, pk):
                 
                 # Update registration status
                 registration = payment.registration
+                previous_status = registration.status
                 registration.status = StudentRegistration.RegistrationStatus.PAID
                 registration.save()
+                record_transition(
+                    registration,
+                    from_status=previous_status,
+                    actor=request.user,
+                    notes='Simulasi pembayaran',
+                    source=RegistrationEvent.Source.PAYMENT,
+                )
                 
                 # Log
                 from .models import PaymentLog
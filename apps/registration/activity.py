@@ -0,0 +1,110 @@
+"""
+Feed aktivitas terbaru untuk dashboard staff.
+
+Tabel kecil activity_feed berisi kurang lebih ACTIVITY_FEED_SIZE baris per
+kind (ring buffer): baris baru ditambahkan dari signal registrations_transitioned
+(nomor, nama & program ikut payload, tanpa query ulang), baris lebih lama dari
+N terbaru dihapus task beat trim_activity_feed. Dashboard & endpoint polling
+hanya membaca index (kind, -id) tabel ini, tidak pernah scan student_registrations.
+
+Satu transisi cukup satu INSERT; transisi massal 1000 baris cukup menulis
+N baris (sisanya langsung terdorong keluar buffer).
+"""
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ActivityEntry, RegistrationReadModel, StudentRegistration
+
+logger = logging.getLogger('apps.registration')
+
+Status = StudentRegistration.RegistrationStatus
+
+# Status tujuan yang masuk feed
+FEED_KINDS = (Status.PAID, Status.VERIFIED)
+
+# Entry maksimal yang dikirim endpoint polling sekali jalan
+POLL_LIMIT = 20
+
+
+def append(registrations, kind, actor=None, at=None):
+    """
+    Tambahkan transisi ke feed `kind`.
+    registrations: payload signal, [(id, registration_number, full_name, program_choice)]
+    """
+    if kind not in FEED_KINDS or not registrations:
+        return []
+
+    at = at or timezone.now()
+    return ActivityEntry.objects.bulk_create([
+        ActivityEntry(
+            kind=kind,
+            registration_id=pk,
+            registration_number=number or '',
+            full_name=full_name,
+            program_choice=program_choice,
+            actor=actor,
+            created_at=at,
+        )
+        for pk, number, full_name, program_choice in list(registrations)[:settings.ACTIVITY_FEED_SIZE]
+    ])
+
+
+def trim():
+    """Hapus baris di luar ACTIVITY_FEED_SIZE terbaru per kind; return jumlah baris dihapus"""
+    size = settings.ACTIVITY_FEED_SIZE
+    deleted = 0
+    for kind in FEED_KINDS:
+        oldest_kept = ActivityEntry.objects.filter(kind=kind).order_by('-id').values_list('id', flat=True)[size - 1:size].first()
+        if oldest_kept is not None:
+            deleted += ActivityEntry.objects.filter(kind=kind, id__lt=oldest_kept).delete()[0]
+    return deleted
+
+
+def recent(kind, limit):
+    """Entry terbaru `kind` (baru dulu)"""
+    return ActivityEntry.objects.filter(kind=kind).order_by('-id')[:limit]
+
+
+def since(after, limit=POLL_LIMIT):
+    """Entry semua kind dengan id > after (lama dulu), untuk polling dashboard"""
+    entries = ActivityEntry.objects.filter(kind__in=FEED_KINDS, id__gt=after).order_by('-id')[:limit]
+    return list(reversed(entries))
+
+
+def latest_id():
+    entry = ActivityEntry.objects.order_by('-id').values_list('id', flat=True).first()
+    return entry or 0
+
+
+def seed():
+    """
+    Isi feed yang masih kosong (sekali setelah deploy, command seed_activity_feed):
+    N terbaru per kind dari read model (index status + submitted_at / verified_at).
+    Return jumlah baris yang ditambahkan.
+    """
+    added = 0
+    order = {Status.PAID: '-submitted_at', Status.VERIFIED: '-verified_at'}
+    for kind in FEED_KINDS:
+        if ActivityEntry.objects.filter(kind=kind).exists():
+            continue
+        rows = list(
+            RegistrationReadModel.objects.filter(status=kind).order_by(order[kind]).values_list(
+                'registration_id', 'registration_number', 'full_name', 'program_choice',
+                'submitted_at', 'verified_at',
+            )[:settings.ACTIVITY_FEED_SIZE]
+        )
+        # Terlama disisipkan dulu supaya id naik sesuai waktu
+        added += len(ActivityEntry.objects.bulk_create([
+            ActivityEntry(
+                kind=kind,
+                registration_id=pk,
+                registration_number=number,
+                full_name=full_name,
+                program_choice=program_choice,
+                created_at=(verified_at if kind == Status.VERIFIED else submitted_at) or timezone.now(),
+            )
+            for pk, number, full_name, program_choice, submitted_at, verified_at in reversed(rows)
+        ]))
+    return added
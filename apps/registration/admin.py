@@ -2,11 +2,17 @@
 Django Admin configuration untuk Registration.
 """
 from django.contrib import admin
+from django.db.models import OuterRef, Subquery
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
-from .models import StudentRegistration, Document
+from apps.core.admin_jobs import admin_action
+from apps.payments.models import Payment
+
+from . import admin_jobs  # noqa: F401 (daftarkan handler aksi massal)
+from .models import RegistrationEvent, SavedFilter, StudentRegistration, Document
+from .transitions import record_transition
 
 
 class DocumentInline(admin.TabularInline):
@@ -20,6 +26,24 @@ class DocumentInline(admin.TabularInline):
         return False
 
 
+class RegistrationEventInline(admin.TabularInline):
+    """Riwayat status (append-only, read-only)"""
+    model = RegistrationEvent
+    extra = 0
+    fields = ['created_at', 'from_status', 'to_status', 'source', 'actor', 'notes', 'batch_id']
+    readonly_fields = fields
+    ordering = ['created_at']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('actor')
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(StudentRegistration)
 class StudentRegistrationAdmin(admin.ModelAdmin):
     """Admin untuk Student Registration"""
@@ -48,7 +72,8 @@ class StudentRegistrationAdmin(admin.ModelAdmin):
         'full_name',
         'nisn',
         'user__email',
-        'parent_name',
+        'father_name',
+        'mother_name',
         'parent_phone',
     ]
     
@@ -98,7 +123,10 @@ class StudentRegistrationAdmin(admin.ModelAdmin):
         }),
         (_('Parent/Guardian'), {
             'fields': (
-                'parent_name',
+                'father_name',
+                'father_occupation',
+                'mother_name',
+                'mother_occupation',
                 'parent_phone',
             )
         }),
@@ -118,7 +146,34 @@ class StudentRegistrationAdmin(admin.ModelAdmin):
         }),
     )
     
-    inlines = [DocumentInline]
+    inlines = [DocumentInline, RegistrationEventInline]
+    
+    # Aksi massal dijalankan di Celery per chunk (apps.core.admin_jobs)
+    actions = [
+        admin_action('registration.export'),
+        admin_action('registration.resend_instructions'),
+    ]
+    
+    def save_model(self, request, obj, form, change):
+        """Perubahan status lewat admin dicatat seperti jalur transisi lain (event, signal)"""
+        from_status = form.initial.get('status', '') if change else ''
+        super().save_model(request, obj, form, change)
+        if obj.status != from_status:
+            record_transition(
+                obj,
+                from_status=from_status,
+                actor=request.user,
+                notes='Diubah lewat Django admin',
+                source=RegistrationEvent.Source.ADMIN,
+            )
+    
+    def get_queryset(self, request):
+        """Status payment di-annotate (satu query untuk seluruh halaman, bukan per baris)"""
+        return super().get_queryset(request).annotate(
+            payment_status_value=Subquery(
+                Payment.objects.filter(registration=OuterRef('pk')).values('status')[:1]
+            )
+        )
     
     def status_badge(self, obj):
         """Display status dengan warna"""
@@ -139,23 +194,23 @@ class StudentRegistrationAdmin(admin.ModelAdmin):
     
     def payment_status(self, obj):
         """Display payment status"""
-        if hasattr(obj, 'payment'):
-            payment = obj.payment
-            if payment.status == 'PAID':
-                return format_html(
-                    '<span style="color: green;">✓ Lunas</span>'
-                )
-            elif payment.status == 'PENDING':
-                return format_html(
-                    '<span style="color: orange;">⏳ Pending</span>'
-                )
-            else:
-                return format_html(
-                    '<span style="color: red;">✗ {}</span>',
-                    payment.get_status_display()
-                )
-        return format_html('<span style="color: gray;">-</span>')
+        status = obj.payment_status_value
+        if status is None:
+            return format_html('<span style="color: gray;">-</span>')
+        if status == Payment.PaymentStatus.PAID:
+            return format_html(
+                '<span style="color: green;">✓ Lunas</span>'
+            )
+        elif status == Payment.PaymentStatus.PENDING:
+            return format_html(
+                '<span style="color: orange;">⏳ Pending</span>'
+            )
+        return format_html(
+            '<span style="color: red;">✗ {}</span>',
+            Payment.PaymentStatus(status).label
+        )
     payment_status.short_description = 'Payment'
+    payment_status.admin_order_field = 'payment_status_value'
 
 
 @admin.register(Document)
@@ -177,6 +232,8 @@ class DocumentAdmin(admin.ModelAdmin):
         'uploaded_at',
     ]
     
+    list_select_related = ['registration']
+    
     search_fields = [
         'registration__registration_number',
         'registration__full_name',
@@ -206,9 +263,10 @@ class DocumentAdmin(admin.ModelAdmin):
     
     def registration_link(self, obj):
         """Link ke registration"""
-        url = reverse('admin:registration_studentregistration_change', args=[obj.registration.id])
-        return format_html('<a href="{}">{}</a>', url, obj.registration.registration_number)
+        url = reverse('admin:registration_studentregistration_change', args=[obj.registration_id])
+        return format_html('<a href="{}">{}</a>', url, obj.registration.registration_number or '-')
     registration_link.short_description = 'Registration'
+    registration_link.admin_order_field = 'registration__registration_number'
     
     def file_size_display(self, obj):
         """Display file size dalam KB/MB"""
@@ -219,4 +277,14 @@ class DocumentAdmin(admin.ModelAdmin):
             return f"{size / 1024:.1f} KB"
         else:
             return f"{size / (1024 * 1024):.1f} MB"
-    file_size_display.short_description = 'File Size'
\ No newline at end of file
+    file_size_display.short_description = 'File Size'
+
+@admin.register(SavedFilter)
+class SavedFilterAdmin(admin.ModelAdmin):
+    """Admin untuk filter tersimpan staff"""
+    
+    list_display = ['name', 'owner', 'is_shared', 'is_materialized', 'refreshed_at', 'result_count', 'refresh_ms']
+    list_filter = ['is_shared', 'is_materialized']
+    list_select_related = ['owner']
+    search_fields = ['name', 'owner__email']
+    readonly_fields = ['refreshed_at', 'refresh_ms', 'result_count', 'created_at', 'updated_at']
@@ -0,0 +1,85 @@
+"""
+Aksi massal admin StudentRegistration (background, lihat apps.core.admin_jobs).
+"""
+import tempfile
+
+from django.core.files import File
+from django.utils import timezone
+
+from apps.core import admin_jobs
+from apps.payments.models import Payment
+from apps.payments.services import PaymentService
+
+from .exports import REGISTRATION_EXPORT_HEADERS, registration_export_row
+from .models import StudentRegistration
+
+
+@admin_jobs.register
+class ExportRegistrationsJob(admin_jobs.AdminJobHandler):
+    """
+    Export Excel (kolom sama dengan export staff). Workbook write-only:
+    baris langsung ditulis ke file sementara, bukan ditahan di memory.
+    """
+
+    key = 'registration.export'
+    label = 'Export ke Excel (background)'
+    model = StudentRegistration
+    permission = 'view'
+
+    def start(self, job):
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill
+
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Pendaftaran PPDB")
+
+        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF")
+        header = []
+        for title in REGISTRATION_EXPORT_HEADERS:
+            cell = WriteOnlyCell(self.sheet, value=title)
+            cell.fill = header_fill
+            cell.font = header_font
+            header.append(cell)
+        self.sheet.append(header)
+        self.row_number = 0
+
+    def process(self, job, ids):
+        for reg in StudentRegistration.objects.filter(pk__in=ids).order_by('pk'):
+            self.row_number += 1
+            self.sheet.append(registration_export_row(self.row_number, reg))
+        return len(ids), []
+
+    def finish(self, job):
+        filename = f"Pendaftaran_PPDB_{timezone.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        with tempfile.TemporaryFile() as output:
+            self.workbook.save(output)
+            output.seek(0)
+            job.result_file.save(filename, File(output), save=False)
+
+
+@admin_jobs.register
+class ResendPaymentInstructionsJob(admin_jobs.AdminJobHandler):
+    """Kirim ulang email instruksi pembayaran untuk pendaftaran terpilih"""
+
+    key = 'registration.resend_instructions'
+    label = 'Kirim ulang instruksi pembayaran (background)'
+    model = StudentRegistration
+
+    def process(self, job, ids):
+        payments = list(Payment.objects.filter(registration_id__in=ids).select_related('registration'))
+        with_payment = {payment.registration_id for payment in payments}
+        sent, failures = PaymentService.send_instructions(payments)
+
+        errors = [
+            (payment.registration_id, payment.registration.registration_number, reason)
+            for payment, reason in failures
+        ]
+        errors.extend(
+            (pk, number, 'Belum ada pembayaran')
+            for pk, number in StudentRegistration.objects.filter(
+                pk__in=[pk for pk in ids if pk not in with_payment]
+            ).values_list('pk', 'registration_number')
+        )
+        return sent, errors
@@ -5,4 +5,7 @@ from django.apps import AppConfig
 class RegistrationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.registration'
-    verbose_name = 'Pendaftaran Siswa'
\ No newline at end of file
+    verbose_name = 'Pendaftaran Siswa'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
@@ -12,7 +12,7 @@ def registration_settings(request):
     return {
         'REGISTRATION_FEE': settings.REGISTRATION_FEE,
         'PAYMENT_MERCHANT_NAME': settings.PAYMENT_MERCHANT_NAME,
-        'PAYMENT_EXPIRY_HOURS': settings.PAYMENT_EXPIRY_HOURS,
+        'PAYMENT_EXPIRY_HOURS': getattr(settings, 'PAYMENT_EXPIRY_HOURS', None),
     }
     
 
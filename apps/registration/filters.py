@@ -0,0 +1,105 @@
+"""
+Filter daftar pendaftaran untuk halaman staff.
+Dipakai bersama oleh list view, export, dan download dokumen
+supaya hasilnya selalu sama dengan yang dilihat staff di list.
+
+Pencarian, dokumen & pembayaran dibaca dari RegistrationReadModel (satu
+join 1:1 ber-primary key, lihat read_model.py), bukan EXISTS ke documents /
+payments atau OR enam kolom icontains:
+- search -> search_text (identitas ternormalisasi, nomor HP digit saja)
+- documents=complete|incomplete, missing=KTP|KK|AKTA -> has_* / documents_complete
+- payment=<status Payment>|NONE -> payment_status ('' = belum ada Payment)
+- submitted_days=N (submit lebih dari N hari lalu) -> index (status, submitted_at)
+
+Contoh "SUBMITTED belum bayar > 3 hari":
+    ?status=SUBMITTED&payment=PENDING&submitted_days=3
+"""
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.payments.models import Payment
+
+from .read_model import REQUIRED_DOCUMENTS, search_terms
+
+# Nilai filter payment untuk pendaftaran yang belum punya Payment
+NO_PAYMENT = 'NONE'
+
+# Batas atas ?submitted_days= (10 tahun, lebih tua dari data PPDB mana pun)
+MAX_SUBMITTED_DAYS = 3650
+
+# ?sort= -> order_by (doc_count / payment_status butuh annotate_registrations)
+SORT_OPTIONS = {
+    'newest': ('-created_at', '-pk'),
+    'oldest': ('created_at', 'pk'),
+    'submitted': ('submitted_at', 'pk'),
+    '-submitted': ('-submitted_at', '-pk'),
+    'docs': ('doc_count', '-created_at'),
+    '-docs': ('-doc_count', '-created_at'),
+    'payment': ('payment_status', '-created_at'),
+    'name': ('full_name', 'pk'),
+}
+DEFAULT_SORT = 'newest'
+
+
+def filter_registrations(queryset, params):
+    """
+    Terapkan filter dari query string (status, program, search, dokumen, pembayaran).
+
+    Args:
+        queryset: QuerySet StudentRegistration
+        params: request.GET (atau dict dengan key yang sama)
+    """
+    status = params.get('status')
+    if status:
+        queryset = queryset.filter(status=status)
+
+    program = params.get('program')
+    if program:
+        queryset = queryset.filter(program_choice=program)
+
+    search = params.get('search')
+    if search and search.strip():
+        matches = Q()
+        for term in search_terms(search):
+            matches |= Q(read_model__search_text__contains=term)
+        queryset = queryset.filter(matches)
+
+    documents = params.get('documents')
+    if documents in ('complete', 'incomplete'):
+        queryset = queryset.filter(read_model__documents_complete=(documents == 'complete'))
+
+    missing = params.get('missing')
+    if missing in REQUIRED_DOCUMENTS:
+        queryset = queryset.filter(**{f'read_model__has_{missing.lower()}': False})
+
+    payment = params.get('payment')
+    if payment == NO_PAYMENT:
+        queryset = queryset.filter(read_model__payment_status='')
+    elif payment in Payment.PaymentStatus.values:
+        queryset = queryset.filter(read_model__payment_status=payment)
+
+    submitted_days = params.get('submitted_days')
+    if submitted_days and str(submitted_days).isdigit():
+        # Dibatasi: timedelta raksasa (?submitted_days=1000000) -> OverflowError
+        days = min(int(submitted_days), MAX_SUBMITTED_DAYS)
+        queryset = queryset.filter(submitted_at__lt=timezone.now() - timedelta(days=days))
+
+    return queryset
+
+
+def annotate_registrations(queryset):
+    """
+    Tambah doc_count & payment_status per baris dari read model
+    (tanpa subquery ke documents / payments, tanpa prefetch dokumen).
+    """
+    return queryset.annotate(
+        doc_count=F('read_model__doc_count'),
+        payment_status=F('read_model__payment_status'),
+    )
+
+
+def sort_registrations(queryset, params):
+    """Urutkan sesuai ?sort= (whitelist SORT_OPTIONS)"""
+    return queryset.order_by(*SORT_OPTIONS.get(params.get('sort'), SORT_OPTIONS[DEFAULT_SORT]))
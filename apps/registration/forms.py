@@ -258,6 +258,8 @@ class DocumentUploadForm(forms.ModelForm):
     
     def __init__(self, *args, **kwargs):
         self.registration = kwargs.pop('registration', None)
+        # Error dari ValidatingUploadHandler (file ditolak saat transfer)
+        self.upload_error = kwargs.pop('upload_error', None)
         super().__init__(*args, **kwargs)
         
         # Filter document_type yang sudah di-upload
@@ -292,6 +294,17 @@ class DocumentUploadForm(forms.ModelForm):
         
         return file
     
+    def clean(self):
+        cleaned_data = super().clean()
+        
+        # File ditolak saat transfer sehingga tidak ada di request.FILES;
+        # ganti error "wajib diisi" dengan alasan sebenarnya.
+        if self.upload_error:
+            self.errors.pop('file', None)
+            self.add_error('file', self.upload_error)
+        
+        return cleaned_data
+    
     def save(self, commit=True):
         instance = super().save(commit=False)
         
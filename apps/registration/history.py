@@ -0,0 +1,120 @@
+"""
+Riwayat status pendaftaran dari tabel RegistrationEvent (append-only).
+
+- timeline(): satu query ber-index (registration, created_at) untuk halaman
+  detail staf / cek status pendaftar
+- time_in_status(): lama tiap status, dihitung di SQL dengan window function
+  LEAD() (event berikutnya = akhir status), bukan loop Python per registration
+"""
+from django.db import connection
+from django.utils import timezone
+
+from .models import RegistrationEvent, StudentRegistration
+
+TIME_IN_STATUS_SQL = """
+WITH spans AS (
+    SELECT
+        {to_status} AS status,
+        {created_at} AS entered_at,
+        LEAD({created_at}) OVER (
+            PARTITION BY {registration} ORDER BY {created_at}
+        ) AS left_at
+    FROM {table}
+    {where}
+)
+SELECT
+    status,
+    COUNT(left_at) AS completed,
+    AVG(CASE WHEN left_at IS NOT NULL THEN {seconds} END) AS avg_seconds,
+    MAX(CASE WHEN left_at IS NOT NULL THEN {seconds} END) AS max_seconds,
+    {median} AS median_seconds,
+    COUNT(*) - COUNT(left_at) AS current,
+    AVG(CASE WHEN left_at IS NULL THEN {age} END) AS current_avg_seconds
+FROM spans
+GROUP BY status
+"""
+
+
+def timeline_queryset(include_internal=True):
+    """
+    Event status urut waktu (untuk Prefetch di halaman detail staf).
+    include_internal=False untuk halaman pendaftar (tanpa staf & catatan internal).
+    """
+    events = RegistrationEvent.objects.order_by('created_at')
+    if include_internal:
+        return events.select_related('actor').only(
+            'registration_id', 'from_status', 'to_status', 'source', 'notes', 'created_at',
+            'actor__full_name', 'actor__email'
+        )
+    return events.only('registration_id', 'from_status', 'to_status', 'created_at')
+
+
+def timeline(registration, include_internal=True):
+    """Event status satu registration, urut waktu"""
+    return timeline_queryset(include_internal).filter(registration=registration)
+
+
+def seconds_between(end, start):
+    """Ekspresi SQL selisih dua timestamp dalam detik"""
+    if connection.vendor == 'postgresql':
+        return f'EXTRACT(EPOCH FROM ({end} - {start}))'
+    return f'(julianday({end}) - julianday({start})) * 86400'
+
+
+def time_in_status(since=None):
+    """
+    Per status: jumlah span selesai, rata-rata/median/maks durasi (detik),
+    jumlah registration yang saat ini di status tsb & rata-rata umurnya.
+    since: hanya event sejak tanggal ini (span pertama terpotong di sini).
+    Median hanya di PostgreSQL (percentile_cont).
+    """
+    opts = RegistrationEvent._meta
+    quote = connection.ops.quote_name
+    created_at = quote(opts.get_field('created_at').column)
+    now = timezone.now()
+
+    seconds = seconds_between('left_at', 'entered_at')
+    if connection.vendor == 'postgresql':
+        median = 'PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY CASE WHEN left_at IS NOT NULL THEN {} END)'.format(seconds)
+    else:
+        median = 'NULL'
+
+    sql = TIME_IN_STATUS_SQL.format(
+        to_status=quote(opts.get_field('to_status').column),
+        created_at=created_at,
+        registration=quote(opts.get_field('registration').column),
+        table=quote(opts.db_table),
+        where=f'WHERE {created_at} >= %s' if since else '',
+        seconds=seconds,
+        median=median,
+        age=seconds_between('%s', 'entered_at'),
+    )
+    # Urutan parameter mengikuti urutan placeholder di SQL
+    params = ([since] if since else []) + [now]
+    params = [connection.ops.adapt_datetimefield_value(value) for value in params]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    labels = dict(StudentRegistration.RegistrationStatus.choices)
+    order = list(labels)
+    report = [
+        {
+            'status': status,
+            'label': labels.get(status, status),
+            'completed': completed,
+            'avg_seconds': _float(avg),
+            'max_seconds': _float(maximum),
+            'median_seconds': _float(median_value),
+            'current': current,
+            'current_avg_seconds': _float(current_avg),
+        }
+        for status, completed, avg, maximum, median_value, current, current_avg in rows
+    ]
+    report.sort(key=lambda row: order.index(row['status']) if row['status'] in order else len(order))
+    return report
+
+
+def _float(value):
+    return float(value) if value is not None else None
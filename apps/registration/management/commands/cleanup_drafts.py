@@ -3,12 +3,13 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
 from apps.registration.models import StudentRegistration
+from apps.core.profiling import ProfiledCommandMixin
 import logging
 
 logger = logging.getLogger('apps.registration')
 
 
-class Command(BaseCommand):
+class Command(ProfiledCommandMixin, BaseCommand):
     help = 'Delete draft registrations older than 3 days'
     
     def add_arguments(self, parser):
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from apps.registration import read_model
+from apps.registration.models import StudentRegistration
+from apps.core.profiling import ProfiledCommandMixin
+import logging
+import time
+
+logger = logging.getLogger('apps.registration')
+
+
+class Command(ProfiledCommandMixin, BaseCommand):
+    help = 'Rebuild registration_read_model rows from registrations, payments, documents and events'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=read_model.SYNC_BATCH_SIZE,
+            help=f'Registrations per upsert (default: {read_model.SYNC_BATCH_SIZE})'
+        )
+
+        parser.add_argument(
+            '--missing-only',
+            action='store_true',
+            help='Only create rows for registrations without a read model row'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if options['missing_only']:
+            ids = list(read_model.missing_ids())
+        else:
+            ids = list(StudentRegistration.objects.order_by('pk').values_list('pk', flat=True))
+
+        start = time.perf_counter()
+        synced = 0
+        for offset in range(0, len(ids), batch_size):
+            synced += read_model.sync(ids[offset:offset + batch_size])
+            self.stdout.write(f'  {synced}/{len(ids)}')
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Synced {synced} read model rows in {elapsed:.1f}s'
+            )
+        )
+
+        logger.info(f'Read model rebuilt: {synced} rows in {elapsed:.1f}s')
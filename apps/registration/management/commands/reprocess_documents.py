@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from apps.registration.models import Document
+from apps.registration.processing import DocumentProcessingService
+from apps.core.profiling import ProfiledCommandMixin
+import logging
+
+logger = logging.getLogger('apps.registration')
+
+
+class Command(ProfiledCommandMixin, BaseCommand):
+    help = 'Re-queue post-upload processing for pending, stuck (processing) or failed documents'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--status',
+            action='append',
+            choices=Document.ProcessingStatus.values,
+            help='Processing status to re-queue (default: PENDING, PROCESSING and FAILED)'
+        )
+        
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Process in this process instead of sending to Celery'
+        )
+    
+    def handle(self, *args, **options):
+        statuses = options['status'] or [
+            Document.ProcessingStatus.PENDING,
+            Document.ProcessingStatus.PROCESSING,
+            Document.ProcessingStatus.FAILED,
+        ]
+        
+        documents = Document.objects.filter(processing_status__in=statuses)
+        count = 0
+        
+        for document in documents.iterator():
+            if options['sync']:
+                DocumentProcessingService.process(document)
+            else:
+                DocumentProcessingService.enqueue(document)
+            count += 1
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Queued {count} documents for processing')
+        )
+        logger.info('Reprocess: queued %s documents (%s)', count, ', '.join(statuses))
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.registration.models import Document
+from apps.registration.phash import BKTree, to_unsigned
+from apps.core.profiling import ProfiledCommandMixin
+import logging
+
+logger = logging.getLogger('apps.registration')
+
+
+class Command(ProfiledCommandMixin, BaseCommand):
+    help = 'Scan documents of an academic year for near-duplicate uploads across registrations'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--academic-year',
+            required=True,
+            help='Academic year to scan, e.g. 2025/2026'
+        )
+        
+        parser.add_argument(
+            '--max-distance',
+            type=int,
+            default=settings.DOCUMENT_PHASH_MAX_DISTANCE,
+            help='Maximum Hamming distance (of 64 bits) to report'
+        )
+        
+        parser.add_argument(
+            '--document-type',
+            choices=Document.DocumentType.values,
+            help='Only scan one document type'
+        )
+    
+    def handle(self, *args, **options):
+        academic_year = options['academic_year']
+        max_distance = options['max_distance']
+        
+        documents = Document.objects.filter(
+            registration__academic_year=academic_year,
+            phash__isnull=False,
+        )
+        if options['document_type']:
+            documents = documents.filter(document_type=options['document_type'])
+        
+        rows = documents.values_list(
+            'id', 'phash', 'document_type',
+            'registration_id', 'registration__registration_number',
+        )
+        
+        # BK-tree dibangun sambil scan: tiap dokumen hanya dibandingkan
+        # dengan dokumen sebelumnya, jadi tiap pasangan dilaporkan sekali.
+        tree = BKTree()
+        scanned = 0
+        pairs = 0
+        
+        for doc_id, phash, doc_type, registration_id, registration_number in rows.iterator():
+            value = to_unsigned(phash)
+            item = (doc_id, doc_type, registration_id, registration_number)
+            
+            for distance, other in tree.search(value, max_distance):
+                if other[2] == registration_id:
+                    continue
+                pairs += 1
+                self.stdout.write(
+                    f'  [{distance:2d}] {registration_number or registration_id} {doc_type} '
+                    f'~ {other[3] or other[2]} {other[1]}'
+                )
+            
+            tree.add(value, item)
+            scanned += 1
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Scanned {scanned} documents ({academic_year}), found {pairs} similar pairs'
+            )
+        )
+        logger.info('Duplicate scan %s: %s documents, %s pairs', academic_year, scanned, pairs)
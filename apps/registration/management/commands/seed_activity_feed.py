@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from apps.registration import activity
+import logging
+
+logger = logging.getLogger('apps.registration')
+
+
+class Command(BaseCommand):
+    help = 'Fill empty dashboard activity feeds with the latest PAID / VERIFIED registrations'
+
+    def handle(self, *args, **options):
+        added = activity.seed()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Added {added} activity entries'
+            )
+        )
+
+        logger.info(f'Activity feed seeded: {added} entries')
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0008_alter_studentregistration_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='SHA-256 Konten'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='page_count',
+            field=models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Jumlah Halaman'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Waktu Diproses'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='processing_error',
+            field=models.TextField(blank=True, verbose_name='Error Proses'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='processing_status',
+            field=models.CharField(choices=[('PENDING', 'Menunggu Diproses'), ('PROCESSING', 'Sedang Diproses'), ('READY', 'Siap'), ('FAILED', 'Gagal Diproses')], db_index=True, default='PENDING', max_length=20, verbose_name='Status Proses'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0009_document_content_hash_document_page_count_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='preview_path',
+            field=models.CharField(blank=True, max_length=255, verbose_name='Preview'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0010_document_preview_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='phash',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Perceptual Hash'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='phash_band_0',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='phash_band_1',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='phash_band_2',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='phash_band_3',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+    ]
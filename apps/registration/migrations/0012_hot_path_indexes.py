@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:12
+
+from django.conf import settings
+from django.db import connection, migrations, models
+
+# PostgreSQL (production): CREATE INDEX CONCURRENTLY, tabel tetap bisa ditulis
+# selama index dibangun. Backend lain (SQLite dev) tidak mendukung CONCURRENTLY.
+if connection.vendor == 'postgresql':
+    from django.contrib.postgres.operations import AddIndexConcurrently as AddIndex
+else:
+    AddIndex = migrations.AddIndex
+
+
+class Migration(migrations.Migration):
+
+    # CONCURRENTLY tidak boleh di dalam transaksi
+    atomic = False
+
+    dependencies = [
+        ('registration', '0011_document_phash_document_phash_band_0_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndex(
+            model_name='studentregistration',
+            index=models.Index(fields=['parent_phone'], name='student_reg_parent__d0b6ff_idx'),
+        ),
+        AddIndex(
+            model_name='studentregistration',
+            index=models.Index(fields=['created_at'], name='student_reg_created_938f0e_idx'),
+        ),
+        AddIndex(
+            model_name='studentregistration',
+            index=models.Index(fields=['status', 'created_at'], name='student_reg_status_bbb1fc_idx'),
+        ),
+    ]
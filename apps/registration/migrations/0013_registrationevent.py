@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:14
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0012_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('from_status', models.CharField(blank=True, choices=[('DRAFT', 'Draft - Belum Submit'), ('SUBMITTED', 'Submitted - Menunggu Pembayaran'), ('PAYMENT_EXPIRED', 'Payment Expired - Daftar Ulang'), ('PAID', 'Paid - Menunggu Verifikasi'), ('VERIFIED', 'Verified - Diterima'), ('REJECTED', 'Rejected - Tidak Lolos Verifikasi')], max_length=20)),
+                ('to_status', models.CharField(choices=[('DRAFT', 'Draft - Belum Submit'), ('SUBMITTED', 'Submitted - Menunggu Pembayaran'), ('PAYMENT_EXPIRED', 'Payment Expired - Daftar Ulang'), ('PAID', 'Paid - Menunggu Verifikasi'), ('VERIFIED', 'Verified - Diterima'), ('REJECTED', 'Rejected - Tidak Lolos Verifikasi')], max_length=20)),
+                ('source', models.CharField(choices=[('SINGLE', 'Verifikasi Satuan'), ('BULK', 'Verifikasi Massal'), ('APPLICANT', 'Pendaftar'), ('PAYMENT', 'Pembayaran'), ('SYSTEM', 'Sistem')], max_length=10)),
+                ('notes', models.TextField(blank=True, verbose_name='Catatan')),
+                ('batch_id', models.UUIDField(blank=True, db_index=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('registration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='registration.studentregistration')),
+            ],
+            options={
+                'verbose_name': 'Riwayat Status',
+                'verbose_name_plural': 'Riwayat Status',
+                'db_table': 'registration_events',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['registration', 'created_at'], name='registratio_registr_f2b0fa_idx')],
+            },
+        ),
+    ]
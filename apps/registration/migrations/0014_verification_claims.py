@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import connection, migrations, models
+
+# PostgreSQL (production): CREATE INDEX CONCURRENTLY, tabel tetap bisa ditulis
+# selama index dibangun. Backend lain (SQLite dev) tidak mendukung CONCURRENTLY.
+if connection.vendor == 'postgresql':
+    from django.contrib.postgres.operations import AddIndexConcurrently as AddIndex
+else:
+    AddIndex = migrations.AddIndex
+
+
+class Migration(migrations.Migration):
+
+    # CONCURRENTLY tidak boleh di dalam transaksi; kedua AddField di bawah
+    # nullable (tanpa rewrite tabel) sehingga aman di-commit sendiri-sendiri
+    atomic = False
+
+    dependencies = [
+        ('registration', '0013_registrationevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentregistration',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Waktu Klaim'),
+        ),
+        migrations.AddField(
+            model_name='studentregistration',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_registrations', to=settings.AUTH_USER_MODEL),
+        ),
+        AddIndex(
+            model_name='studentregistration',
+            index=models.Index(fields=['status', 'submitted_at'], name='student_reg_status_868763_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:23
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0014_verification_claims'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedFilter',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, verbose_name='Nama')),
+                ('params', models.JSONField(default=dict, verbose_name='Parameter Filter')),
+                ('is_shared', models.BooleanField(default=False, verbose_name='Dibagikan ke Semua Staf')),
+                ('is_materialized', models.BooleanField(default=False, verbose_name='Snapshot Berkala')),
+                ('refresh_minutes', models.PositiveIntegerField(default=15, verbose_name='Interval Refresh (menit)')),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True, verbose_name='Terakhir Di-refresh')),
+                ('refresh_ms', models.FloatField(blank=True, null=True)),
+                ('result_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_filters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Filter Tersimpan',
+                'verbose_name_plural': 'Filter Tersimpan',
+                'db_table': 'saved_filters',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedFilterResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('registration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_filter_results', to='registration.studentregistration')),
+                ('saved_filter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='registration.savedfilter')),
+            ],
+            options={
+                'db_table': 'saved_filter_results',
+                'indexes': [models.Index(fields=['saved_filter', 'position'], name='saved_filte_saved_f_4a20a9_idx')],
+                'unique_together': {('saved_filter', 'registration')},
+            },
+        ),
+    ]
@@ -0,0 +1,148 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:27
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Max
+
+# Salinan dari read_model.py saat migrasi ini dibuat (jangan import kode app:
+# perubahan read_model.py nanti tidak boleh mengubah hasil backfill ini)
+REQUIRED_DOCUMENTS = ['KTP', 'KK', 'AKTA']
+
+BACKFILL_BATCH_SIZE = 1000
+
+NON_DIGIT = re.compile(r'\D')
+
+
+def normalize_phone(value):
+    digits = NON_DIGIT.sub('', value or '')
+    if digits.startswith('62'):
+        digits = '0' + digits[2:]
+    return digits
+
+
+def backfill_read_model(apps, schema_editor):
+    """
+    Isi read model untuk registration yang sudah ada (model historis & helper
+    lokal, bukan read_model.sync, supaya migrasi tetap jalan walau kode berubah).
+    """
+    StudentRegistration = apps.get_model('registration', 'StudentRegistration')
+    RegistrationReadModel = apps.get_model('registration', 'RegistrationReadModel')
+    Document = apps.get_model('registration', 'Document')
+    RegistrationEvent = apps.get_model('registration', 'RegistrationEvent')
+    Payment = apps.get_model('payments', 'Payment')
+
+    ids = list(StudentRegistration.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(ids), BACKFILL_BATCH_SIZE):
+        batch = ids[start:start + BACKFILL_BATCH_SIZE]
+        payments = {
+            payment['registration_id']: payment
+            for payment in Payment.objects.filter(registration_id__in=batch).values(
+                'registration_id', 'status', 'va_number', 'paid_at'
+            )
+        }
+        documents = {}
+        for registration_id, document_type in Document.objects.filter(
+            registration_id__in=batch
+        ).values_list('registration_id', 'document_type'):
+            documents.setdefault(registration_id, []).append(document_type)
+        last_events = dict(
+            RegistrationEvent.objects.filter(registration_id__in=batch).order_by().values(
+                'registration_id'
+            ).annotate(last=Max('created_at')).values_list('registration_id', 'last')
+        )
+
+        rows = []
+        for registration in StudentRegistration.objects.filter(pk__in=batch):
+            payment = payments.get(registration.pk, {})
+            types = documents.get(registration.pk, [])
+            flags = {document_type: document_type in types for document_type in REQUIRED_DOCUMENTS}
+            email = (registration.contact_email or '').strip().lower()
+            phone = normalize_phone(registration.contact_phone)
+            parent_phone = normalize_phone(registration.parent_phone)
+            rows.append(RegistrationReadModel(
+                registration_id=registration.pk,
+                registration_number=registration.registration_number or '',
+                full_name=registration.full_name,
+                status=registration.status,
+                program_choice=registration.program_choice,
+                academic_year=registration.academic_year,
+                city=registration.city or '',
+                nik=registration.nik or '',
+                nisn=registration.nisn or '',
+                email=email,
+                phone=phone,
+                parent_phone=parent_phone,
+                search_text=' '.join(filter(None, [
+                    (registration.registration_number or '').lower(),
+                    registration.full_name.lower(),
+                    registration.nik,
+                    registration.nisn,
+                    email,
+                    phone,
+                    parent_phone,
+                ])),
+                payment_status=payment.get('status') or '',
+                va_number=payment.get('va_number') or '',
+                paid_at=payment.get('paid_at'),
+                doc_count=len(types),
+                has_ktp=flags['KTP'],
+                has_kk=flags['KK'],
+                has_akta=flags['AKTA'],
+                documents_complete=all(flags.values()),
+                created_at=registration.created_at,
+                submitted_at=registration.submitted_at,
+                verified_at=registration.verified_at,
+                last_event_at=last_events.get(registration.pk),
+            ))
+        RegistrationReadModel.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0015_saved_filters'),
+        ('payments', '0003_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationReadModel',
+            fields=[
+                ('registration', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='read_model', serialize=False, to='registration.studentregistration')),
+                ('registration_number', models.CharField(blank=True, max_length=20)),
+                ('full_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft - Belum Submit'), ('SUBMITTED', 'Submitted - Menunggu Pembayaran'), ('PAYMENT_EXPIRED', 'Payment Expired - Daftar Ulang'), ('PAID', 'Paid - Menunggu Verifikasi'), ('VERIFIED', 'Verified - Diterima'), ('REJECTED', 'Rejected - Tidak Lolos Verifikasi')], max_length=20)),
+                ('program_choice', models.CharField(choices=[('PAKET_A', 'Paket A (Setara SD)'), ('PAKET_B', 'Paket B (Setara SMP)'), ('PAKET_C', 'Paket C (Setara SMA)')], max_length=20)),
+                ('academic_year', models.CharField(max_length=9)),
+                ('city', models.CharField(blank=True, max_length=100)),
+                ('nik', models.CharField(blank=True, max_length=16)),
+                ('nisn', models.CharField(blank=True, max_length=10)),
+                ('email', models.CharField(blank=True, max_length=255)),
+                ('phone', models.CharField(blank=True, max_length=20)),
+                ('parent_phone', models.CharField(blank=True, max_length=20)),
+                ('search_text', models.TextField(blank=True)),
+                ('payment_status', models.CharField(blank=True, max_length=20)),
+                ('va_number', models.CharField(blank=True, max_length=50)),
+                ('paid_at', models.DateTimeField(blank=True, null=True)),
+                ('doc_count', models.PositiveSmallIntegerField(default=0)),
+                ('has_ktp', models.BooleanField(default=False)),
+                ('has_kk', models.BooleanField(default=False)),
+                ('has_akta', models.BooleanField(default=False)),
+                ('documents_complete', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('verified_at', models.DateTimeField(blank=True, null=True)),
+                ('last_event_at', models.DateTimeField(blank=True, null=True)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Read Model Pendaftaran',
+                'verbose_name_plural': 'Read Model Pendaftaran',
+                'db_table': 'registration_read_model',
+                'indexes': [models.Index(fields=['status', 'submitted_at'], name='registratio_status_cd9b67_idx'), models.Index(fields=['status', 'verified_at'], name='registratio_status_5846d8_idx'), models.Index(fields=['payment_status'], name='registratio_payment_d0951c_idx'), models.Index(fields=['documents_complete'], name='registratio_documen_56f8c6_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_read_model, migrations.RunPython.noop),
+    ]
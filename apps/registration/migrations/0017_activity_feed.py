@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0016_registration_read_model'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('DRAFT', 'Draft - Belum Submit'), ('SUBMITTED', 'Submitted - Menunggu Pembayaran'), ('PAYMENT_EXPIRED', 'Payment Expired - Daftar Ulang'), ('PAID', 'Paid - Menunggu Verifikasi'), ('VERIFIED', 'Verified - Diterima'), ('REJECTED', 'Rejected - Tidak Lolos Verifikasi')], max_length=20)),
+                ('registration_number', models.CharField(blank=True, max_length=20)),
+                ('full_name', models.CharField(max_length=255)),
+                ('program_choice', models.CharField(choices=[('PAKET_A', 'Paket A (Setara SD)'), ('PAKET_B', 'Paket B (Setara SMP)'), ('PAKET_C', 'Paket C (Setara SMA)')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('registration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_entries', to='registration.studentregistration')),
+            ],
+            options={
+                'verbose_name': 'Aktivitas',
+                'verbose_name_plural': 'Aktivitas',
+                'db_table': 'activity_feed',
+                'indexes': [models.Index(fields=['kind', '-id'], name='activity_fe_kind_23706d_idx')],
+            },
+        ),
+    ]
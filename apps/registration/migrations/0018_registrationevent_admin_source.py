@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0017_activity_feed'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='registrationevent',
+            name='source',
+            field=models.CharField(choices=[('SINGLE', 'Verifikasi Satuan'), ('BULK', 'Verifikasi Massal'), ('APPLICANT', 'Pendaftar'), ('PAYMENT', 'Pembayaran'), ('SYSTEM', 'Sistem'), ('ADMIN', 'Django Admin')], max_length=10),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:04
+
+from django.db import migrations, models
+
+
+def seed_sequences(apps, schema_editor):
+    """Nomor terakhir per tahun dari nomor yang sudah ada (urut numerik, sekali jalan)"""
+    StudentRegistration = apps.get_model('registration', 'StudentRegistration')
+    RegistrationNumberSequence = apps.get_model('registration', 'RegistrationNumberSequence')
+
+    last = {}
+    numbers = StudentRegistration.objects.filter(
+        registration_number__startswith='PPDB-'
+    ).values_list('registration_number', flat=True)
+    for number in numbers.iterator(chunk_size=2000):
+        parts = number.split('-')
+        if len(parts) != 3 or not parts[1].isdigit() or not parts[2].isdigit():
+            continue
+        year, sequence = int(parts[1]), int(parts[2])
+        last[year] = max(last.get(year, 0), sequence)
+
+    RegistrationNumberSequence.objects.bulk_create([
+        RegistrationNumberSequence(year=year, last_number=number)
+        for year, number in last.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0018_registrationevent_admin_source'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationNumberSequence',
+            fields=[
+                ('year', models.PositiveSmallIntegerField(primary_key=True, serialize=False)),
+                ('last_number', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Urutan Nomor Pendaftaran',
+                'verbose_name_plural': 'Urutan Nomor Pendaftaran',
+                'db_table': 'registration_number_sequences',
+            },
+        ),
+        migrations.RunPython(seed_sequences, migrations.RunPython.noop),
+    ]
@@ -4,10 +4,15 @@ Siswa tidak perlu akun, pendaftaran langsung public.
 """
 from django.db import models
 from django.conf import settings
+from django.core.files.storage import default_storage
 from django.core.validators import RegexValidator
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from datetime import timedelta
 import uuid
 
+from .phash import split_bands, to_signed
+
 
 class StudentRegistration(models.Model):
     """
@@ -184,6 +189,16 @@ class StudentRegistration(models.Model):
     # Notes dari panitia
     verification_notes = models.TextField(_('Catatan Verifikasi'), blank=True)
     
+    # Antrian verifikasi: staf yang sedang memeriksa (berlaku VERIFICATION_CLAIM_MINUTES)
+    claimed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='claimed_registrations'
+    )
+    claimed_at = models.DateTimeField(_('Waktu Klaim'), null=True, blank=True)
+    
     class Meta:
         db_table = 'student_registrations'
         verbose_name = _('Pendaftaran Siswa')
@@ -194,11 +209,29 @@ class StudentRegistration(models.Model):
             models.Index(fields=['nisn']),
             models.Index(fields=['contact_email']),
             models.Index(fields=['contact_phone']),
+            models.Index(fields=['parent_phone']),  # Cek status
+            models.Index(fields=['created_at']),  # Ordering default
+            models.Index(fields=['status', 'created_at']),  # Cleanup draft, list per status
+            models.Index(fields=['status', 'submitted_at']),  # Antrian verifikasi (PAID terlama)
         ]
         ordering = ['-created_at']
     
     def __str__(self):
         return f"{self.registration_number} - {self.full_name}"
+    
+    @property
+    def claim_expires_at(self):
+        if self.claimed_at is None:
+            return None
+        return self.claimed_at + timedelta(minutes=settings.VERIFICATION_CLAIM_MINUTES)
+    
+    def is_claimed_by_other(self, user):
+        """Klaim aktif (belum kadaluarsa) milik staf lain"""
+        return (
+            self.claimed_by_id is not None
+            and self.claimed_by_id != user.pk
+            and self.claim_expires_at > timezone.now()
+        )
 
 class Document(models.Model):
     """
@@ -211,6 +244,12 @@ class Document(models.Model):
         KK = 'KK', _('Kartu Keluarga')
         AKTA = 'AKTA', _('Akta Kelahiran')
     
+    class ProcessingStatus(models.TextChoices):
+        PENDING = 'PENDING', _('Menunggu Diproses')
+        PROCESSING = 'PROCESSING', _('Sedang Diproses')
+        READY = 'READY', _('Siap')
+        FAILED = 'FAILED', _('Gagal Diproses')
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     registration = models.ForeignKey(
         StudentRegistration,
@@ -242,6 +281,35 @@ class Document(models.Model):
     )
     verification_notes = models.TextField(_('Catatan Verifikasi'), blank=True)
     
+    # Post-upload processing (dijalankan di background, lihat processing.py)
+    processing_status = models.CharField(
+        _('Status Proses'),
+        max_length=20,
+        choices=ProcessingStatus.choices,
+        default=ProcessingStatus.PENDING,
+        db_index=True
+    )
+    processing_error = models.TextField(_('Error Proses'), blank=True)
+    content_hash = models.CharField(
+        _('SHA-256 Konten'),
+        max_length=64,
+        blank=True,
+        db_index=True
+    )
+    page_count = models.PositiveSmallIntegerField(_('Jumlah Halaman'), null=True, blank=True)
+    # Path di storage, BUKAN FileField: file preview di-share antar dokumen
+    # dengan hash sama, jadi jangan ikut dihapus django_cleanup.
+    preview_path = models.CharField(_('Preview'), max_length=255, blank=True)
+    
+    # Perceptual hash (dHash 64-bit, signed) + 4 band 16-bit untuk
+    # multi-index lookup near-duplicate (lihat phash.py)
+    phash = models.BigIntegerField(_('Perceptual Hash'), null=True, blank=True)
+    phash_band_0 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    phash_band_1 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    phash_band_2 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    phash_band_3 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    processed_at = models.DateTimeField(_('Waktu Diproses'), null=True, blank=True)
+    
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -254,4 +322,258 @@ class Document(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.get_document_type_display()} - {self.registration.full_name}"
\ No newline at end of file
+        return f"{self.get_document_type_display()} - {self.registration.full_name}"
+    
+    @property
+    def preview_url(self):
+        if not self.preview_path:
+            return ''
+        return default_storage.url(self.preview_path)
+    
+    def set_phash(self, value):
+        """Set perceptual hash (uint64) beserta band index-nya"""
+        self.phash = to_signed(value)
+        for i, band in enumerate(split_bands(value)):
+            setattr(self, f'phash_band_{i}', band)
+
+
+class RegistrationEvent(models.Model):
+    """
+    Audit trail perubahan status pendaftaran (satu baris per registration per transisi).
+    Transisi massal berbagi batch_id yang sama.
+    """
+    
+    class Source(models.TextChoices):
+        SINGLE = 'SINGLE', _('Verifikasi Satuan')
+        BULK = 'BULK', _('Verifikasi Massal')
+        APPLICANT = 'APPLICANT', _('Pendaftar')
+        PAYMENT = 'PAYMENT', _('Pembayaran')
+        SYSTEM = 'SYSTEM', _('Sistem')
+        ADMIN = 'ADMIN', _('Django Admin')
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    registration = models.ForeignKey(
+        StudentRegistration,
+        on_delete=models.CASCADE,
+        related_name='events'
+    )
+    
+    from_status = models.CharField(max_length=20, choices=StudentRegistration.RegistrationStatus.choices, blank=True)
+    to_status = models.CharField(max_length=20, choices=StudentRegistration.RegistrationStatus.choices)
+    
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    source = models.CharField(max_length=10, choices=Source.choices)
+    notes = models.TextField(_('Catatan'), blank=True)
+    batch_id = models.UUIDField(null=True, blank=True, db_index=True)
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'registration_events'
+        verbose_name = _('Riwayat Status')
+        verbose_name_plural = _('Riwayat Status')
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['registration', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.registration_id}: {self.from_status or '-'} -> {self.to_status}"
+
+class SavedFilter(models.Model):
+    """
+    Filter list staff yang disimpan (query string list: status, program,
+    dokumen, pembayaran, sort, ...). Jika materialized, id hasil di-snapshot
+    ke SavedFilterResult secara berkala oleh task refresh_saved_filters.
+    """
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(_('Nama'), max_length=100)
+    params = models.JSONField(_('Parameter Filter'), default=dict)
+    
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='saved_filters'
+    )
+    is_shared = models.BooleanField(_('Dibagikan ke Semua Staf'), default=False)
+    
+    # Snapshot
+    is_materialized = models.BooleanField(_('Snapshot Berkala'), default=False)
+    refresh_minutes = models.PositiveIntegerField(_('Interval Refresh (menit)'), default=15)
+    refreshed_at = models.DateTimeField(_('Terakhir Di-refresh'), null=True, blank=True)
+    refresh_ms = models.FloatField(null=True, blank=True)
+    result_count = models.PositiveIntegerField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'saved_filters'
+        verbose_name = _('Filter Tersimpan')
+        verbose_name_plural = _('Filter Tersimpan')
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+    
+    @property
+    def has_snapshot(self):
+        return self.is_materialized and self.refreshed_at is not None
+    
+    @property
+    def is_stale(self):
+        return self.refreshed_at is None or (
+            timezone.now() - self.refreshed_at > timedelta(minutes=self.refresh_minutes)
+        )
+
+
+class SavedFilterResult(models.Model):
+    """Snapshot id registration untuk SavedFilter (urutan sesuai sort filter)"""
+    
+    saved_filter = models.ForeignKey(
+        SavedFilter,
+        on_delete=models.CASCADE,
+        related_name='results'
+    )
+    registration = models.ForeignKey(
+        StudentRegistration,
+        on_delete=models.CASCADE,
+        related_name='saved_filter_results'
+    )
+    position = models.PositiveIntegerField()
+    
+    class Meta:
+        db_table = 'saved_filter_results'
+        unique_together = [['saved_filter', 'registration']]
+        indexes = [
+            models.Index(fields=['saved_filter', 'position']),  # Buka snapshot per halaman
+        ]
+
+class RegistrationReadModel(models.Model):
+    """
+    Baris denormalisasi per registration untuk list, filter, export & dashboard
+    staff: identitas ternormalisasi (satu kolom search_text), status
+    pembayaran, kelengkapan dokumen dan waktu event terakhir.
+    Diperbarui oleh apps.registration.read_model (signal & hook transisi);
+    bangun ulang dengan `manage.py rebuild_read_model`.
+    """
+    
+    registration = models.OneToOneField(
+        StudentRegistration,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='read_model'
+    )
+    
+    registration_number = models.CharField(max_length=20, blank=True)
+    full_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=StudentRegistration.RegistrationStatus.choices)
+    program_choice = models.CharField(max_length=20, choices=StudentRegistration.ProgramChoice.choices)
+    academic_year = models.CharField(max_length=9)
+    city = models.CharField(max_length=100, blank=True)
+    
+    # Identitas ternormalisasi: lowercase, nomor HP hanya digit (0...)
+    nik = models.CharField(max_length=16, blank=True)
+    nisn = models.CharField(max_length=10, blank=True)
+    email = models.CharField(max_length=255, blank=True)
+    phone = models.CharField(max_length=20, blank=True)
+    parent_phone = models.CharField(max_length=20, blank=True)
+    search_text = models.TextField(blank=True)
+    
+    # Pembayaran ('' = belum ada Payment)
+    payment_status = models.CharField(max_length=20, blank=True)
+    va_number = models.CharField(max_length=50, blank=True)
+    paid_at = models.DateTimeField(null=True, blank=True)
+    
+    # Dokumen
+    doc_count = models.PositiveSmallIntegerField(default=0)
+    has_ktp = models.BooleanField(default=False)
+    has_kk = models.BooleanField(default=False)
+    has_akta = models.BooleanField(default=False)
+    documents_complete = models.BooleanField(default=False)
+    
+    created_at = models.DateTimeField()
+    submitted_at = models.DateTimeField(null=True, blank=True)
+    verified_at = models.DateTimeField(null=True, blank=True)
+    last_event_at = models.DateTimeField(null=True, blank=True)
+    synced_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'registration_read_model'
+        verbose_name = _('Read Model Pendaftaran')
+        verbose_name_plural = _('Read Model Pendaftaran')
+        indexes = [
+            models.Index(fields=['status', 'submitted_at']),  # Dashboard: PAID terbaru
+            models.Index(fields=['status', 'verified_at']),  # Dashboard: VERIFIED terbaru
+            models.Index(fields=['payment_status']),
+            models.Index(fields=['documents_complete']),
+        ]
+    
+    def __str__(self):
+        return f"{self.registration_number or self.registration_id} - {self.full_name}"
+
+class ActivityEntry(models.Model):
+    """
+    Feed aktivitas terbaru dashboard staff (PAID / VERIFIED), dibatasi
+    ACTIVITY_FEED_SIZE baris per kind (lihat apps.registration.activity).
+    Nomor & nama disalin supaya feed dirender tanpa join ke student_registrations.
+    """
+    
+    id = models.BigAutoField(primary_key=True)  # Cursor polling (?after=id)
+    
+    kind = models.CharField(max_length=20, choices=StudentRegistration.RegistrationStatus.choices)
+    registration = models.ForeignKey(
+        StudentRegistration,
+        on_delete=models.CASCADE,
+        related_name='activity_entries'
+    )
+    registration_number = models.CharField(max_length=20, blank=True)
+    full_name = models.CharField(max_length=255)
+    program_choice = models.CharField(max_length=20, choices=StudentRegistration.ProgramChoice.choices)
+    
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    
+    created_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'activity_feed'
+        verbose_name = _('Aktivitas')
+        verbose_name_plural = _('Aktivitas')
+        indexes = [
+            models.Index(fields=['kind', '-id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.registration_number} ({self.created_at:%d/%m %H:%M})"
+
+class RegistrationNumberSequence(models.Model):
+    """
+    Nomor urut terakhir per tahun (PPDB-<year>-<nomor>). Dikunci saat submit
+    (SELECT ... FOR UPDATE): nomor baru tanpa ORDER BY di student_registrations
+    dan tanpa nomor ganda saat dua pendaftar submit bersamaan.
+    """
+    
+    year = models.PositiveSmallIntegerField(primary_key=True)
+    last_number = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'registration_number_sequences'
+        verbose_name = _('Urutan Nomor Pendaftaran')
+        verbose_name_plural = _('Urutan Nomor Pendaftaran')
+    
+    def __str__(self):
+        return f"PPDB-{self.year}: {self.last_number}"
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Perceptual hash (dHash 64-bit) untuk deteksi dokumen identitas yang dipakai ulang.
+
+Lookup near-duplicate memakai multi-index hashing: hash 64-bit dipecah jadi
+4 band 16-bit yang masing-masing di-index di database. Jika jarak Hamming dua
+hash <= k, minimal satu band berjarak <= k // 4 (pigeonhole), jadi cukup cari
+kandidat yang salah satu band-nya dekat, lalu hitung jarak penuh di Python.
+"""
+from itertools import combinations
+
+HASH_BITS = 64
+BAND_COUNT = 4
+BAND_BITS = HASH_BITS // BAND_COUNT
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def dhash(image, hash_size=8):
+    """
+    Difference hash: bandingkan pixel bersebelahan pada gambar grayscale
+    (hash_size + 1) x hash_size. Tahan resize, kompresi & perubahan kontras ringan.
+    """
+    from PIL import Image
+
+    small = image.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = list(small.getdata())
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(a, b):
+    return bin((a ^ b) & ((1 << HASH_BITS) - 1)).count('1')
+
+
+def to_signed(value):
+    """uint64 -> int64 (BigIntegerField signed)"""
+    return value - (1 << HASH_BITS) if value >= (1 << (HASH_BITS - 1)) else value
+
+
+def to_unsigned(value):
+    """int64 -> uint64"""
+    return value + (1 << HASH_BITS) if value < 0 else value
+
+
+def split_bands(value):
+    """Pecah hash jadi BAND_COUNT band, band 0 = bit paling signifikan"""
+    value = to_unsigned(value)
+    return [
+        (value >> (BAND_BITS * (BAND_COUNT - 1 - i))) & BAND_MASK
+        for i in range(BAND_COUNT)
+    ]
+
+
+def band_neighbors(band, radius):
+    """Semua nilai band dengan jarak Hamming <= radius"""
+    neighbors = [band]
+    for distance in range(1, radius + 1):
+        for bits in combinations(range(BAND_BITS), distance):
+            flipped = band
+            for bit in bits:
+                flipped ^= 1 << bit
+            neighbors.append(flipped)
+    return neighbors
+
+
+class BKTree:
+    """
+    BK-tree atas metrik Hamming, untuk scan batch di memori.
+    Query hanya menelusuri cabang dengan |d(node) - d(query)| <= max_distance.
+    """
+
+    def __init__(self):
+        self._root = None
+
+    def add(self, value, item):
+        node = [value, item, {}]
+        if self._root is None:
+            self._root = node
+            return
+
+        current = self._root
+        while True:
+            distance = hamming(value, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, value, max_distance):
+        """Return list (distance, item) dengan jarak <= max_distance"""
+        if self._root is None:
+            return []
+
+        results = []
+        stack = [self._root]
+        while stack:
+            node_value, item, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                results.append((distance, item))
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(
+                child for edge, child in children.items() if low <= edge <= high
+            )
+        return results
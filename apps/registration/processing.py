@@ -0,0 +1,293 @@
+"""
+Post-upload processing untuk Document.
+
+Upload hanya menyimpan file ke storage lalu langsung response ke pendaftar.
+Proses berat (hashing, validasi konten mendalam, hitung halaman PDF, render
+preview) dijalankan di background lewat Celery, satu task per dokumen sehingga
+beberapa dokumen bisa diproses paralel oleh worker yang berbeda.
+"""
+import hashlib
+import io
+import logging
+import re
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Document
+
+logger = logging.getLogger('apps.registration')
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+PDF_PAGE_PATTERN = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+
+
+class DocumentProcessingError(Exception):
+    """File lolos sniff awal tapi gagal validasi mendalam."""
+
+
+# ============================================
+# PROCESSING STAGES
+# ============================================
+
+def validate_content(document):
+    """
+    Validasi konten lebih dalam dari sniff 2 KB libmagic.
+    Gambar harus bisa di-decode Pillow, PDF harus punya header & trailer.
+    """
+    if document.mime_type == 'application/pdf':
+        with document.file.open('rb') as fh:
+            header = fh.read(5)
+            fh.seek(max(document.file_size - 1024, 0))
+            trailer = fh.read()
+
+        if header != b'%PDF-':
+            raise DocumentProcessingError('Header PDF tidak valid.')
+        if b'%%EOF' not in trailer:
+            raise DocumentProcessingError('File PDF terpotong atau rusak.')
+        return
+
+    from PIL import Image
+
+    try:
+        with document.file.open('rb') as fh:
+            with Image.open(fh) as image:
+                image.verify()
+    except Exception as e:
+        raise DocumentProcessingError(f'Gambar tidak bisa dibaca: {e}')
+
+
+def compute_content_hash(document):
+    """SHA-256 dari isi file (dipakai untuk deteksi duplikat & cache)"""
+    sha = hashlib.sha256()
+    with document.file.open('rb') as fh:
+        for chunk in fh.chunks(HASH_CHUNK_SIZE):
+            sha.update(chunk)
+    document.content_hash = sha.hexdigest()
+
+
+def count_pages(document):
+    """Hitung jumlah halaman PDF. Gambar selalu 1 halaman."""
+    if document.mime_type != 'application/pdf':
+        document.page_count = 1
+        return
+
+    with document.file.open('rb') as fh:
+        content = fh.read()
+
+    pdfium = _load_pdfium()
+    if pdfium is not None:
+        try:
+            pdf = pdfium.PdfDocument(content)
+        except pdfium.PdfiumError as e:
+            raise DocumentProcessingError(f'PDF tidak bisa dibuka: {e}')
+        try:
+            document.page_count = len(pdf)
+        finally:
+            pdf.close()
+        return
+
+    # Fallback tanpa pdfium: estimasi dari object /Type /Page. PDF dengan object
+    # stream terkompresi tidak terbaca di sini, biarkan NULL daripada salah.
+    pages = len(PDF_PAGE_PATTERN.findall(content))
+    document.page_count = pages or None
+
+
+def render_preview(document):
+    """
+    Render preview kecil (JPEG) untuk halaman verifikasi staff.
+    PDF: halaman pertama di-rasterize dengan pdfium (offline, binary ikut wheel).
+    Gambar: di-resize dengan Pillow.
+
+    Cache berdasarkan content_hash: file yang sama cukup dirender sekali.
+    """
+    if not document.content_hash:
+        return
+
+    path = preview_path_for(document.content_hash)
+    if default_storage.exists(path):
+        document.preview_path = path
+        return
+
+    try:
+        image = _rasterize(document)
+    except DocumentProcessingError:
+        raise
+    except Exception:
+        # Preview hanya pelengkap, jangan gagalkan dokumen karenanya
+        logger.warning("Preview rendering failed for document %s", document.pk, exc_info=True)
+        return
+
+    if image is None:
+        return
+
+    max_size = settings.DOCUMENT_PREVIEW_MAX_SIZE
+    image.thumbnail((max_size, max_size))
+
+    output = io.BytesIO()
+    image.convert('RGB').save(output, format='JPEG', quality=80, optimize=True)
+    document.preview_path = default_storage.save(path, ContentFile(output.getvalue()))
+
+
+def compute_phash(document):
+    """
+    Perceptual hash dari preview (PDF) atau gambar asli.
+    Dipakai untuk mendeteksi dokumen identitas yang dipakai ulang.
+    """
+    from PIL import Image
+    from .phash import dhash
+
+    if document.preview_path:
+        source = default_storage.open(document.preview_path, 'rb')
+    elif document.mime_type != 'application/pdf':
+        source = document.file.open('rb')
+    else:
+        return
+
+    with source as fh:
+        with Image.open(fh) as image:
+            document.set_phash(dhash(image))
+
+
+def preview_path_for(content_hash):
+    return f'previews/{content_hash[:2]}/{content_hash}.jpg'
+
+
+def _rasterize(document):
+    """Return PIL Image halaman pertama, atau None jika renderer tidak ada"""
+    from PIL import Image
+
+    with document.file.open('rb') as fh:
+        content = fh.read()
+
+    if document.mime_type != 'application/pdf':
+        image = Image.open(io.BytesIO(content))
+        image.load()
+        return image
+
+    pdfium = _load_pdfium()
+    if pdfium is None:
+        logger.info("pypdfium2 not installed, skipping PDF preview for %s", document.pk)
+        return None
+
+    try:
+        pdf = pdfium.PdfDocument(content)
+    except pdfium.PdfiumError as e:
+        raise DocumentProcessingError(f'PDF tidak bisa dibuka: {e}')
+
+    try:
+        page = pdf[0]
+        # Scale supaya sisi terpanjang mendekati DOCUMENT_PREVIEW_MAX_SIZE
+        longest = max(page.get_width(), page.get_height()) or 1
+        scale = settings.DOCUMENT_PREVIEW_MAX_SIZE / longest
+        bitmap = page.render(scale=scale)
+        return bitmap.to_pil()
+    finally:
+        pdf.close()
+
+
+def _load_pdfium():
+    try:
+        import pypdfium2
+    except ImportError:
+        return None
+    return pypdfium2
+
+
+# Urutan stage penting: validasi dulu, preview butuh content_hash,
+# phash memakai preview jika ada.
+PROCESSING_STAGES = (
+    validate_content,
+    compute_content_hash,
+    count_pages,
+    render_preview,
+    compute_phash,
+)
+
+
+# ============================================
+# SERVICE
+# ============================================
+
+class DocumentProcessingService:
+    """Service untuk antrian & eksekusi post-upload processing"""
+
+    @staticmethod
+    def enqueue(document: Document) -> None:
+        """
+        Jadwalkan processing setelah transaction commit.
+        File sudah aman di storage saat task dijalankan worker.
+        """
+        from .tasks import process_document
+
+        document_id = str(document.pk)
+
+        def _send():
+            try:
+                process_document.delay(document_id)
+            except Exception:
+                # Broker down: dokumen tetap PENDING, bisa diproses ulang
+                # dengan command reprocess_documents.
+                logger.error("Failed to enqueue document %s", document_id, exc_info=True)
+
+        transaction.on_commit(_send)
+
+    @staticmethod
+    def mark_failed(document: Document, error: str) -> None:
+        """Tandai FAILED tanpa menjalankan stage (retry task sudah habis)"""
+        Document.objects.filter(pk=document.pk).update(
+            processing_status=Document.ProcessingStatus.FAILED,
+            processing_error=error,
+            processed_at=timezone.now(),
+        )
+        logger.warning("Document %s marked failed: %s", document.pk, error)
+
+    @staticmethod
+    def process(document: Document) -> Document:
+        """Jalankan semua stage untuk satu dokumen"""
+
+        Document.objects.filter(pk=document.pk).update(
+            processing_status=Document.ProcessingStatus.PROCESSING
+        )
+
+        try:
+            for stage in PROCESSING_STAGES:
+                stage(document)
+        except DocumentProcessingError as e:
+            document.processing_status = Document.ProcessingStatus.FAILED
+            document.processing_error = str(e)
+            logger.warning("Document %s failed processing: %s", document.pk, e)
+        except OSError:
+            # Storage sementara tidak bisa dibaca: task process_document retry,
+            # setelah retry terakhir dokumen ditandai FAILED (mark_failed)
+            raise
+        except Exception as e:
+            # Error tak terduga (mis. PIL di compute_phash) tidak boleh membuat
+            # dokumen tertahan di PROCESSING
+            document.processing_status = Document.ProcessingStatus.FAILED
+            document.processing_error = f'Gagal memproses dokumen: {e}'
+            logger.exception("Document %s processing crashed", document.pk)
+        else:
+            document.processing_status = Document.ProcessingStatus.READY
+            document.processing_error = ''
+
+        document.processed_at = timezone.now()
+        document.save(update_fields=[
+            'processing_status',
+            'processing_error',
+            'content_hash',
+            'page_count',
+            'preview_path',
+            'phash',
+            'phash_band_0',
+            'phash_band_1',
+            'phash_band_2',
+            'phash_band_3',
+            'processed_at',
+        ])
+
+        return document
@@ -0,0 +1,185 @@
+"""
+Antrian verifikasi pendaftaran PAID.
+
+Staf menekan "Ambil berikutnya" dan mendapat pendaftaran PAID terlama yang
+belum diklaim (atau klaimnya kadaluarsa). Baris kandidat dikunci dengan
+SELECT ... FOR UPDATE SKIP LOCKED: dua staf yang mengambil bersamaan mendapat
+baris berbeda, bukan saling menunggu. Klaim (claimed_by, claimed_at) berlaku
+VERIFICATION_CLAIM_MINUTES dan dilepas saat diverifikasi / ditolak.
+
+Backend tanpa SKIP LOCKED (SQLite): compare-and-set UPDATE pada klaim lama.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from .history import seconds_between
+from .models import RegistrationEvent, StudentRegistration
+
+logger = logging.getLogger('apps.registration')
+
+Status = StudentRegistration.RegistrationStatus
+
+# Backend tanpa row lock: berapa kandidat dicoba sebelum menyerah
+CLAIM_ATTEMPTS = 5
+
+# Jeda antar keputusan lebih dari ini dianggap istirahat, bukan waktu periksa
+REVIEW_GAP_MAX_SECONDS = 30 * 60
+
+REVIEW_PACE_SQL = """
+WITH decisions AS (
+    SELECT
+        {actor} AS actor_id,
+        {created_at} AS decided_at,
+        LAG({created_at}) OVER (PARTITION BY {actor} ORDER BY {created_at}) AS previous_at
+    FROM {table}
+    WHERE {to_status} IN (%s, %s)
+      AND {source} = %s
+      AND {actor} IS NOT NULL
+      AND {created_at} >= %s
+)
+SELECT actor_id, AVG({gap})
+FROM decisions
+WHERE previous_at IS NOT NULL AND {gap} <= %s
+GROUP BY actor_id
+"""
+
+
+def claim_cutoff(now=None):
+    """Klaim dengan claimed_at sebelum ini sudah kadaluarsa"""
+    return (now or timezone.now()) - timedelta(minutes=settings.VERIFICATION_CLAIM_MINUTES)
+
+
+def claimable(now=None):
+    return Q(claimed_by__isnull=True) | Q(claimed_at__lt=claim_cutoff(now))
+
+
+def active_claims(now=None):
+    """Pendaftaran PAID yang sedang diperiksa seseorang"""
+    return StudentRegistration.objects.filter(
+        status=Status.PAID, claimed_by__isnull=False, claimed_at__gte=claim_cutoff(now)
+    )
+
+
+def pending_queue(now=None):
+    """Pendaftaran PAID yang bisa diambil, terlama dulu"""
+    return StudentRegistration.objects.filter(status=Status.PAID).filter(claimable(now)).order_by('submitted_at', 'pk')
+
+
+def claim_next(user):
+    """
+    Klaim pendaftaran PAID berikutnya untuk user. Klaim aktif milik user
+    sendiri diperpanjang dan dikembalikan lebih dulu. Return registration atau None.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        own = active_claims(now).filter(claimed_by=user).order_by('claimed_at').first()
+        if own is not None:
+            StudentRegistration.objects.filter(pk=own.pk).update(claimed_at=now)
+            own.claimed_at = now
+            return own
+
+        if connection.features.has_select_for_update_skip_locked:
+            registration = pending_queue(now).select_for_update(skip_locked=True, of=('self',)).first()
+            if registration is None:
+                return None
+            StudentRegistration.objects.filter(pk=registration.pk).update(claimed_by=user, claimed_at=now)
+        else:
+            registration = _claim_compare_and_set(user, now)
+            if registration is None:
+                return None
+
+    registration.claimed_by = user
+    registration.claimed_at = now
+    logger.info("Registration %s claimed by %s", registration.registration_number, user)
+    return registration
+
+
+def _claim_compare_and_set(user, now):
+    for candidate in pending_queue(now)[:CLAIM_ATTEMPTS]:
+        claimed = StudentRegistration.objects.filter(
+            pk=candidate.pk,
+            status=Status.PAID,
+            claimed_by_id=candidate.claimed_by_id,
+            claimed_at=candidate.claimed_at,
+        ).update(claimed_by=user, claimed_at=now)
+        if claimed:
+            return candidate
+    return None
+
+
+def release(registration, user):
+    """Lepas klaim milik user (tidak menyentuh klaim staf lain)"""
+    return StudentRegistration.objects.filter(pk=registration.pk, claimed_by=user).update(
+        claimed_by=None, claimed_at=None
+    )
+
+
+def claimed_by_others(ids, user, now=None):
+    """Id dari `ids` yang sedang diklaim (aktif) oleh staf lain"""
+    return set(
+        active_claims(now).filter(pk__in=ids).exclude(claimed_by=user).values_list('pk', flat=True)
+    )
+
+
+# ============================================
+# STATISTIK REVIEWER
+# ============================================
+
+def reviewer_stats(since):
+    """
+    Per staf sejak `since`: jumlah keputusan (diterima / ditolak, satuan /
+    massal), rentang waktu aktif, dan rata-rata jeda antar keputusan satuan
+    (perkiraan waktu periksa per berkas, dihitung dengan LAG() di SQL).
+    """
+    decisions = RegistrationEvent.objects.filter(
+        to_status__in=[Status.VERIFIED, Status.REJECTED],
+        actor__isnull=False,
+        created_at__gte=since,
+    )
+    rows = list(
+        decisions.values('actor_id', 'actor__full_name', 'actor__email').annotate(
+            total=Count('id'),
+            approved=Count('id', filter=Q(to_status=Status.VERIFIED)),
+            rejected=Count('id', filter=Q(to_status=Status.REJECTED)),
+            single=Count('id', filter=Q(source=RegistrationEvent.Source.SINGLE)),
+            bulk=Count('id', filter=Q(source=RegistrationEvent.Source.BULK)),
+            first_at=Min('created_at'),
+            last_at=Max('created_at'),
+        ).order_by('-total')
+    )
+
+    pace = _review_pace(since)
+    hours = max((timezone.now() - since).total_seconds() / 3600, 1)
+    for row in rows:
+        row['per_hour'] = row['total'] / hours
+        row['avg_review_seconds'] = pace.get(row['actor_id'])
+    return rows
+
+
+def _review_pace(since):
+    opts = RegistrationEvent._meta
+    quote = connection.ops.quote_name
+    created_at = quote(opts.get_field('created_at').column)
+
+    sql = REVIEW_PACE_SQL.format(
+        actor=quote(opts.get_field('actor').column),
+        created_at=created_at,
+        table=quote(opts.db_table),
+        to_status=quote(opts.get_field('to_status').column),
+        source=quote(opts.get_field('source').column),
+        gap=seconds_between('decided_at', 'previous_at'),
+    )
+    params = [
+        Status.VERIFIED, Status.REJECTED, RegistrationEvent.Source.SINGLE,
+        connection.ops.adapt_datetimefield_value(since), REVIEW_GAP_MAX_SECONDS,
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {actor_id: float(avg) for actor_id, avg in cursor.fetchall() if avg is not None}
@@ -0,0 +1,233 @@
+"""
+Sinkronisasi RegistrationReadModel.
+
+sync(ids) menghitung ulang baris read model untuk registration `ids` secara
+set-based: satu query sumber (registration + payment + agregat dokumen &
+event lewat subquery) lalu satu upsert (INSERT ... ON CONFLICT DO UPDATE).
+
+Pemicu:
+- post_save StudentRegistration / Payment, post_save & post_delete Document (signals.py)
+- bulk_transition (.update() tanpa save) memanggil mark_dirty() sendiri
+
+mark_dirty() mengumpulkan id ke SATU callback on_commit per transaksi: webhook
+yang menyimpan payment, registration lalu mencatat transisi cukup satu sync.
+Read model hanya melihat data yang sudah commit, dan rollback tidak
+menyentuh read model (callback di savepoint yang di-rollback ikut dibuang).
+
+Sync yang gagal (mis. DB timeout setelah commit) tidak menggagalkan request:
+task beat repair_read_model mengejar baris yang hilang / lebih lama dari
+registration, payment atau dokumennya (stale_ids). Kegagalan & jumlah baris
+tertinggal tampil di /metrics (ppdb_read_model_*).
+"""
+import logging
+import re
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, IntegerField, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from apps.core.metrics import READ_MODEL_STALE, READ_MODEL_SYNC_FAILURES
+from apps.payments.models import Payment
+
+from .models import Document, RegistrationEvent, RegistrationReadModel, StudentRegistration
+
+logger = logging.getLogger('apps.registration')
+
+REQUIRED_DOCUMENTS = ['KTP', 'KK', 'AKTA']
+
+SYNC_BATCH_SIZE = 1000
+
+NON_DIGIT = re.compile(r'\D')
+
+UPDATE_FIELDS = [
+    field.name for field in RegistrationReadModel._meta.concrete_fields
+    if not field.primary_key
+]
+
+
+def normalize_phone(value):
+    """'+62 812-3456' / '0812 3456' -> '08123456'"""
+    digits = NON_DIGIT.sub('', value or '')
+    if digits.startswith('62'):
+        digits = '0' + digits[2:]
+    return digits
+
+
+def search_terms(term):
+    """
+    Term pencarian -> bentuk yang dicocokkan ke search_text: lowercase, plus
+    versi digit untuk nomor HP ("+62 812-3456" cocok dengan "08123456").
+    """
+    term = term.strip().lower()
+    terms = {term}
+    digits = normalize_phone(term)
+    if len(digits) >= 4 and digits != term:
+        terms.add(digits)
+    return terms
+
+
+def _doc_count():
+    """Subquery jumlah dokumen per registration (OuterRef pk)"""
+    return Document.objects.filter(
+        registration=OuterRef('pk')
+    ).order_by().values('registration').annotate(count=Count('pk')).values('count')
+
+
+def _source_queryset(ids):
+    payment = Payment.objects.filter(registration=OuterRef('pk'))
+    doc_count = _doc_count()
+    last_event = RegistrationEvent.objects.filter(
+        registration=OuterRef('pk')
+    ).order_by().values('registration').annotate(last=Max('created_at')).values('last')
+
+    annotations = {
+        'rm_payment_status': Subquery(payment.values('status')[:1]),
+        'rm_va_number': Subquery(payment.values('va_number')[:1]),
+        'rm_paid_at': Subquery(payment.values('paid_at')[:1]),
+        'rm_doc_count': Coalesce(Subquery(doc_count, output_field=IntegerField()), 0),
+        'rm_last_event_at': Subquery(last_event),
+    }
+    for document_type in REQUIRED_DOCUMENTS:
+        annotations[f'rm_has_{document_type.lower()}'] = Exists(
+            Document.objects.filter(registration=OuterRef('pk'), document_type=document_type)
+        )
+
+    return StudentRegistration.objects.filter(pk__in=ids).annotate(**annotations).only(
+        'id', 'registration_number', 'full_name', 'status', 'program_choice', 'academic_year', 'city',
+        'nik', 'nisn', 'contact_email', 'contact_phone', 'parent_phone',
+        'created_at', 'submitted_at', 'verified_at',
+    )
+
+
+def build_row(registration):
+    """StudentRegistration (beranotasi rm_*) -> RegistrationReadModel (belum disimpan)"""
+    email = (registration.contact_email or '').strip().lower()
+    phone = normalize_phone(registration.contact_phone)
+    parent_phone = normalize_phone(registration.parent_phone)
+    flags = {
+        document_type: getattr(registration, f'rm_has_{document_type.lower()}')
+        for document_type in REQUIRED_DOCUMENTS
+    }
+
+    return RegistrationReadModel(
+        registration_id=registration.pk,
+        registration_number=registration.registration_number or '',
+        full_name=registration.full_name,
+        status=registration.status,
+        program_choice=registration.program_choice,
+        academic_year=registration.academic_year,
+        city=registration.city or '',
+        nik=registration.nik or '',
+        nisn=registration.nisn or '',
+        email=email,
+        phone=phone,
+        parent_phone=parent_phone,
+        search_text=' '.join(filter(None, [
+            (registration.registration_number or '').lower(),
+            registration.full_name.lower(),
+            registration.nik,
+            registration.nisn,
+            email,
+            phone,
+            parent_phone,
+        ])),
+        payment_status=registration.rm_payment_status or '',
+        va_number=registration.rm_va_number or '',
+        paid_at=registration.rm_paid_at,
+        doc_count=registration.rm_doc_count,
+        has_ktp=flags['KTP'],
+        has_kk=flags['KK'],
+        has_akta=flags['AKTA'],
+        documents_complete=all(flags.values()),
+        created_at=registration.created_at,
+        submitted_at=registration.submitted_at,
+        verified_at=registration.verified_at,
+        last_event_at=registration.rm_last_event_at,
+    )
+
+
+def sync(ids):
+    """Upsert baris read model untuk registration `ids`; return jumlah baris"""
+    ids = list(ids)
+    total = 0
+    for start in range(0, len(ids), SYNC_BATCH_SIZE):
+        rows = [build_row(registration) for registration in _source_queryset(ids[start:start + SYNC_BATCH_SIZE])]
+        RegistrationReadModel.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['registration'],
+            update_fields=UPDATE_FIELDS,
+        )
+        total += len(rows)
+    return total
+
+
+class _PendingSync:
+    """Callback on_commit: id registration yang berubah dalam satu transaksi"""
+
+    def __init__(self):
+        self.ids = {}  # dict sebagai ordered set
+
+    def __call__(self):
+        try:
+            sync(self.ids)
+        except Exception:
+            # Read model tertinggal tidak boleh menggagalkan request; rebuild_read_model memperbaiki
+            READ_MODEL_SYNC_FAILURES.inc()
+            logger.exception("Read model sync failed for %s registrations", len(self.ids))
+
+
+def _pending_sync(connection):
+    # run_on_commit: callback yang masih menunggu commit transaksi ini
+    for entry in connection.run_on_commit:
+        if isinstance(entry[1], _PendingSync):
+            return entry[1]
+    pending = _PendingSync()
+    transaction.on_commit(pending)
+    return pending
+
+
+def mark_dirty(*ids):
+    """Sync registration `ids` setelah transaksi commit (langsung jika di luar transaksi)"""
+    ids = [pk for pk in ids if pk is not None]
+    if not ids:
+        return
+
+    connection = transaction.get_connection()
+    pending = _pending_sync(connection) if connection.in_atomic_block else _PendingSync()
+    pending.ids.update(dict.fromkeys(ids))
+    if not connection.in_atomic_block:
+        pending()
+
+
+def missing_ids():
+    """Registration yang belum punya baris read model"""
+    return StudentRegistration.objects.filter(read_model__isnull=True).values_list('pk', flat=True)
+
+
+def stale_ids():
+    """
+    Registration tanpa baris read model, atau yang registration / payment /
+    dokumennya berubah setelah sync terakhir. Payment & dokumen tidak menyentuh
+    StudentRegistration.updated_at; dokumen terhapus terdeteksi dari doc_count.
+    """
+    synced_at = OuterRef('read_model__synced_at')
+    return StudentRegistration.objects.annotate(
+        actual_doc_count=Coalesce(Subquery(_doc_count(), output_field=IntegerField()), 0),
+    ).filter(
+        Q(read_model__isnull=True)
+        | Q(read_model__synced_at__lt=F('updated_at'))
+        | Q(Exists(Payment.objects.filter(registration=OuterRef('pk'), updated_at__gt=synced_at)))
+        | Q(Exists(Document.objects.filter(registration=OuterRef('pk'), uploaded_at__gt=synced_at)))
+        | ~Q(read_model__doc_count=F('actual_doc_count'))
+    ).order_by('pk').values_list('pk', flat=True)
+
+
+def repair():
+    """Sync ulang stale_ids(); return jumlah baris"""
+    ids = list(stale_ids())
+    READ_MODEL_STALE.set(len(ids))
+    if not ids:
+        return 0
+    logger.warning("Read model behind for %s registrations, resyncing", len(ids))
+    return sync(ids)
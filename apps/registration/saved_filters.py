@@ -0,0 +1,90 @@
+"""
+Filter tersimpan untuk list staff + snapshot hasil (materialized).
+
+Snapshot = id registration hasil filter (urut sesuai sort filter) di tabel
+SavedFilterResult. Membuka filter ber-snapshot cukup join ber-index
+(saved_filter, position) + LIMIT/OFFSET halaman, bukan scan filter penuh.
+Isi baris (status, nama, ...) tetap data terkini; yang di-snapshot hanya
+keanggotaan & urutan, kesegarannya ditampilkan dari refreshed_at.
+
+Refresh: task berkala refresh_saved_filters (yang sudah lewat refresh_minutes)
+atau manual dari halaman list (refresh_saved_filter).
+"""
+import logging
+import time
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .filters import annotate_registrations, filter_registrations, sort_registrations
+from .models import SavedFilter, SavedFilterResult, StudentRegistration
+
+logger = logging.getLogger('apps.registration')
+
+# Parameter list staff yang disimpan (page & saved tidak ikut)
+FILTER_PARAMS = ('status', 'program', 'search', 'documents', 'missing', 'payment', 'submitted_days', 'sort')
+
+INSERT_BATCH_SIZE = 5000
+
+
+def clean_params(params):
+    """request.GET -> dict parameter filter yang terisi saja"""
+    return {key: params.get(key) for key in FILTER_PARAMS if params.get(key)}
+
+
+def visible_to(user):
+    """Filter milik user + yang dibagikan"""
+    return SavedFilter.objects.filter(Q(owner=user) | Q(is_shared=True))
+
+
+def live_queryset(params):
+    """Hasil filter dihitung langsung (tanpa snapshot)"""
+    queryset = filter_registrations(annotate_registrations(StudentRegistration.objects.all()), params)
+    return sort_registrations(queryset, params)
+
+
+def snapshot_queryset(saved_filter):
+    """Registration dalam snapshot, urut posisi (join index saved_filter, position)"""
+    return StudentRegistration.objects.filter(
+        saved_filter_results__saved_filter=saved_filter
+    ).order_by('saved_filter_results__position')
+
+
+def refresh(saved_filter):
+    """
+    Hitung ulang filter & ganti isi snapshot dalam satu transaksi
+    (pembaca melihat snapshot lama sampai commit).
+    """
+    start = time.perf_counter()
+    ids = list(live_queryset(saved_filter.params).values_list('pk', flat=True))
+
+    with transaction.atomic():
+        SavedFilterResult.objects.filter(saved_filter=saved_filter).delete()
+        SavedFilterResult.objects.bulk_create(
+            (
+                SavedFilterResult(saved_filter=saved_filter, registration_id=pk, position=position)
+                for position, pk in enumerate(ids)
+            ),
+            batch_size=INSERT_BATCH_SIZE,
+        )
+
+        saved_filter.refreshed_at = timezone.now()
+        saved_filter.refresh_ms = (time.perf_counter() - start) * 1000
+        saved_filter.result_count = len(ids)
+        SavedFilter.objects.filter(pk=saved_filter.pk).update(
+            refreshed_at=saved_filter.refreshed_at,
+            refresh_ms=saved_filter.refresh_ms,
+            result_count=saved_filter.result_count,
+        )
+
+    logger.info(
+        "Saved filter %r refreshed: %s rows in %.0f ms",
+        saved_filter.name, saved_filter.result_count, saved_filter.refresh_ms
+    )
+    return saved_filter
+
+
+def due_for_refresh():
+    """Filter materialized yang snapshot-nya sudah lewat refresh_minutes"""
+    return [saved for saved in SavedFilter.objects.filter(is_materialized=True) if saved.is_stale]
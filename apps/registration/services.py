@@ -1,9 +1,14 @@
 
+from django.conf import settings
 from django.db import transaction
+from django.db.models import IntegerField, Max, Q
+from django.db.models.functions import Cast, Substr
 from django.utils import timezone
 import logging
 
-from .models import StudentRegistration
+from .models import RegistrationEvent, RegistrationNumberSequence, StudentRegistration, Document
+from .phash import BAND_COUNT, band_neighbors, hamming, split_bands, to_unsigned
+from .transitions import record_transition
 
 logger = logging.getLogger('apps.registration')
 
@@ -11,6 +16,31 @@ logger = logging.getLogger('apps.registration')
 class RegistrationService:
     """Service untuk registration logic"""
     
+    @staticmethod
+    def last_registration_number(year):
+        """Nomor urut terbesar yang sudah dipakai di tahun `year` (numerik, bukan urut string)"""
+        prefix = f'PPDB-{year}-'
+        return StudentRegistration.objects.filter(
+            registration_number__startswith=prefix
+        ).aggregate(
+            last=Max(Cast(Substr('registration_number', len(prefix) + 1), IntegerField()))
+        )['last'] or 0
+    
+    @staticmethod
+    @transaction.atomic
+    def next_registration_number(year):
+        """
+        Ambil & naikkan RegistrationNumberSequence tahun `year` (SELECT ... FOR UPDATE).
+        Baris sequence tahun baru diisi dari nomor yang sudah ada (biasanya kosong).
+        """
+        sequence, _ = RegistrationNumberSequence.objects.select_for_update().get_or_create(
+            year=year,
+            defaults={'last_number': lambda: RegistrationService.last_registration_number(year)},
+        )
+        sequence.last_number += 1
+        sequence.save(update_fields=['last_number'])
+        return sequence.last_number
+    
     @staticmethod
     @transaction.atomic
     def submit_registration(registration: StudentRegistration) -> StudentRegistration:
@@ -20,73 +50,137 @@ class RegistrationService:
         CRITICAL: Nomor di-generate DI SINI saat submit.
         """
         
-        logger.info(f"=== SUBMIT START === ID: {registration.id}, Name: {registration.full_name}")
+        logger.debug("Submit start: %s (%s)", registration.id, registration.full_name)
         
         # Check status
         if registration.status != StudentRegistration.RegistrationStatus.DRAFT:
-            logger.error(f"Status not DRAFT: {registration.status}")
+            logger.warning("Submit rejected, status not DRAFT: %s (%s)", registration.id, registration.status)
             raise ValueError('Pendaftaran sudah pernah disubmit.')
         
         # ========================================
         # GENERATE REGISTRATION NUMBER
         # ========================================
         if not registration.registration_number:
-            logger.info("Generating registration number...")
+            logger.debug("Generating registration number for %s", registration.id)
             
             try:
                 # Extract year dari academic_year (e.g., "2025/2026" → 2026)
                 if registration.academic_year:
                     year = int(registration.academic_year.split('/')[1])
-                    logger.info(f"Year from academic_year: {year}")
+                    logger.debug("Year from academic_year: %s", year)
                 else:
                     year = timezone.now().year + 1
-                    logger.info(f"Year from current: {year}")
+                    logger.debug("Year from current: %s", year)
                 
-                # Get last registration number for this year
-                last_reg = StudentRegistration.objects.filter(
-                    registration_number__startswith=f'PPDB-{year}',
-                    registration_number__isnull=False
-                ).exclude(
-                    registration_number=''
-                ).order_by('-registration_number').first()
-                
-                if last_reg:
-                    logger.info(f"Last registration: {last_reg.registration_number}")
-                    last_num = int(last_reg.registration_number.split('-')[-1])
-                    new_num = last_num + 1
-                else:
-                    logger.info("No previous registration, starting from 1")
-                    new_num = 1
+                # Nomor urut berikutnya dari sequence per tahun (terkunci sampai commit)
+                new_num = RegistrationService.next_registration_number(year)
                 
                 # Generate new number
                 new_registration_number = f'PPDB-{year}-{new_num:05d}'
-                logger.info(f"NEW NUMBER: {new_registration_number}")
+                logger.debug("New number: %s", new_registration_number)
                 
                 # SET IT
                 registration.registration_number = new_registration_number
                 
             except Exception as e:
-                logger.error(f"Generation error: {str(e)}", exc_info=True)
+                logger.error("Registration number generation failed for %s", registration.id, exc_info=True)
                 raise ValueError(f'Gagal generate nomor: {str(e)}')
         else:
-            logger.info(f"Number already exists: {registration.registration_number}")
+            logger.debug("Number already exists: %s", registration.registration_number)
         
         # Update status
         registration.status = StudentRegistration.RegistrationStatus.SUBMITTED
         registration.submitted_at = timezone.now()
         
         # SAVE
-        logger.info(f"Saving... Number: {registration.registration_number}")
+        logger.debug("Saving registration %s", registration.registration_number)
         registration.save()
         
         # Verify after save
         registration.refresh_from_db()
-        logger.info(f"After refresh: {registration.registration_number}")
+        logger.debug("After refresh: %s", registration.registration_number)
         
         if not registration.registration_number:
-            logger.error("CRITICAL: Number is EMPTY after save!")
+            logger.error("Registration number empty after save: %s", registration.id)
             raise ValueError('Nomor tidak tersimpan. Hubungi admin.')
         
-        logger.info(f"=== SUBMIT SUCCESS === {registration.registration_number}")
+        logger.info("Registration submitted: %s", registration.registration_number)
+        record_transition(
+            registration,
+            from_status=StudentRegistration.RegistrationStatus.DRAFT,
+            source=RegistrationEvent.Source.APPLICANT,
+        )
+        
+        return registration
+
+
+class DocumentSimilarityService:
+    """Deteksi dokumen mirip (dipakai ulang) antar pendaftaran"""
+    
+    @staticmethod
+    def find_similar(document: Document, max_distance: int = None, limit: int = 10):
+        """
+        Cari dokumen dari pendaftaran LAIN yang perceptual hash-nya mirip.
+        
+        Multi-index lookup: kandidat diambil via index band (sub-linear),
+        baru jarak Hamming penuh dihitung untuk kandidat saja.
+        
+        Returns:
+            List (distance, Document) urut dari yang paling mirip
+        """
+        return DocumentSimilarityService.find_similar_many([document], max_distance, limit).get(document.pk, [])
+    
+    @staticmethod
+    def find_similar_many(documents, max_distance: int = None, limit: int = 10):
+        """
+        find_similar untuk beberapa dokumen sekaligus (satu query kandidat,
+        bukan satu per dokumen, paling banyak DOCUMENT_PHASH_MAX_CANDIDATES baris).
+        
+        Returns:
+            Dict {document.pk: [(distance, Document), ...]}
+        """
+        documents = [doc for doc in documents if doc.phash is not None]
+        if not documents:
+            return {}
+        
+        if max_distance is None:
+            max_distance = settings.DOCUMENT_PHASH_MAX_DISTANCE
+        
+        radius = max_distance // BAND_COUNT
+        condition = Q()
+        for document in documents:
+            for i, band in enumerate(split_bands(document.phash)):
+                condition |= Q(**{f'phash_band_{i}__in': band_neighbors(band, radius)})
+        
+        candidates = Document.objects.filter(condition)
+        registration_ids = {doc.registration_id for doc in documents}
+        if len(registration_ids) == 1:
+            candidates = candidates.exclude(registration_id__in=registration_ids)
+        # Dibatasi di SQL (terbaru dulu, urutan deterministik) & hanya kolom untuk
+        # jarak Hamming; baris lengkap dimuat hanya untuk yang benar-benar mirip
+        candidates = list(
+            candidates.order_by('-uploaded_at', '-pk').values_list(
+                'pk', 'registration_id', 'phash'
+            )[:settings.DOCUMENT_PHASH_MAX_CANDIDATES]
+        )
+        
+        matched = {}
+        for document in documents:
+            target = to_unsigned(document.phash)
+            matches = []
+            for pk, registration_id, phash in candidates:
+                if registration_id == document.registration_id:
+                    continue
+                distance = hamming(target, to_unsigned(phash))
+                if distance <= max_distance:
+                    matches.append((distance, pk))
+            
+            matches.sort(key=lambda match: match[0])
+            matched[document.pk] = matches[:limit]
         
-        return registration
\ No newline at end of file
+        needed = {pk for matches in matched.values() for _, pk in matches}
+        loaded = Document.objects.select_related('registration').in_bulk(needed) if needed else {}
+        return {
+            document_pk: [(distance, loaded[pk]) for distance, pk in matches if pk in loaded]
+            for document_pk, matches in matched.items()
+        }
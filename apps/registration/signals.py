@@ -0,0 +1,81 @@
+"""
+Signal transisi status pendaftaran.
+
+registrations_transitioned dikirim SEKALI per transisi (satuan maupun massal)
+setelah transaksi commit. Efek lanjutan (notifikasi, invalidasi cache,
+metrics) cukup connect ke sini, tidak perlu menyentuh view/service.
+
+    @receiver(registrations_transitioned)
+    def handler(sender, registrations, from_status, to_status, actor, source, batch_id, **kwargs):
+        # registrations: [(id, registration_number, full_name, program_choice), ...]
+        ...
+"""
+import logging
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from apps.core.metrics import record_funnel
+from apps.payments.models import Payment
+
+from . import activity, read_model
+from .models import Document, StudentRegistration
+
+logger = logging.getLogger('apps.registration')
+
+registrations_transitioned = Signal()
+
+# Status tujuan -> stage funnel metrics
+FUNNEL_STAGES = {
+    'SUBMITTED': 'submitted',
+    'PAID': 'paid',
+    'VERIFIED': 'verified',
+    'REJECTED': 'rejected',
+}
+
+
+@receiver(registrations_transitioned)
+def update_funnel(sender, registrations, to_status, **kwargs):
+    stage = FUNNEL_STAGES.get(to_status)
+    if stage:
+        record_funnel(stage, len(registrations))
+
+
+@receiver(registrations_transitioned)
+def log_transition(sender, registrations, from_status, to_status, actor, source, batch_id, **kwargs):
+    logger.info(
+        "%s registrations %s -> %s by %s (%s, batch %s)",
+        len(registrations), from_status, to_status, actor or 'system', source, batch_id
+    )
+
+
+@receiver(registrations_transitioned)
+def append_activity(sender, registrations, to_status, actor, **kwargs):
+    try:
+        activity.append(registrations, to_status, actor=actor)
+    except Exception:
+        # Feed dashboard tidak boleh menggagalkan transisi yang sudah commit
+        logger.exception("Activity feed append failed (%s)", to_status)
+
+
+# ============================================
+# READ MODEL (transisi massal: lihat bulk_transition)
+# ============================================
+
+@receiver(post_save, sender=StudentRegistration)
+def registration_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        read_model.mark_dirty(instance.pk)
+
+
+@receiver(post_save, sender=Document)
+@receiver(post_delete, sender=Document)
+def document_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        read_model.mark_dirty(instance.registration_id)
+
+
+@receiver(post_save, sender=Payment)
+def payment_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        read_model.mark_dirty(instance.registration_id)
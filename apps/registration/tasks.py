@@ -0,0 +1,64 @@
+"""
+Celery tasks untuk registration app.
+"""
+from celery import shared_task
+import logging
+
+from . import activity, read_model, saved_filters
+from .models import Document, SavedFilter
+from .processing import DocumentProcessingService
+
+logger = logging.getLogger('apps.registration')
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30, acks_late=True)
+def process_document(self, document_id):
+    """Post-upload processing untuk satu dokumen"""
+    try:
+        document = Document.objects.get(pk=document_id)
+    except Document.DoesNotExist:
+        # Dokumen dihapus pendaftar sebelum sempat diproses
+        logger.info("Document %s no longer exists, skipping processing", document_id)
+        return
+
+    try:
+        DocumentProcessingService.process(document)
+    except OSError as exc:
+        if self.request.retries >= self.max_retries:
+            # File tetap tidak terbaca (mis. hilang dari storage): jangan tertahan di PROCESSING
+            DocumentProcessingService.mark_failed(document, f'File tidak bisa dibaca: {exc}')
+            return
+        # Storage sementara tidak bisa diakses, coba lagi nanti
+        raise self.retry(exc=exc)
+
+
+@shared_task(ignore_result=True)
+def refresh_saved_filter(saved_filter_id):
+    """Refresh snapshot satu filter tersimpan (tombol refresh di list staff)"""
+    try:
+        saved_filter = SavedFilter.objects.get(pk=saved_filter_id)
+    except SavedFilter.DoesNotExist:
+        logger.info("Saved filter %s no longer exists, skipping refresh", saved_filter_id)
+        return
+
+    if saved_filter.is_materialized:
+        saved_filters.refresh(saved_filter)
+
+
+@shared_task(ignore_result=True)
+def refresh_saved_filters():
+    """Beat: refresh snapshot yang sudah lewat interval masing-masing"""
+    for saved_filter in saved_filters.due_for_refresh():
+        saved_filters.refresh(saved_filter)
+
+
+@shared_task(ignore_result=True)
+def repair_read_model():
+    """Beat: sync ulang baris read model yang hilang / tertinggal (sync on_commit gagal)"""
+    read_model.repair()
+
+
+@shared_task(ignore_result=True)
+def trim_activity_feed():
+    """Beat: potong feed aktivitas ke ACTIVITY_FEED_SIZE per kind"""
+    activity.trim()
@@ -0,0 +1,105 @@
+"""
+Jumlah query changelist admin (registration, document, payment, payment log)
+harus tetap, tidak bertambah per baris yang ditampilkan.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.payments.models import Payment, PaymentLog
+
+from .models import Document, StudentRegistration
+
+ROWS = 100
+
+
+class AdminChangelistQueryTests(TestCase):
+    """Satu halaman penuh (100 baris) changelist admin dengan jumlah query tetap"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='pw-test-12345', full_name='Admin'
+        )
+        registrations = StudentRegistration.objects.bulk_create([
+            StudentRegistration(
+                registration_number=f'PPDB-2026-{i:05d}',
+                academic_year='2025/2026',
+                status=StudentRegistration.RegistrationStatus.SUBMITTED,
+                full_name=f'Siswa {i}',
+                nisn=f'{i:010d}',
+                birth_place='Bandung',
+                birth_date=date(2010, 1, 1),
+                gender='L',
+                contact_email=f'siswa{i}@example.com',
+                contact_phone='081234567890',
+                religion='ISLAM',
+                previous_school='SMP Negeri 1',
+                graduation_year=2025,
+                program_choice=StudentRegistration.ProgramChoice.PAKET_C,
+                address='Jl. Contoh No. 1',
+                city='Bandung',
+                province='Jawa Barat',
+                parent_phone='081234567891',
+            )
+            for i in range(1, ROWS + 1)
+        ])
+        Document.objects.bulk_create([
+            Document(
+                registration=registration,
+                document_type='KTP',
+                file=f'documents/test/{registration.pk}.pdf',
+                original_filename='ktp.pdf',
+                file_size=1024,
+                mime_type='application/pdf',
+            )
+            for registration in registrations
+        ])
+        payments = Payment.objects.bulk_create([
+            Payment(
+                registration=registration,
+                user=cls.user,
+                gateway_order_id=f'PPDB-{registration.registration_number}-TEST',
+                amount=Decimal('150000'),
+                admin_fee=Decimal('4000'),
+                total_amount=Decimal('154000'),
+                status=Payment.PaymentStatus.PENDING,
+            )
+            for registration in registrations
+        ])
+        PaymentLog.objects.bulk_create([
+            PaymentLog(
+                payment=payment,
+                event_type=PaymentLog.EventType.STATUS_CHANGED,
+                old_status='',
+                new_status=Payment.PaymentStatus.PENDING,
+            )
+            for payment in payments
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def assertChangelistQueries(self, model, num):
+        url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['cl'].result_list), ROWS)
+
+    # session, user, 2x COUNT, satu SELECT baris (select_related / annotate),
+    # savepoint ATOMIC_REQUESTS; registration + DISTINCT academic_year (list_filter)
+    def test_registration_changelist(self):
+        self.assertChangelistQueries(StudentRegistration, 8)
+
+    def test_document_changelist(self):
+        self.assertChangelistQueries(Document, 7)
+
+    def test_payment_changelist(self):
+        self.assertChangelistQueries(Payment, 7)
+
+    def test_payment_log_changelist(self):
+        self.assertChangelistQueries(PaymentLog, 7)
@@ -0,0 +1,190 @@
+"""
+Engine transisi status pendaftaran (massal).
+
+PostgreSQL: satu statement CTE - kunci baris yang masih berstatus asal
+dengan FOR UPDATE SKIP LOCKED (baris yang sedang diproses staf lain dilewati,
+bukan ditunggu), UPDATE dan RETURNING id, nomor, nama & program (payload
+signal, dipakai feed aktivitas tanpa query ulang). Audit
+RegistrationEvent ditulis dengan satu bulk_create, lalu satu hook on_commit
+mengirim signal registrations_transitioned untuk seluruh batch.
+
+Backend lain: ORM (select_for_update(skip_locked) jika didukung, lalu update).
+
+record_transition() untuk jalur yang sudah menyimpan satu instance sendiri
+(submit pendaftar, webhook pembayaran): cukup tulis event + signal.
+"""
+import uuid
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import read_model
+from .models import RegistrationEvent, StudentRegistration
+from .signals import registrations_transitioned
+
+TRANSITION_SQL = """
+WITH locked AS (
+    SELECT {pk} FROM {table}
+    WHERE {pk} = ANY(%s) AND {status} = %s
+    ORDER BY {pk}
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE {table} AS r
+SET {assignments}
+FROM locked
+WHERE r.{pk} = locked.{pk}
+RETURNING r.{pk}, r.{number}, r.{full_name}, r.{program}
+"""
+
+# Kolom per baris hasil transisi (urutan sama dengan RETURNING di atas)
+ROW_FIELDS = ('pk', 'registration_number', 'full_name', 'program_choice')
+
+
+class TransitionResult:
+    """Hasil transisi massal"""
+
+    def __init__(self, batch_id, registrations, requested):
+        self.batch_id = batch_id
+        self.registrations = registrations  # [(id, registration_number, full_name, program_choice)]
+        self.requested = requested
+
+    @property
+    def count(self):
+        return len(self.registrations)
+
+    @property
+    def skipped(self):
+        """Dipilih tapi tidak diproses: status sudah berubah / sedang dikunci transaksi lain"""
+        return self.requested - self.count
+
+
+def _column_values(values):
+    """{nama field: nilai} -> [(kolom ter-quote, nilai siap DB)]"""
+    opts = StudentRegistration._meta
+    columns = []
+    for name, value in values.items():
+        field = opts.get_field(name)
+        if field.is_relation and hasattr(value, 'pk'):
+            value = value.pk
+        columns.append((connection.ops.quote_name(field.column), field.get_db_prep_save(value, connection)))
+    return columns
+
+
+def _transition_postgresql(ids, from_status, values):
+    opts = StudentRegistration._meta
+    quote = connection.ops.quote_name
+    columns = _column_values(values)
+
+    sql = TRANSITION_SQL.format(
+        pk=quote(opts.pk.column),
+        table=quote(opts.db_table),
+        status=quote(opts.get_field('status').column),
+        number=quote(opts.get_field('registration_number').column),
+        full_name=quote(opts.get_field('full_name').column),
+        program=quote(opts.get_field('program_choice').column),
+        assignments=', '.join(f'{column} = %s' for column, _ in columns),
+    )
+    params = [list(ids), from_status] + [value for _, value in columns]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _transition_generic(ids, from_status, values):
+    queryset = StudentRegistration.objects.filter(pk__in=ids, status=from_status)
+    if connection.features.has_select_for_update_skip_locked:
+        queryset = queryset.select_for_update(skip_locked=True)
+
+    rows = list(queryset.order_by('pk').values_list(*ROW_FIELDS))
+    if not rows:
+        return []
+
+    updated = StudentRegistration.objects.filter(
+        pk__in=[pk for pk, *_ in rows], status=from_status
+    ).update(**values)
+
+    if updated != len(rows):
+        # Tanpa row lock (SQLite) baris bisa berubah di antara SELECT & UPDATE;
+        # updated_at unik per batch menandai baris yang benar-benar diubah.
+        rows = list(
+            StudentRegistration.objects.filter(
+                pk__in=[pk for pk, *_ in rows], updated_at=values['updated_at']
+            ).values_list(*ROW_FIELDS)
+        )
+    return rows
+
+
+def bulk_transition(ids, from_status, to_status, actor=None, notes='', source=RegistrationEvent.Source.BULK, **fields):
+    """
+    Pindahkan registration `ids` dari from_status ke to_status secara atomik.
+
+    Hanya baris yang masih berstatus from_status (dan tidak sedang dikunci)
+    yang diproses. Field tambahan (verified_at, verification_notes, ...) lewat
+    **fields. Return TransitionResult; signal dikirim setelah commit.
+    """
+    # ValidationError jika ada id yang bukan UUID valid
+    ids = list(dict.fromkeys(StudentRegistration._meta.pk.to_python(pk) for pk in ids))
+    now = timezone.now()
+    batch_id = uuid.uuid4()
+    values = {'status': to_status, 'updated_at': now, **fields}
+
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            rows = _transition_postgresql(ids, from_status, values)
+        else:
+            rows = _transition_generic(ids, from_status, values)
+
+        RegistrationEvent.objects.bulk_create([
+            RegistrationEvent(
+                registration_id=pk,
+                from_status=from_status,
+                to_status=to_status,
+                actor=actor,
+                source=source,
+                notes=notes,
+                batch_id=batch_id,
+                created_at=now,
+            )
+            for pk, *_ in rows
+        ])
+
+        if rows:
+            # .update() tanpa post_save: read model ditandai di transaksi yang sama
+            read_model.mark_dirty(*[pk for pk, *_ in rows])
+            _send_on_commit(rows, from_status, to_status, actor, source, batch_id)
+
+    return TransitionResult(batch_id, rows, len(ids))
+
+
+def record_transition(registration, from_status, actor=None, notes='', source=RegistrationEvent.Source.SINGLE):
+    """
+    Catat transisi satu registration yang SUDAH disimpan dengan status baru
+    (from_status -> registration.status). Harus dipanggil di dalam transaksi
+    yang sama dengan save().
+    """
+    event = RegistrationEvent.objects.create(
+        registration=registration,
+        from_status=from_status or '',
+        to_status=registration.status,
+        actor=actor,
+        source=source,
+        notes=notes,
+    )
+    _send_on_commit(
+        [(registration.pk, registration.registration_number, registration.full_name, registration.program_choice)],
+        from_status, registration.status, actor, source, None
+    )
+    return event
+
+
+def _send_on_commit(rows, from_status, to_status, actor, source, batch_id):
+    transaction.on_commit(lambda: registrations_transitioned.send(
+        sender=StudentRegistration,
+        registrations=rows,
+        from_status=from_status,
+        to_status=to_status,
+        actor=actor,
+        source=source,
+        batch_id=batch_id,
+    ))
@@ -0,0 +1,74 @@
+"""
+Upload handler yang memvalidasi file SELAMA transfer.
+
+Tanpa handler ini file divalidasi setelah seluruh body diterima dan
+di-buffer. Handler ini dipasang paling depan di FILE_UPLOAD_HANDLERS:
+extension dicek saat header part diterima, ukuran dicek per chunk, dan
+MIME type di-sniff dari chunk pertama. Begitu ada pelanggaran, file
+di-skip: chunk berikutnya dibuang tanpa disimpan ke memory/disk.
+
+Chunk yang valid diteruskan ke handler berikutnya (memory untuk file
+kecil, temporary file di atas FILE_UPLOAD_MAX_MEMORY_SIZE).
+"""
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+from .validators import ALLOWED_MIME_TYPES, MIME_SNIFF_SIZE, detect_mime_type
+
+logger = logging.getLogger('apps.registration')
+
+
+class ValidatingUploadHandler(FileUploadHandler):
+    """Validasi extension, ukuran & MIME type per chunk"""
+    
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.received = 0
+        self.head = b''
+        self.sniffed = False
+        
+        ext = os.path.splitext(file_name)[1][1:].lower()
+        if ext not in settings.ALLOWED_DOCUMENT_TYPES:
+            allowed = ', '.join(settings.ALLOWED_DOCUMENT_TYPES)
+            self.reject(f'Format file tidak didukung. Format yang diperbolehkan: {allowed}')
+    
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        
+        if self.received > settings.MAX_UPLOAD_SIZE:
+            max_mb = settings.MAX_UPLOAD_SIZE / (1024 * 1024)
+            self.reject(f'Ukuran file terlalu besar. Maksimal {max_mb:.1f} MB.')
+        
+        if not self.sniffed:
+            self.head += raw_data[:MIME_SNIFF_SIZE - len(self.head)]
+            if len(self.head) >= MIME_SNIFF_SIZE:
+                self.sniff()
+        
+        return raw_data
+    
+    def file_complete(self, file_size):
+        # File lebih kecil dari MIME_SNIFF_SIZE: validasi MIME type
+        # tetap dijalankan oleh validate_file_content di form.
+        return None
+    
+    def sniff(self):
+        self.sniffed = True
+        mime = detect_mime_type(self.head)
+        if mime not in ALLOWED_MIME_TYPES:
+            self.reject(f'Tipe file tidak valid. Detected: {mime}')
+    
+    def reject(self, message):
+        """Catat error untuk ditampilkan form, lalu buang sisa file"""
+        errors = getattr(self.request, 'upload_errors', None)
+        if errors is None:
+            errors = self.request.upload_errors = {}
+        errors[self.field_name] = message
+        
+        logger.warning(
+            "Upload rejected during transfer: %s (%s, %s bytes received)",
+            self.file_name, message, self.received
+        )
+        raise SkipFile(message)
@@ -14,6 +14,9 @@ urlpatterns = [
     # Upload documents
     path('<uuid:pk>/documents/', views.DocumentUploadView.as_view(), name='documents'),
     
+    # Status processing dokumen (JSON, untuk polling)
+    path('<uuid:pk>/documents/status/', views.document_status_view, name='document_status'),
+    
     # Review
     path('<uuid:pk>/review/', views.ReviewRegistrationView.as_view(), name='review'),
     
@@ -29,10 +32,19 @@ urlpatterns = [
     
     # Dashboard
     path('staff/dashboard/', views.StaffDashboardView.as_view(), name='staff_dashboard'),
+    path('staff/activity/', views.ActivityFeedView.as_view(), name='staff_activity'),
+    
+    # Lama waktu di tiap status
+    path('staff/reports/status-duration/', views.StatusDurationReportView.as_view(), name='staff_status_duration'),
     
     # List registrations
     path('staff/list/', views.RegistrationListView.as_view(), name='staff_list'),
     
+    # Filter tersimpan (+ snapshot)
+    path('staff/saved-filters/', views.SavedFilterCreateView.as_view(), name='staff_saved_filter_create'),
+    path('staff/saved-filters/<uuid:pk>/refresh/', views.SavedFilterRefreshView.as_view(), name='staff_saved_filter_refresh'),
+    path('staff/saved-filters/<uuid:pk>/delete/', views.SavedFilterDeleteView.as_view(), name='staff_saved_filter_delete'),
+    
     # Detail for verification
     path('staff/<uuid:pk>/', views.StaffRegistrationDetailView.as_view(), name='staff_detail'),
     
@@ -42,9 +54,18 @@ urlpatterns = [
     # Bulk actions
     path('staff/bulk-verify/', views.BulkVerifyView.as_view(), name='staff_bulk_verify'),
     
+    # Antrian verifikasi (klaim per staf)
+    path('staff/queue/', views.VerificationQueueView.as_view(), name='staff_queue'),
+    path('staff/queue/next/', views.ClaimNextView.as_view(), name='staff_claim_next'),
+    path('staff/<uuid:pk>/release/', views.ReleaseClaimView.as_view(), name='staff_release_claim'),
+    
     # Export Excel
     path('staff/export/', views.ExportRegistrationsView.as_view(), name='staff_export'),
     
+    # Download dokumen (ZIP streaming)
+    path('staff/<uuid:pk>/documents.zip', views.RegistrationDocumentsZipView.as_view(), name='staff_documents_zip'),
+    path('staff/export/documents/', views.ExportDocumentsZipView.as_view(), name='staff_export_documents'),
+    
     # Delete document
     path('document/<uuid:doc_id>/delete/', views.delete_document_view, name='delete_document'),
 
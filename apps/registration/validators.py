@@ -1,7 +1,6 @@
 """
 Custom validators untuk registration & document upload.
 """
-import magic
 from django.core.exceptions import ValidationError
 from django.conf import settings
 import os
@@ -33,6 +32,25 @@ def validate_file_extension(file):
         )
 
 
+# Allowed MIME types (hasil deteksi libmagic, bukan dari browser)
+ALLOWED_MIME_TYPES = {
+    'application/pdf',
+    'image/jpeg',
+    'image/png',
+    'image/jpg',
+}
+
+# Jumlah byte awal file yang dibaca untuk deteksi MIME type
+MIME_SNIFF_SIZE = 2048
+
+
+def detect_mime_type(head):
+    """Detect MIME type dari byte awal file (libmagic, di-load saat upload pertama)"""
+    import magic
+
+    return magic.from_buffer(head[:MIME_SNIFF_SIZE], mime=True)
+
+
 def validate_file_content(file):
     """
     Validate actual file content (bukan hanya extension).
@@ -42,20 +60,12 @@ def validate_file_content(file):
     """
     # Read first chunk untuk detect MIME type
     file.seek(0)
-    file_content = file.read(2048)
+    file_content = file.read(MIME_SNIFF_SIZE)
     file.seek(0)
     
-    mime = magic.from_buffer(file_content, mime=True)
-    
-    # Allowed MIME types
-    allowed_mimes = {
-        'application/pdf',
-        'image/jpeg',
-        'image/png',
-        'image/jpg',
-    }
+    mime = detect_mime_type(file_content)
     
-    if mime not in allowed_mimes:
+    if mime not in ALLOWED_MIME_TYPES:
         raise ValidationError(
             f'Tipe file tidak valid. Detected: {mime}'
         )
@@ -2,20 +2,38 @@
 Views untuk Registration (PKBM - Final Version).
 FLOW: Create → Documents → Review → Submit → Payment
 """
+from datetime import timedelta
+from urllib.parse import urlencode
+
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
+from django.core.exceptions import ValidationError
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views import View
 from django.views.generic import DetailView, ListView
-from django.db.models import Q, Count
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q
 from django.utils import timezone
-from django.http import HttpResponse
-from django.views.decorators.http import require_POST
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, QueryDict, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_POST, require_GET
 
-from .models import StudentRegistration, Document
+from .models import RegistrationEvent, RegistrationReadModel, SavedFilter, StudentRegistration, Document
 from .forms import StudentRegistrationForm, DocumentUploadForm
-from .services import RegistrationService
+from .services import RegistrationService, DocumentSimilarityService
+from .processing import DocumentProcessingService
+from .filters import (
+    DEFAULT_SORT, REQUIRED_DOCUMENTS, annotate_registrations, filter_registrations, sort_registrations,
+)
+from .transitions import bulk_transition, record_transition
+from . import activity, history, queue, saved_filters
+from .tasks import refresh_saved_filter
+from .exports import REGISTRATION_EXPORT_HEADERS, registration_export_row, stream_documents_zip
 from apps.accounts.permissions import StaffRequiredMixin
+from apps.payments.models import Payment
+from apps.core.decorators import query_budget
+from apps.core.metrics import UPLOAD_SIZE, record_funnel
 
 import logging
 
@@ -55,6 +73,8 @@ class CreateRegistrationView(View):
                 
                 # SAVE DULU (ini yang generate registration_number)
                 registration.save()
+                record_funnel('created')
+                record_transition(registration, from_status='', source=RegistrationEvent.Source.APPLICANT)
                 
                 # SEKARANG registration_number sudah ada, BARU show message
                 messages.success(
@@ -103,6 +123,9 @@ class DocumentUploadView(View):
     
     def get(self, request, *args, **kwargs):
         form = DocumentUploadForm(registration=self.registration)
+        return self.render_form(request, form)
+    
+    def render_form(self, request, form):
         documents = self.registration.documents.all()
         
         required_docs = ['KTP', 'KK', 'AKTA']
@@ -117,22 +140,40 @@ class DocumentUploadView(View):
                 label = doc_type
             missing_doc_labels.append(label)
         
-        can_proceed = not missing_docs
+        failed_documents = [
+            doc for doc in documents
+            if doc.processing_status == Document.ProcessingStatus.FAILED
+        ]
+        can_proceed = not missing_docs and not failed_documents
         
         return render(request, self.template_name, {
             'form': form,
             'registration': self.registration,
             'documents': documents,
             'missing_documents': missing_doc_labels,
+            'failed_documents': failed_documents,
             'can_proceed': can_proceed,
+            'max_upload_size': settings.MAX_UPLOAD_SIZE,
         })
     
     def post(self, request, *args, **kwargs):
-        form = DocumentUploadForm(request.POST, request.FILES, registration=self.registration)
+        # Akses request.FILES dulu supaya upload handler sempat mencatat error
+        files = request.FILES
+        upload_error = getattr(request, 'upload_errors', {}).get('file')
+        form = DocumentUploadForm(
+            request.POST, files,
+            registration=self.registration,
+            upload_error=upload_error
+        )
         
         if form.is_valid():
             try:
                 document = form.save()
+                UPLOAD_SIZE.labels(document.document_type).observe(document.file_size)
+                
+                # Proses berat (hash, validasi mendalam, dll) jalan di background
+                DocumentProcessingService.enqueue(document)
+                
                 messages.success(request, f'Dokumen {document.get_document_type_display()} berhasil diupload.')
                 logger.info(f"Document uploaded: {document.document_type} for {self.registration.registration_number}")
                 return redirect('registration:documents', pk=self.registration.id)
@@ -140,14 +181,14 @@ class DocumentUploadView(View):
                 logger.error(f"Failed to upload document", exc_info=True)
                 messages.error(request, 'Gagal mengupload dokumen. Silakan coba lagi.')
         else:
-            messages.error(request, 'File tidak valid. Periksa kembali file Anda.')
+            file_errors = form.errors.get('file')
+            if file_errors:
+                messages.error(request, f'File tidak valid: {" ".join(file_errors)}')
+            else:
+                messages.error(request, 'File tidak valid. Periksa kembali file Anda.')
         
-        documents = self.registration.documents.all()
-        return render(request, self.template_name, {
-            'form': form,
-            'registration': self.registration,
-            'documents': documents,
-        })
+        # Render ulang form yang ter-bind supaya pilihan & error field tidak hilang
+        return self.render_form(request, form)
 
 
 class ReviewRegistrationView(View):
@@ -175,12 +216,36 @@ class ReviewRegistrationView(View):
             messages.error(request, 'Dokumen wajib belum lengkap. Silakan upload terlebih dahulu.')
             return redirect('registration:documents', pk=self.registration.id)
         
+        if documents.filter(processing_status=Document.ProcessingStatus.FAILED).exists():
+            messages.error(request, 'Ada dokumen yang gagal diproses. Silakan hapus dan upload ulang.')
+            return redirect('registration:documents', pk=self.registration.id)
+        
         return render(request, self.template_name, {
             'registration': self.registration,
             'documents': documents,
         })
 
 
+@require_GET
+def document_status_view(request, pk):
+    """Status processing dokumen (dipolling oleh halaman upload)"""
+    
+    registration = get_object_or_404(StudentRegistration, pk=pk)
+    documents = registration.documents.values('id', 'processing_status', 'processing_error')
+    
+    return JsonResponse({
+        'documents': [
+            {
+                'id': str(doc['id']),
+                'status': doc['processing_status'],
+                'label': Document.ProcessingStatus(doc['processing_status']).label,
+                'error': doc['processing_error'],
+            }
+            for doc in documents
+        ]
+    })
+
+
 @require_POST
 def submit_registration_view(request, pk):
     """Submit pendaftaran"""
@@ -205,8 +270,7 @@ def submit_registration_view(request, pk):
         pass
     
     try:
-        # DEBUG LOG
-        logger.info(f"BEFORE submit - RegID: {registration.id}, Number: '{registration.registration_number}'")
+        logger.debug("Before submit: %s, number=%r", registration.id, registration.registration_number)
         
         # Submit (generate nomor)
         RegistrationService.submit_registration(registration)
@@ -214,8 +278,7 @@ def submit_registration_view(request, pk):
         # Refresh
         registration.refresh_from_db()
         
-        # DEBUG LOG
-        logger.info(f"AFTER submit - Number: '{registration.registration_number}', Status: {registration.status}")
+        logger.debug("After submit: number=%r, status=%s", registration.registration_number, registration.status)
         
         # Verify
         if not registration.registration_number:
@@ -228,24 +291,21 @@ def submit_registration_view(request, pk):
             f'Lanjutkan ke pembayaran.'
         )
         
-        logger.info(f"SUCCESS - Redirecting to payment for: {registration.id}")
-        
         # REDIRECT KE PAYMENT
-        redirect_url = f'/payments/create/{registration.id}/'
-        logger.info(f"Redirect URL: {redirect_url}")
-        
+        logger.debug("Redirecting to payment for %s", registration.id)
         return redirect('payments:create', registration_id=registration.id)
         
     except ValueError as e:
-        logger.error(f"ValueError: {str(e)}")
+        logger.warning("Submit failed for %s: %s", registration.id, e)
         messages.error(request, str(e))
         return redirect('registration:review', pk=registration.id)
         
     except Exception as e:
-        logger.error(f"UNEXPECTED ERROR: {str(e)}", exc_info=True)
+        logger.error("Unexpected submit error for %s", registration.id, exc_info=True)
         messages.error(request, f'Terjadi kesalahan: {str(e)}')
         return redirect('registration:review', pk=registration.id)
 
+@query_budget(6)
 def check_status_view(request):
     """Cek status pendaftaran - GET & POST"""
     
@@ -289,6 +349,7 @@ def check_status_view(request):
         return render(request, 'registration/status_result.html', {
             'registration': registration,
             'payment': payment,
+            'timeline': history.timeline(registration, include_internal=False),
         })
 
 
@@ -296,40 +357,104 @@ def check_status_view(request):
 # STAFF VIEWS - Dashboard & Verification
 # ============================================
 
+@query_budget(15)
 class StaffDashboardView(LoginRequiredMixin, StaffRequiredMixin, View):
     """STAFF ONLY - Dashboard"""
     
     template_name = 'registration/staff/dashboard.html'
+    recent_paid_limit = 10
+    recent_verified_limit = 5
     
     def get(self, request):
+        # Semua angka & tabel dari read model: satu GROUP BY status, tanpa join
+        status_counts = dict(
+            RegistrationReadModel.objects.values_list('status').annotate(count=Count('pk')).order_by()
+        )
+        Status = StudentRegistration.RegistrationStatus
         stats = {
-            'total': StudentRegistration.objects.count(),
-            'draft': StudentRegistration.objects.filter(status=StudentRegistration.RegistrationStatus.DRAFT).count(),
-            'submitted': StudentRegistration.objects.filter(status=StudentRegistration.RegistrationStatus.SUBMITTED).count(),
-            'expired': StudentRegistration.objects.filter(status=StudentRegistration.RegistrationStatus.PAYMENT_EXPIRED).count(),
-            'paid': StudentRegistration.objects.filter(status=StudentRegistration.RegistrationStatus.PAID).count(),
-            'verified': StudentRegistration.objects.filter(status=StudentRegistration.RegistrationStatus.VERIFIED).count(),
-            'rejected': StudentRegistration.objects.filter(status=StudentRegistration.RegistrationStatus.REJECTED).count(),
+            'total': sum(status_counts.values()),
+            'draft': status_counts.get(Status.DRAFT, 0),
+            'submitted': status_counts.get(Status.SUBMITTED, 0),
+            'expired': status_counts.get(Status.PAYMENT_EXPIRED, 0),
+            'paid': status_counts.get(Status.PAID, 0),
+            'verified': status_counts.get(Status.VERIFIED, 0),
+            'rejected': status_counts.get(Status.REJECTED, 0),
         }
         
-        recent_paid = StudentRegistration.objects.filter(
-            status=StudentRegistration.RegistrationStatus.PAID
-        ).order_by('-submitted_at')[:10]
+        # Feed ber-cap (activity_feed), bukan ORDER BY di tabel registration
+        recent_paid = activity.recent(Status.PAID, self.recent_paid_limit)
         
-        recent_verified = StudentRegistration.objects.filter(
-            status=StudentRegistration.RegistrationStatus.VERIFIED
-        ).order_by('-verified_at')[:5]
+        recent_verified = activity.recent(Status.VERIFIED, self.recent_verified_limit)
         
-        program_stats = StudentRegistration.objects.values('program_choice').annotate(count=Count('id')).order_by('-count')
+        program_stats = RegistrationReadModel.objects.values('program_choice').annotate(count=Count('pk')).order_by('-count')
         
         return render(request, self.template_name, {
             'stats': stats,
             'recent_paid': recent_paid,
             'recent_verified': recent_verified,
             'program_stats': program_stats,
+            'activity_after': activity.latest_id(),
+            'recent_paid_limit': self.recent_paid_limit,
+            'recent_verified_limit': self.recent_verified_limit,
+        })
+
+
+@query_budget(4)
+class ActivityFeedView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """STAFF ONLY - Entry feed aktivitas baru sejak ?after=<id> (polling dashboard)"""
+    
+    def get(self, request):
+        try:
+            after = int(request.GET.get('after', 0))
+        except ValueError:
+            after = 0
+        
+        entries = [
+            {
+                'id': entry.id,
+                'kind': entry.kind,
+                'registration_number': entry.registration_number,
+                'full_name': entry.full_name,
+                'program': entry.get_program_choice_display(),
+                'at': timezone.localtime(entry.created_at).strftime('%d/%m/%Y %H:%M'),
+                'url': reverse('registration:staff_detail', args=[entry.registration_id]),
+            }
+            for entry in activity.since(after)
+        ]
+        
+        return JsonResponse({
+            'entries': entries,
+            'last_id': entries[-1]['id'] if entries else after,
+        })
+
+
+class StatusDurationReportView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """STAFF ONLY - Lama waktu di tiap status (dari RegistrationEvent)"""
+    
+    template_name = 'registration/staff/status_duration.html'
+    windows = [7, 30, 90]
+    
+    def get(self, request):
+        try:
+            days = int(request.GET.get('days', 0))
+        except ValueError:
+            days = 0
+        since = timezone.now() - timedelta(days=days) if days > 0 else None
+        
+        rows = history.time_in_status(since=since)
+        for row in rows:
+            for key in ('avg_seconds', 'median_seconds', 'max_seconds', 'current_avg_seconds'):
+                value = row[key]
+                row[key.replace('seconds', 'hours')] = value / 3600 if value is not None else None
+        
+        return render(request, self.template_name, {
+            'rows': rows,
+            'days': days,
+            'windows': self.windows,
         })
 
 
+@query_budget(8)
 class RegistrationListView(LoginRequiredMixin, StaffRequiredMixin, ListView):
     """STAFF ONLY - List pendaftaran"""
     
@@ -338,40 +463,108 @@ class RegistrationListView(LoginRequiredMixin, StaffRequiredMixin, ListView):
     context_object_name = 'registrations'
     paginate_by = 20
     
+    def get(self, request, *args, **kwargs):
+        self.saved_filter = self._get_saved_filter()
+        # Filter tersimpan: parameter dari filter, bukan query string
+        self.filter_params = self.saved_filter.params if self.saved_filter else request.GET
+        return super().get(request, *args, **kwargs)
+    
+    def _get_saved_filter(self):
+        saved_id = self.request.GET.get('saved')
+        if not saved_id:
+            return None
+        try:
+            return saved_filters.visible_to(self.request.user).get(pk=saved_id)
+        except (SavedFilter.DoesNotExist, ValidationError):
+            return None
+    
     def get_queryset(self):
-        queryset = StudentRegistration.objects.select_related('verified_by').prefetch_related('documents').order_by('-created_at')
-        
-        status = self.request.GET.get('status')
-        if status:
-            queryset = queryset.filter(status=status)
-        
-        program = self.request.GET.get('program')
-        if program:
-            queryset = queryset.filter(program_choice=program)
-        
-        search = self.request.GET.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(registration_number__icontains=search) |
-                Q(full_name__icontains=search) |
-                Q(nik__icontains=search) |
-                Q(nisn__icontains=search) |
-                Q(contact_email__icontains=search) |
-                Q(contact_phone__icontains=search)
-            )
-        
-        return queryset
+        if self.saved_filter is not None and self.saved_filter.has_snapshot:
+            # Snapshot: join index (saved_filter, position), tanpa scan filter
+            queryset = saved_filters.snapshot_queryset(self.saved_filter)
+            return annotate_registrations(queryset.select_related('verified_by', 'claimed_by'))
+        
+        # doc_count & payment_status dari read model, bukan prefetch dokumen per halaman
+        queryset = annotate_registrations(
+            StudentRegistration.objects.select_related('verified_by', 'claimed_by')
+        )
+        queryset = filter_registrations(queryset, self.filter_params)
+        return sort_registrations(queryset, self.filter_params)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        params = self.filter_params
+        context['saved_filter'] = self.saved_filter
+        context['saved_filters'] = saved_filters.visible_to(self.request.user).only(
+            'id', 'name', 'is_materialized', 'is_shared', 'owner_id'
+        )
         context['status_choices'] = StudentRegistration.RegistrationStatus.choices
         context['program_choices'] = StudentRegistration.ProgramChoice.choices
-        context['current_status'] = self.request.GET.get('status', '')
-        context['current_program'] = self.request.GET.get('program', '')
-        context['search_query'] = self.request.GET.get('search', '')
+        context['payment_choices'] = Payment.PaymentStatus.choices
+        context['required_documents'] = [(doc, Document.DocumentType(doc).label) for doc in REQUIRED_DOCUMENTS]
+        context['required_count'] = len(REQUIRED_DOCUMENTS)
+        context['current_status'] = params.get('status', '')
+        context['current_program'] = params.get('program', '')
+        context['current_documents'] = params.get('documents', '')
+        context['current_missing'] = params.get('missing', '')
+        context['current_payment'] = params.get('payment', '')
+        context['current_submitted_days'] = params.get('submitted_days', '')
+        context['current_sort'] = params.get('sort', DEFAULT_SORT)
+        context['search_query'] = params.get('search', '')
+        
+        # Query string filter tanpa page, untuk link pagination
+        query = self.request.GET.copy()
+        query.pop('page', None)
+        context['filter_query'] = query.urlencode()
+        context['save_query'] = urlencode(saved_filters.clean_params(params))
         return context
 
 
+class SavedFilterCreateView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """STAFF ONLY - Simpan filter list saat ini"""
+    
+    def post(self, request):
+        name = request.POST.get('name', '').strip()
+        params = saved_filters.clean_params(QueryDict(request.POST.get('query', '')))
+        if not name:
+            messages.error(request, 'Nama filter wajib diisi.')
+            return redirect(f"{reverse('registration:staff_list')}?{urlencode(params)}")
+        
+        saved_filter = SavedFilter.objects.create(
+            name=name[:100],
+            params=params,
+            owner=request.user,
+            is_shared=bool(request.POST.get('is_shared')),
+            is_materialized=bool(request.POST.get('is_materialized')),
+        )
+        if saved_filter.is_materialized:
+            transaction.on_commit(lambda: refresh_saved_filter.delay(str(saved_filter.pk)))
+        
+        messages.success(request, f'Filter "{saved_filter.name}" disimpan.')
+        return redirect(f"{reverse('registration:staff_list')}?saved={saved_filter.pk}")
+
+
+class SavedFilterRefreshView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """STAFF ONLY - Refresh snapshot filter tersimpan (di background)"""
+    
+    def post(self, request, pk):
+        saved_filter = get_object_or_404(saved_filters.visible_to(request.user), pk=pk, is_materialized=True)
+        transaction.on_commit(lambda: refresh_saved_filter.delay(str(saved_filter.pk)))
+        messages.info(request, f'Snapshot "{saved_filter.name}" sedang di-refresh.')
+        return redirect(f"{reverse('registration:staff_list')}?saved={saved_filter.pk}")
+
+
+class SavedFilterDeleteView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """STAFF ONLY - Hapus filter tersimpan (hanya pemilik)"""
+    
+    def post(self, request, pk):
+        saved_filter = get_object_or_404(SavedFilter, pk=pk, owner=request.user)
+        saved_filter.delete()
+        messages.info(request, f'Filter "{saved_filter.name}" dihapus.')
+        return redirect('registration:staff_list')
+
+
+@query_budget(10)
 class StaffRegistrationDetailView(LoginRequiredMixin, StaffRequiredMixin, DetailView):
     """STAFF ONLY - Detail pendaftaran"""
     
@@ -379,23 +572,70 @@ class StaffRegistrationDetailView(LoginRequiredMixin, StaffRequiredMixin, Detail
     template_name = 'registration/staff/detail.html'
     context_object_name = 'registration'
     
+    def get_queryset(self):
+        """Registration + payment + staf dalam satu query; dokumen & riwayat di-prefetch"""
+        return StudentRegistration.objects.select_related(
+            'payment', 'verified_by', 'claimed_by'
+        ).prefetch_related(
+            Prefetch('documents', queryset=Document.objects.select_related('verified_by').order_by('document_type')),
+            Prefetch('events', queryset=history.timeline_queryset(), to_attr='timeline'),
+        )
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
         registration = self.object
-        context['documents'] = registration.documents.all()
+        documents = list(registration.documents.all())
+        context['documents'] = documents
         
-        required_docs = ['KTP', 'KK', 'AKTA']
-        uploaded_types = set(registration.documents.values_list('document_type', flat=True))
-        missing_docs = set(required_docs) - uploaded_types
+        uploaded_types = {doc.document_type for doc in documents}
+        missing_docs = [doc for doc in REQUIRED_DOCUMENTS if doc not in uploaded_types]
         
         context['missing_documents'] = [Document.DocumentType(doc).label for doc in missing_docs]
         context['documents_complete'] = not missing_docs
         
-        if hasattr(registration, 'payment'):
-            context['payment'] = registration.payment
+        # Dokumen mirip di pendaftaran lain (indikasi identitas dipakai ulang)
+        similar = DocumentSimilarityService.find_similar_many(documents)
+        context['similar_documents'] = [
+            {'document': doc, 'match': match, 'distance': distance}
+            for doc in documents
+            for distance, match in similar.get(doc.pk, [])
+        ]
+        
+        # select_related: tanpa payment -> None, tanpa query tambahan
+        context['payment'] = getattr(registration, 'payment', None)
+        context['timeline'] = registration.timeline
+        context['previous_paid'], context['next_paid'] = self._paid_neighbors(registration)
+        context['claimed_by_other'] = registration.is_claimed_by_other(self.request.user)
+        context['claimed_by_me'] = (
+            registration.claimed_by_id == self.request.user.pk
+            and registration.claim_expires_at > timezone.now()
+        )
         
         return context
+    
+    @staticmethod
+    def _paid_neighbors(registration):
+        """
+        Pendaftaran PAID sebelum/sesudah ini dalam urutan antrian
+        (submitted_at, id). Keyset: WHERE (submitted_at, id) < / > nilai saat ini
+        + LIMIT 1 lewat index (status, submitted_at), tanpa OFFSET.
+        """
+        if registration.submitted_at is None:
+            return None, None
+        
+        paid = StudentRegistration.objects.filter(
+            status=StudentRegistration.RegistrationStatus.PAID
+        ).only('id', 'registration_number')
+        at, pk = registration.submitted_at, registration.pk
+        
+        previous = paid.filter(
+            Q(submitted_at__lt=at) | Q(submitted_at=at, pk__lt=pk)
+        ).order_by('-submitted_at', '-pk').first()
+        following = paid.filter(
+            Q(submitted_at__gt=at) | Q(submitted_at=at, pk__gt=pk)
+        ).order_by('submitted_at', 'pk').first()
+        return previous, following
 
 
 class VerifyRegistrationView(LoginRequiredMixin, StaffRequiredMixin, View):
@@ -412,46 +652,67 @@ class VerifyRegistrationView(LoginRequiredMixin, StaffRequiredMixin, View):
             )
             return redirect('registration:staff_detail', pk=registration.id)
         
+        if registration.is_claimed_by_other(request.user):
+            messages.error(
+                request,
+                f'Pendaftaran sedang diperiksa {registration.claimed_by.full_name or registration.claimed_by.email} '
+                f'sampai {timezone.localtime(registration.claim_expires_at):%H:%M}.'
+            )
+            return redirect('registration:staff_detail', pk=registration.id)
+        
         action = request.POST.get('action')
         notes = request.POST.get('verification_notes', '').strip()
         
+        if action == 'approve':
+            to_status = StudentRegistration.RegistrationStatus.VERIFIED
+            notes = notes or 'Pendaftaran disetujui'
+        elif action == 'reject':
+            if not notes:
+                messages.error(request, 'Alasan penolakan wajib diisi.')
+                return redirect('registration:staff_detail', pk=registration.id)
+            to_status = StudentRegistration.RegistrationStatus.REJECTED
+        else:
+            messages.error(request, 'Aksi tidak valid.')
+            return redirect('registration:staff_detail', pk=registration.id)
+        
         try:
-            if action == 'approve':
-                registration.status = StudentRegistration.RegistrationStatus.VERIFIED
-                registration.verified_at = timezone.now()
-                registration.verified_by = request.user
-                registration.verification_notes = notes or 'Pendaftaran disetujui'
-                registration.save()
-                
-                messages.success(request, f'Pendaftaran {registration.registration_number} DISETUJUI.')
-                logger.info(f"Registration APPROVED: {registration.registration_number} by {request.user}")
-                
-            elif action == 'reject':
-                if not notes:
-                    messages.error(request, 'Alasan penolakan wajib diisi.')
-                    return redirect('registration:staff_detail', pk=registration.id)
-                
-                registration.status = StudentRegistration.RegistrationStatus.REJECTED
-                registration.verified_at = timezone.now()
-                registration.verified_by = request.user
-                registration.verification_notes = notes
-                registration.save()
-                
-                messages.warning(request, f'Pendaftaran {registration.registration_number} DITOLAK.')
-                logger.info(f"Registration REJECTED: {registration.registration_number} by {request.user}")
-            
-            else:
-                messages.error(request, 'Aksi tidak valid.')
-            
+            # Transisi bersyarat (status masih PAID): dua staf yang memverifikasi
+            # bersamaan tidak saling menimpa
+            result = bulk_transition(
+                [registration.pk],
+                from_status=StudentRegistration.RegistrationStatus.PAID,
+                to_status=to_status,
+                actor=request.user,
+                notes=notes,
+                source=RegistrationEvent.Source.SINGLE,
+                verified_at=timezone.now(),
+                verified_by=request.user,
+                verification_notes=notes,
+                claimed_by=None,
+                claimed_at=None,
+            )
         except Exception as e:
             logger.error(f"Verification error: {str(e)}", exc_info=True)
             messages.error(request, f'Gagal memverifikasi: {str(e)}')
+            return redirect('registration:staff_detail', pk=registration.id)
+        
+        if not result.count:
+            messages.warning(request, 'Pendaftaran sudah diproses staf lain.')
+        elif action == 'approve':
+            messages.success(request, f'Pendaftaran {registration.registration_number} DISETUJUI.')
+            logger.info(f"Registration APPROVED: {registration.registration_number} by {request.user}")
+        else:
+            messages.warning(request, f'Pendaftaran {registration.registration_number} DITOLAK.')
+            logger.info(f"Registration REJECTED: {registration.registration_number} by {request.user}")
+        
+        if result.count and request.POST.get('next') == 'queue':
+            return ClaimNextView.claim_and_redirect(request)
         
         return redirect('registration:staff_detail', pk=registration.id)
 
 
 class BulkVerifyView(LoginRequiredMixin, StaffRequiredMixin, View):
-    """STAFF ONLY - Bulk approve/reject"""
+    """STAFF ONLY - Bulk approve/reject (lihat transitions.bulk_transition)"""
     
     def post(self, request):
         action = request.POST.get('action')
@@ -461,48 +722,117 @@ class BulkVerifyView(LoginRequiredMixin, StaffRequiredMixin, View):
             messages.error(request, 'Pilih minimal 1 pendaftaran.')
             return redirect('registration:staff_list')
         
+        if action == 'bulk_approve':
+            to_status = StudentRegistration.RegistrationStatus.VERIFIED
+            notes = 'Bulk approval'
+        elif action == 'bulk_reject':
+            to_status = StudentRegistration.RegistrationStatus.REJECTED
+            notes = request.POST.get('bulk_notes', '').strip()
+            if not notes:
+                messages.error(request, 'Alasan penolakan wajib diisi untuk bulk reject.')
+                return redirect('registration:staff_list')
+        else:
+            messages.error(request, 'Aksi tidak valid.')
+            return redirect('registration:staff_list')
+        
         try:
-            registrations = StudentRegistration.objects.filter(
-                id__in=registration_ids,
-                status=StudentRegistration.RegistrationStatus.PAID
+            # Pendaftaran yang sedang diperiksa staf lain tidak ikut diproses
+            blocked = queue.claimed_by_others(registration_ids, request.user)
+            result = bulk_transition(
+                [pk for pk in registration_ids if StudentRegistration._meta.pk.to_python(pk) not in blocked],
+                from_status=StudentRegistration.RegistrationStatus.PAID,
+                to_status=to_status,
+                actor=request.user,
+                notes=notes,
+                verified_at=timezone.now(),
+                verified_by=request.user,
+                verification_notes=notes,
+                claimed_by=None,
+                claimed_at=None,
             )
-            
-            count = registrations.count()
-            
-            if action == 'bulk_approve':
-                registrations.update(
-                    status=StudentRegistration.RegistrationStatus.VERIFIED,
-                    verified_at=timezone.now(),
-                    verified_by=request.user,
-                    verification_notes='Bulk approval'
-                )
-                
-                messages.success(request, f'{count} pendaftaran berhasil disetujui.')
-                logger.info(f"Bulk approved {count} registrations by {request.user}")
-                
-            elif action == 'bulk_reject':
-                notes = request.POST.get('bulk_notes', '').strip()
-                if not notes:
-                    messages.error(request, 'Alasan penolakan wajib diisi untuk bulk reject.')
-                    return redirect('registration:staff_list')
-                
-                registrations.update(
-                    status=StudentRegistration.RegistrationStatus.REJECTED,
-                    verified_at=timezone.now(),
-                    verified_by=request.user,
-                    verification_notes=notes
-                )
-                
-                messages.warning(request, f'{count} pendaftaran berhasil ditolak.')
-                logger.info(f"Bulk rejected {count} registrations by {request.user}")
-            
+        except ValidationError:
+            messages.error(request, 'Pilihan pendaftaran tidak valid.')
+            return redirect('registration:staff_list')
         except Exception as e:
-            logger.error(f"Bulk verification error: {str(e)}", exc_info=True)
+            logger.error("Bulk verification error: %s", e, exc_info=True)
             messages.error(request, f'Gagal: {str(e)}')
+            return redirect('registration:staff_list')
+        
+        if action == 'bulk_approve':
+            messages.success(request, f'{result.count} pendaftaran berhasil disetujui.')
+        else:
+            messages.warning(request, f'{result.count} pendaftaran berhasil ditolak.')
+        
+        if result.skipped:
+            messages.info(
+                request,
+                f'{result.skipped} pendaftaran dilewati (bukan status PAID atau sedang diproses staf lain).'
+            )
+        if blocked:
+            messages.info(request, f'{len(blocked)} pendaftaran dilewati karena sedang diklaim staf lain.')
         
         return redirect('registration:staff_list')
 
 
+class ClaimNextView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """STAFF ONLY - Ambil pendaftaran PAID berikutnya dari antrian verifikasi"""
+    
+    def post(self, request):
+        return self.claim_and_redirect(request)
+    
+    @staticmethod
+    def claim_and_redirect(request):
+        registration = queue.claim_next(request.user)
+        if registration is None:
+            messages.info(request, 'Antrian verifikasi kosong.')
+            return redirect('registration:staff_queue')
+        
+        messages.info(
+            request,
+            f'{registration.registration_number} diklaim untuk Anda sampai '
+            f'{timezone.localtime(registration.claim_expires_at):%H:%M}.'
+        )
+        return redirect('registration:staff_detail', pk=registration.id)
+
+
+class ReleaseClaimView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """STAFF ONLY - Lepas klaim (kembali ke antrian)"""
+    
+    def post(self, request, pk):
+        registration = get_object_or_404(StudentRegistration, pk=pk)
+        if queue.release(registration, request.user):
+            messages.info(request, f'Klaim {registration.registration_number} dilepas.')
+        return redirect('registration:staff_queue')
+
+
+class VerificationQueueView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """STAFF ONLY - Antrian verifikasi & statistik reviewer"""
+    
+    template_name = 'registration/staff/queue.html'
+    windows = [1, 7, 30]
+    
+    def get(self, request):
+        try:
+            days = int(request.GET.get('days', 1))
+        except ValueError:
+            days = 1
+        if days not in self.windows:
+            days = 1
+        
+        now = timezone.now()
+        return render(request, self.template_name, {
+            'pending_count': queue.pending_queue(now).count(),
+            'oldest': queue.pending_queue(now).only('registration_number', 'full_name', 'submitted_at').first(),
+            'claims': queue.active_claims(now).select_related('claimed_by').only(
+                'registration_number', 'full_name', 'claimed_at', 'claimed_by__full_name', 'claimed_by__email'
+            ).order_by('claimed_at'),
+            'reviewers': queue.reviewer_stats(now - timedelta(days=days)),
+            'days': days,
+            'windows': self.windows,
+            'claim_minutes': settings.VERIFICATION_CLAIM_MINUTES,
+        })
+
+
 class ExportRegistrationsView(LoginRequiredMixin, StaffRequiredMixin, View):
     """STAFF ONLY - Export Excel"""
     
@@ -517,50 +847,18 @@ class ExportRegistrationsView(LoginRequiredMixin, StaffRequiredMixin, View):
         header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
         header_font = Font(bold=True, color="FFFFFF")
         
-        headers = [
-            'No', 'Nomor Pendaftaran', 'Nama Lengkap', 'NIK', 'NISN',
-            'Tempat Lahir', 'Tanggal Lahir', 'Jenis Kelamin', 'Agama',
-            'Email', 'No. HP', 'Program', 'Status',
-            'Nama Ayah', 'Pekerjaan Ayah', 'Nama Ibu', 'Pekerjaan Ibu',
-            'Alamat', 'Kota', 'Provinsi',
-            'Tanggal Daftar', 'Tanggal Submit', 'Tanggal Verifikasi'
-        ]
-        
-        for col, header in enumerate(headers, start=1):
+        for col, header in enumerate(REGISTRATION_EXPORT_HEADERS, start=1):
             cell = ws.cell(row=1, column=col, value=header)
             cell.fill = header_fill
             cell.font = header_font
         
-        status_filter = request.GET.get('status')
-        registrations = StudentRegistration.objects.all().order_by('-created_at')
-        
-        if status_filter:
-            registrations = registrations.filter(status=status_filter)
-        
-        for idx, reg in enumerate(registrations, start=2):
-            ws.cell(row=idx, column=1, value=idx-1)
-            ws.cell(row=idx, column=2, value=reg.registration_number)
-            ws.cell(row=idx, column=3, value=reg.full_name)
-            ws.cell(row=idx, column=4, value=reg.nik)
-            ws.cell(row=idx, column=5, value=reg.nisn or '-')
-            ws.cell(row=idx, column=6, value=reg.birth_place)
-            ws.cell(row=idx, column=7, value=reg.birth_date.strftime('%d/%m/%Y'))
-            ws.cell(row=idx, column=8, value=reg.get_gender_display())
-            ws.cell(row=idx, column=9, value=reg.get_religion_display())
-            ws.cell(row=idx, column=10, value=reg.contact_email)
-            ws.cell(row=idx, column=11, value=reg.contact_phone)
-            ws.cell(row=idx, column=12, value=reg.get_program_choice_display())
-            ws.cell(row=idx, column=13, value=reg.get_status_display())
-            ws.cell(row=idx, column=14, value=reg.father_name)
-            ws.cell(row=idx, column=15, value=reg.father_occupation)
-            ws.cell(row=idx, column=16, value=reg.mother_name)
-            ws.cell(row=idx, column=17, value=reg.mother_occupation)
-            ws.cell(row=idx, column=18, value=reg.address)
-            ws.cell(row=idx, column=19, value=reg.city)
-            ws.cell(row=idx, column=20, value=reg.province)
-            ws.cell(row=idx, column=21, value=reg.created_at.strftime('%d/%m/%Y %H:%M'))
-            ws.cell(row=idx, column=22, value=reg.submitted_at.strftime('%d/%m/%Y %H:%M') if reg.submitted_at else '-')
-            ws.cell(row=idx, column=23, value=reg.verified_at.strftime('%d/%m/%Y %H:%M') if reg.verified_at else '-')
+        # Filter sama dengan list staff (status, dokumen, pembayaran, ...)
+        registrations = filter_registrations(
+            StudentRegistration.objects.all().order_by('-created_at'), request.GET
+        )
+        
+        for idx, reg in enumerate(registrations, start=1):
+            ws.append(registration_export_row(idx, reg))
         
         response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
         filename = f"Pendaftaran_PPDB_{timezone.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
@@ -571,6 +869,46 @@ class ExportRegistrationsView(LoginRequiredMixin, StaffRequiredMixin, View):
         
         return response
     
+class _DocumentsZipMixin:
+    """Response ZIP streaming untuk queryset Document"""
+    
+    def zip_response(self, documents, filename):
+        documents = documents.select_related('registration').order_by(
+            'registration__registration_number', 'document_type'
+        )
+        response = StreamingHttpResponse(
+            stream_documents_zip(documents.iterator(chunk_size=500)),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class RegistrationDocumentsZipView(LoginRequiredMixin, StaffRequiredMixin, _DocumentsZipMixin, View):
+    """STAFF ONLY - Download semua dokumen satu pendaftaran (ZIP)"""
+    
+    def get(self, request, pk):
+        registration = get_object_or_404(StudentRegistration, pk=pk)
+        filename = f"Dokumen_{registration.registration_number or registration.id}.zip"
+        
+        logger.info("Documents ZIP for %s downloaded by %s", registration.registration_number, request.user)
+        
+        return self.zip_response(registration.documents.all(), filename)
+
+
+class ExportDocumentsZipView(LoginRequiredMixin, StaffRequiredMixin, _DocumentsZipMixin, View):
+    """STAFF ONLY - Download dokumen semua pendaftaran sesuai filter list (ZIP)"""
+    
+    def get(self, request):
+        registrations = filter_registrations(StudentRegistration.objects.all(), request.GET)
+        documents = Document.objects.filter(registration__in=registrations.values('id'))
+        filename = f"Dokumen_PPDB_{timezone.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        
+        logger.info("Documents ZIP export by %s (filter: %s)", request.user, request.GET.urlencode())
+        
+        return self.zip_response(documents, filename)
+
+
 @require_POST
 def delete_document_view(request, doc_id):
     """Hapus dokumen yang sudah diupload"""
@@ -0,0 +1,5 @@
+# Pastikan Celery app ter-load saat Django start,
+# supaya @shared_task memakai konfigurasi dari config/celery.py
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
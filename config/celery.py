@@ -27,6 +27,26 @@ app.conf.beat_schedule = {
         'task': 'apps.payments.tasks.expire_unpaid_payments',
         'schedule': 3600.0,  # Every hour
     },
+    'sample-queue-depth': {
+        'task': 'apps.core.tasks.sample_queue_depth',
+        'schedule': 60.0,  # Every minute
+    },
+    'prune-request-profiles': {
+        'task': 'apps.core.tasks.prune_request_profiles',
+        'schedule': 600.0,  # Every 10 minutes
+    },
+    'refresh-saved-filters': {
+        'task': 'apps.registration.tasks.refresh_saved_filters',
+        'schedule': 300.0,  # Every 5 minutes (interval per filter: refresh_minutes)
+    },
+    'repair-read-model': {
+        'task': 'apps.registration.tasks.repair_read_model',
+        'schedule': 300.0,  # Every 5 minutes
+    },
+    'trim-activity-feed': {
+        'task': 'apps.registration.tasks.trim_activity_feed',
+        'schedule': 60.0,  # Every minute
+    },
 }
 
 app.conf.timezone = 'Asia/Jakarta'
\ No newline at end of file
@@ -3,6 +3,7 @@ Django settings untuk PPDB System.
 Settings ini adalah base configuration yang digunakan development & production.
 """
 import os
+import sys
 from pathlib import Path
 from decouple import config, Csv
 from decimal import Decimal
@@ -15,6 +16,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 # =============================================================================
 SECRET_KEY = config('DJANGO_SECRET_KEY')
 DEBUG = config('DJANGO_DEBUG', default=False, cast=bool)
+
+# `manage.py test`: query budget aktif & melempar QueryBudgetExceeded
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
 ALLOWED_HOSTS = config('DJANGO_ALLOWED_HOSTS', cast=Csv())
 
 # =============================================================================
@@ -38,14 +42,20 @@ INSTALLED_APPS = [
     'apps.accounts',
     'apps.registration',
     'apps.payments',
+    'apps.core',
 ]
 
 MIDDLEWARE = [
+    'log_request_id.middleware.RequestIDMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.middleware.MetricsMiddleware',
+    'apps.core.middleware.QueryBudgetMiddleware',
+    'apps.core.middleware.SlowQueryMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -131,6 +141,8 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 
 MEDIA_URL = config('MEDIA_URL', default='/media/')
 MEDIA_ROOT = config('MEDIA_ROOT', default=BASE_DIR / 'media')
+# File internal (profil request) di luar MEDIA_ROOT: tidak punya URL publik
+PRIVATE_MEDIA_ROOT = config('PRIVATE_MEDIA_ROOT', default=BASE_DIR / 'private_media')
 
 # =============================================================================
 # FILE UPLOAD SETTINGS (CRITICAL UNTUK KEAMANAN)
@@ -146,9 +158,83 @@ ALLOWED_DOCUMENT_TYPES = config(
 )
 
 # File validation
-FILE_UPLOAD_MAX_MEMORY_SIZE = MAX_UPLOAD_SIZE
+# ValidatingUploadHandler menolak file saat transfer (extension, ukuran,
+# MIME type dari chunk pertama). File valid di atas 256 KB di-spool ke
+# temporary file, tidak di-buffer di RAM.
+FILE_UPLOAD_HANDLERS = [
+    'apps.registration.upload_handlers.ValidatingUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+FILE_UPLOAD_MAX_MEMORY_SIZE = config('FILE_UPLOAD_MAX_MEMORY_SIZE', default=262144, cast=int)
 DATA_UPLOAD_MAX_MEMORY_SIZE = MAX_UPLOAD_SIZE * 2
 
+# Preview dokumen untuk halaman verifikasi (sisi terpanjang, pixel)
+DOCUMENT_PREVIEW_MAX_SIZE = config('DOCUMENT_PREVIEW_MAX_SIZE', default=800, cast=int)
+
+# Jarak Hamming maksimal (dari 64 bit) untuk dianggap dokumen mirip
+DOCUMENT_PHASH_MAX_DISTANCE = config('DOCUMENT_PHASH_MAX_DISTANCE', default=8, cast=int)
+# Kandidat band-match maksimal yang dibaca per pencarian (scan KTP bertemplat
+# bisa cocok dengan ribuan baris); yang terbaru diutamakan
+DOCUMENT_PHASH_MAX_CANDIDATES = config('DOCUMENT_PHASH_MAX_CANDIDATES', default=500, cast=int)
+
+# =============================================================================
+# QUERY BUDGET (Deteksi N+1)
+# =============================================================================
+# Hitung query & waktu DB per request, tandai SQL yang berulang.
+# Aktifkan di development/staging; saat `manage.py test` (TESTING) view yang
+# melebihi @query_budget langsung gagal (QueryBudgetExceeded), bukan hanya log.
+QUERY_BUDGET_ENABLED = config('QUERY_BUDGET_ENABLED', default=DEBUG or TESTING, cast=bool)
+QUERY_BUDGET_HEADERS = config('QUERY_BUDGET_HEADERS', default=True, cast=bool)
+QUERY_BUDGET_RAISE = config('QUERY_BUDGET_RAISE', default=TESTING, cast=bool)
+QUERY_BUDGET_DEFAULT = config('QUERY_BUDGET_DEFAULT', default=None, cast=lambda v: int(v) if v else None)
+QUERY_BUDGET_DUPLICATE_THRESHOLD = config('QUERY_BUDGET_DUPLICATE_THRESHOLD', default=3, cast=int)
+
+# =============================================================================
+# SLOW QUERY LOG
+# =============================================================================
+# Query >= threshold dicatat per fingerprint (halaman staff /monitoring/slow-queries/).
+# EXPLAIN_RATE > 0 menjalankan ulang query dengan EXPLAIN (ANALYZE, BUFFERS):
+# hanya untuk staging, biarkan 0 di production.
+SLOW_QUERY_LOG_ENABLED = config('SLOW_QUERY_LOG_ENABLED', default=True, cast=bool)
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=200, cast=int)
+SLOW_QUERY_EXPLAIN_RATE = config('SLOW_QUERY_EXPLAIN_RATE', default=0.0, cast=float)
+
+# =============================================================================
+# METRICS (Prometheus)
+# =============================================================================
+# Endpoint /metrics; di luar DEBUG wajib "Authorization: Bearer <METRICS_TOKEN>".
+# Multi worker gunicorn: set env PROMETHEUS_MULTIPROC_DIR (lihat gunicorn.conf.py).
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# =============================================================================
+# PROFILING (opt-in per request)
+# =============================================================================
+# Trigger: header X-Profile (staff / X-Profile-Token), toggle staff di
+# /monitoring/profiles/, atau sampling acak (0.0 - 1.0, mode sampling).
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=True, cast=bool)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_TOKEN = config('PROFILING_TOKEN', default='')
+PROFILING_SAMPLE_INTERVAL_MS = config('PROFILING_SAMPLE_INTERVAL_MS', default=5, cast=float)
+# Profil (baris + file di PRIVATE_MEDIA_ROOT/profiles/) lebih lama dari ini dihapus task prune_request_profiles
+PROFILING_RETENTION_DAYS = config('PROFILING_RETENTION_DAYS', default=7, cast=int)
+
+# =============================================================================
+# CELERY (Background Tasks)
+# =============================================================================
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # Task dokumen berat, jangan ditimbun satu worker
+
+# Monitoring task (halaman staff /monitoring/tasks/): queue yang di-probe beat
+# & retensi data TaskRun / QueueDepthSample
+CELERY_MONITORED_QUEUES = config('CELERY_MONITORED_QUEUES', default='celery', cast=Csv())
+CELERY_MONITOR_RETENTION_DAYS = config('CELERY_MONITOR_RETENTION_DAYS', default=7, cast=int)
+
 # =============================================================================
 # CRISPY FORMS
 # =============================================================================
@@ -171,32 +257,83 @@ REGISTRATION_FEE = config('REGISTRATION_FEE', default=500000, cast=Decimal)
 # PAYMENT_EXPIRY_HOURS = config('PAYMENT_EXPIRY_HOURS', default=24, cast=int)
 PAYMENT_MERCHANT_NAME = config('PAYMENT_MERCHANT_NAME', default='Yayasan Pendidikan')
 
+# =============================================================================
+# VERIFICATION QUEUE
+# =============================================================================
+# Klaim "ambil berikutnya" mengunci pendaftaran PAID untuk satu staf selama
+# N menit; setelah itu staf lain bisa mengambilnya lagi.
+VERIFICATION_CLAIM_MINUTES = config('VERIFICATION_CLAIM_MINUTES', default=15, cast=int)
+
+# Feed aktivitas dashboard staff: baris yang disimpan per jenis (PAID / VERIFIED)
+ACTIVITY_FEED_SIZE = config('ACTIVITY_FEED_SIZE', default=50, cast=int)
+
+# =============================================================================
+# EMAIL
+# =============================================================================
+# Default console: email dicetak ke log worker sampai SMTP dikonfigurasi
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='PPDB <noreply@localhost>')
+
+# =============================================================================
+# ADMIN JOBS
+# =============================================================================
+# Aksi massal admin dijalankan di Celery per chunk N baris (lihat apps.core.admin_jobs)
+ADMIN_JOB_CHUNK_SIZE = config('ADMIN_JOB_CHUNK_SIZE', default=500, cast=int)
+
 # =============================================================================
 # LOGGING CONFIGURATION
 # =============================================================================
 LOG_LEVEL = config('LOG_LEVEL', default='INFO')
 LOG_DIR = BASE_DIR / 'logs'
 
+# Format file log: 'json' (satu baris per record, untuk aggregator) atau 'verbose'
+LOG_FORMAT = config('LOG_FORMAT', default='json')
+
+# Porsi record DEBUG yang ditulis saat LOG_LEVEL=DEBUG (trace di hot path)
+LOG_DEBUG_SAMPLE_RATE = config('LOG_DEBUG_SAMPLE_RATE', default=0.01, cast=float)
+
+# Request ID (django-log-request-id): pakai X-Request-ID dari proxy jika ada
+LOG_REQUEST_ID_HEADER = 'HTTP_X_REQUEST_ID'
+GENERATE_REQUEST_ID_IF_NOT_IN_HEADER = True
+REQUEST_ID_RESPONSE_HEADER = 'X-Request-ID'
+
 # Create logs directory if not exists
 LOG_DIR.mkdir(exist_ok=True)
 
+# Semua logger menulis lewat handler queue_*: request thread hanya enqueue,
+# format & I/O file dikerjakan thread QueueListener (apps.core.log).
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
         'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
+            'format': '{levelname} {asctime} {module} {process:d} {thread:d} [{request_id}] {message}',
             'style': '{',
         },
         'simple': {
-            'format': '{levelname} {asctime} {message}',
+            'format': '{levelname} {asctime} [{request_id}] {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'apps.core.log.JsonFormatter',
+        },
     },
     'filters': {
         'require_debug_false': {
             '()': 'django.utils.log.RequireDebugFalse',
         },
+        'request_id': {
+            '()': 'log_request_id.filters.RequestIDFilter',
+        },
+        'sample_debug': {
+            '()': 'apps.core.log.DebugSampleFilter',
+            'rate': LOG_DEBUG_SAMPLE_RATE,
+        },
     },
     'handlers': {
         'console': {
@@ -205,20 +342,20 @@ LOGGING = {
             'formatter': 'simple',
         },
         'file_general': {
-            'level': 'INFO',
+            'level': 'DEBUG',
             'class': 'logging.handlers.RotatingFileHandler',
             'filename': LOG_DIR / 'general.log',
             'maxBytes': 1024 * 1024 * 10,  # 10MB
             'backupCount': 10,
-            'formatter': 'verbose',
+            'formatter': LOG_FORMAT,
         },
         'file_payment': {
-            'level': 'INFO',
+            'level': 'DEBUG',
             'class': 'logging.handlers.RotatingFileHandler',
             'filename': LOG_DIR / 'payment.log',
             'maxBytes': 1024 * 1024 * 10,
             'backupCount': 10,
-            'formatter': 'verbose',
+            'formatter': LOG_FORMAT,
         },
         'file_error': {
             'level': 'ERROR',
@@ -226,22 +363,42 @@ LOGGING = {
             'filename': LOG_DIR / 'error.log',
             'maxBytes': 1024 * 1024 * 10,
             'backupCount': 10,
-            'formatter': 'verbose',
+            'formatter': LOG_FORMAT,
+        },
+        'queue_django': {
+            'class': 'apps.core.log.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file_general'],
+            'filters': ['request_id'],
+        },
+        'queue_general': {
+            'class': 'apps.core.log.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file_general', 'cfg://handlers.file_error'],
+            'filters': ['request_id', 'sample_debug'],
+        },
+        'queue_payment': {
+            'class': 'apps.core.log.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file_payment', 'cfg://handlers.file_error'],
+            'filters': ['request_id', 'sample_debug'],
         },
     },
     'loggers': {
         'django': {
-            'handlers': ['console', 'file_general'],
+            'handlers': ['queue_django'],
             'level': LOG_LEVEL,
             'propagate': False,
         },
         'apps.payments': {
-            'handlers': ['console', 'file_payment', 'file_error'],
-            'level': 'DEBUG',
+            'handlers': ['queue_payment'],
+            'level': LOG_LEVEL,
             'propagate': False,
         },
         'apps.registration': {
-            'handlers': ['console', 'file_general', 'file_error'],
+            'handlers': ['queue_general'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+        'apps.core': {
+            'handlers': ['queue_general'],
             'level': LOG_LEVEL,
             'propagate': False,
         },
@@ -7,6 +7,11 @@ ALLOWED_HOSTS = ['localhost', '127.0.0.1', '[::1]']
 # Email backend console (print email ke terminal)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Celery jalan inline (tanpa Redis) kecuali diset lewat .env
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=True, cast=bool)
+
 # Template debug mode
 for template_setting in TEMPLATES:
-    template_setting['OPTIONS']['debug'] = DEBUG
\ No newline at end of file
+    template_setting['OPTIONS']['debug'] = DEBUG
+# Header X-DB-Query-Count & deteksi N+1 selalu aktif di development
+QUERY_BUDGET_ENABLED = config('QUERY_BUDGET_ENABLED', default=True, cast=bool)
@@ -14,6 +14,7 @@ urlpatterns = [
     path('accounts/', include('apps.accounts.urls', namespace='accounts')),
     path('registration/', include('apps.registration.urls', namespace='registration')),
     path('payments/', include('apps.payments.urls', namespace='payments')),
+    path('', include('apps.core.urls', namespace='core')),
 ]
 
 # Media & Static (development)
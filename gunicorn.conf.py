@@ -0,0 +1,24 @@
+"""
+Konfigurasi gunicorn (otomatis dibaca dari working directory).
+
+Metrics multiprocess: set env PROMETHEUS_MULTIPROC_DIR, misalnya
+    PROMETHEUS_MULTIPROC_DIR=/tmp/ppdb-metrics gunicorn config.wsgi
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    """Kosongkan direktori metrics sisa run sebelumnya"""
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Worker mati: gabungkan/hapus file metrics miliknya"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)